@@ -0,0 +1,461 @@
+"""
+Benchmarks for core sheet operations.
+
+    python benchmarks/bench.py               # run and compare with the baseline
+    python benchmarks/bench.py --save        # run and store the results as the baseline
+    python benchmarks/bench.py --quick       # only the smallest sizes
+    python benchmarks/bench.py --only delete_rows move_rows
+    python benchmarks/bench.py --fake        # on the fake Tcl interpreter, no display
+    python benchmarks/bench.py --only import_tksheet
+    python benchmarks/bench.py --fake --ci  # fail if the baseline is missing
+
+Each scenario records its best time of --repeat runs, the peak memory allocated
+by Python during one run and the number of Tcl calls made during one run.
+Results are compared with benchmarks/baseline.json, the script exits with 1 if
+any result is more than --tolerance worse than the baseline. The committed
+baseline was made with --fake. With --ci it exits with 2 if there is no
+baseline or a result is missing from it, instead of passing.
+
+Without a display on Linux an Xvfb server is started for the run, Xvfb has to
+be installed. With --fake the sheets are created on the recording fake Tcl
+interpreter in benchmarks/fake_tk.py instead, times then leave out Tk. Only
+built-in Python libraries are used.
+
+import_tksheet is the time to import the package in a new interpreter, taken
+from what python -X importtime reports for tksheet, along with the number of
+modules the import loaded. It needs no display.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tkinter as tk
+import tracemalloc
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import Sheet, int_formatter  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+COLS = 10
+# cells share these strings so large sheets only cost their row lists
+VALUES = tuple("x" * (3 + (c * 7) % 23) for c in range(COLS))
+SCENARIOS = {}
+IMPORT = "import_tksheet"
+
+
+def scenario(*sizes):
+    # a scenario is a generator function taking (sheet, rows), everything
+    # before its first yield is setup and everything after it is measured
+    def register(func):
+        SCENARIOS[func.__name__] = (func, sizes)
+        return func
+
+    return register
+
+
+def make_data(rows):
+    return [[f"{r}", *VALUES[1:]] for r in range(rows)]
+
+
+def flush(sheet):
+    # pending redraws are part of the measured time
+    if sheet.after_redraw_id is not None:
+        sheet.after_cancel(sheet.after_redraw_id)
+        sheet.after_redraw()
+    sheet.update_idletasks()
+
+
+@scenario(10_000, 100_000, 1_000_000)
+def set_sheet_data(sheet, rows):
+    data = make_data(rows)
+    yield
+    sheet.set_sheet_data(data)
+    flush(sheet)
+
+
+@scenario(100_000)
+def redraw_full(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    for _ in range(20):
+        sheet.MT.main_table_redraw_grid_and_text(
+            redraw_header=True, redraw_row_index=True
+        )
+
+
+@scenario(100_000)
+def redraw_scroll_step(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    for _ in range(100):
+        sheet.MT.yview_scroll(1, "units")
+        sheet.RI.yview_scroll(1, "units")
+        sheet.MT.main_table_redraw_grid_and_text(
+            redraw_header=False, redraw_row_index=True
+        )
+
+
+@scenario(10_000, 100_000)
+def set_all_cell_sizes_to_text(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    sheet.set_all_cell_sizes_to_text()
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def ctrl_c(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    sheet.select_all()
+    flush(sheet)
+    yield
+    sheet.MT.ctrl_c()
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def ctrl_v(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    sheet.clipboard_clear()
+    sheet.clipboard_append(
+        "\n".join("\t".join(f"{r}" for c in range(COLS)) for r in range(rows))
+    )
+    sheet.select_cell(0, 0)
+    flush(sheet)
+    yield
+    sheet.MT.ctrl_v()
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def delete_rows(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    sheet.delete_rows(set(range(0, rows, 2)))
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def move_rows(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    sheet.move_rows(moveto=rows - rows // 4, to_move_min=0, number_of_rows=rows // 4)
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def format_column(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    flush(sheet)
+    yield
+    sheet.format_column(0, formatter_options=int_formatter())
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def highlight_cells(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    cells = [(r, c) for r in range(0, rows, 3) for c in range(0, COLS, 2)]
+    flush(sheet)
+    yield
+    sheet.highlight_cells(cells=cells, bg="yellow")
+    flush(sheet)
+
+
+def scattered_cells(rows):
+    # three cells in every other row, spread over the columns so that few
+    # of them join into larger boxes
+    return [(r, (r * 7 + c * 3) % COLS) for r in range(0, rows, 2) for c in range(0, 3)]
+
+
+@scenario(10_000, 100_000)
+def highlight_scattered(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    cells = scattered_cells(rows)
+    flush(sheet)
+    yield
+    sheet.highlight_cells(cells=cells, bg="yellow")
+    flush(sheet)
+
+
+@scenario(10_000, 100_000)
+def dehighlight_scattered(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    cells = scattered_cells(rows)
+    sheet.highlight_cells(cells=cells, bg="yellow", redraw=False)
+    flush(sheet)
+    yield
+    sheet.dehighlight_cells(cells=cells[::2])
+    flush(sheet)
+
+
+@scenario(1_000)
+def dropdown_open(sheet, rows):
+    sheet.set_sheet_data(make_data(rows))
+    sheet.create_dropdown(0, 0, values=[f"{i}" for i in range(1_000)])
+    flush(sheet)
+    yield
+    sheet.open_dropdown(0, 0)
+    flush(sheet)
+
+
+@scenario(20)
+def create_sheets(sheet, rows):
+    # startup of an app with many small sheets, e.g. one per tab
+    data = make_data(100)
+    parents = [tk.Frame(sheet) for _ in range(rows)]
+    yield
+    for parent in parents:
+        Sheet(parent, data=data).pack(fill="both", expand=True)
+    sheet.update_idletasks()
+
+
+class TclCallCounter:
+    # stands in for a tkapp, counting calls made by widgets created with it
+    def __init__(self, tkapp):
+        self.tkapp = tkapp
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self.tkapp.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.tkapp, name)
+
+
+def import_time():
+    # returns the seconds python -X importtime reports for importing tksheet
+    # in a new interpreter and the number of modules imported along with it
+    env = dict(os.environ)
+    # bytecode is cached so compiling is not measured
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tksheet"],
+        cwd=ROOT,
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    seconds, modules = None, 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        modules += 1
+        if parts[2].strip() == "tksheet":
+            seconds = int(parts[1]) / 1_000_000
+    return seconds, modules
+
+
+def new_sheet(root):
+    sheet = Sheet(
+        root,
+        # copying and pasting are measured in one go instead of when idle
+        copy_chunk_rows=sys.maxsize,
+        paste_chunk_cells=sys.maxsize,
+    )
+    sheet.enable_bindings()
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    return sheet
+
+
+def run_once(root, func, rows, measure_memory=False, count_calls=False):
+    tkapp = root.tk
+    counter = TclCallCounter(tkapp)
+    if count_calls:
+        root.tk = counter
+    try:
+        sheet = new_sheet(root)
+    finally:
+        root.tk = tkapp
+    try:
+        gen = func(sheet, rows)
+        next(gen)
+        if measure_memory:
+            tracemalloc.start()
+        calls = counter.calls
+        start = perf_counter()
+        for _ in gen:
+            pass
+        elapsed = perf_counter() - start
+        calls = counter.calls - calls
+        peak = 0
+        if measure_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        sheet.destroy()
+        root.update()
+    return elapsed, peak, calls
+
+
+def run_import(repeat):
+    import_time()
+    best, modules = min(import_time() for _ in range(repeat))
+    print(f"{IMPORT:<36} {best:>10.4f} s {modules:>10} modules", flush=True)
+    return {IMPORT: {"seconds": round(best, 6), "modules": modules}}
+
+
+def run(names, repeat, quick, fake=False):
+    results = {}
+    if IMPORT in names:
+        results.update(run_import(max(repeat, 5)))
+        names = [name for name in names if name != IMPORT]
+    if not names:
+        return results
+    if fake:
+        root = FakeRoot(width=1200, height=800)
+    else:
+        root = tk.Tk()
+        root.geometry("1200x800")
+    try:
+        for name in names:
+            func, sizes = SCENARIOS[name]
+            for rows in sizes[:1] if quick else sizes:
+                # fake results are kept apart from results on Tk
+                key = f"{name}[{rows}]{' fake' if fake else ''}"
+                best = min(run_once(root, func, rows)[0] for _ in range(repeat))
+                peak = run_once(root, func, rows, measure_memory=True)[1]
+                calls = run_once(root, func, rows, count_calls=True)[2]
+                results[key] = {
+                    "seconds": round(best, 6),
+                    "peak_kib": peak // 1024,
+                    "tcl_calls": calls,
+                }
+                print(
+                    f"{key:<36} {best:>10.4f} s {peak // 1024:>10} KiB {calls:>10} calls",
+                    flush=True,
+                )
+    finally:
+        root.destroy()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # returns the results more than tolerance worse than the baseline
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for measure, value in result.items():
+            base = baseline[key].get(measure)
+            if base and value > base * (1 + tolerance):
+                regressions.append((key, measure, base, value))
+    return regressions
+
+
+def start_xvfb():
+    # returns the Xvfb process, DISPLAY is set to its display
+    if shutil.which("Xvfb") is None:
+        sys.exit("no display available and Xvfb is not installed")
+    read, write = os.pipe()
+    proc = subprocess.Popen(
+        [
+            "Xvfb",
+            "-displayfd",
+            f"{write}",
+            "-screen",
+            "0",
+            "1280x1024x24",
+            "-nolisten",
+            "tcp",
+        ],
+        pass_fds=(write,),
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write)
+    with os.fdopen(read) as f:
+        display = f.readline().strip()
+    if not display:
+        proc.terminate()
+        sys.exit("Xvfb failed to start")
+    os.environ["DISPLAY"] = f":{display}"
+    return proc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tksheet benchmarks")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=sorted([*SCENARIOS, IMPORT]),
+        default=[IMPORT, *SCENARIOS],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="only run the smallest size of each scenario",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="run on the recording fake Tcl interpreter instead of Tk",
+    )
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--ci",
+        action="store_true",
+        help="exit with 2 if there is no baseline or a result is not in it",
+    )
+    args = parser.parse_args(argv)
+    xvfb = None
+    needs_display = not args.fake and any(name != IMPORT for name in args.only)
+    if needs_display and platform.system() == "Linux" and not os.environ.get("DISPLAY"):
+        xvfb = start_xvfb()
+    try:
+        results = run(args.only, args.repeat, args.quick, args.fake)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"saved {len(results)} results to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --save to create one")
+        return 2 if args.ci else 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    missing = [key for key in results if key not in baseline] if args.ci else []
+    for key in missing:
+        print(f"MISSING {key}: not in {args.baseline}")
+    regressions = compare(results, baseline, args.tolerance)
+    for key, measure, base, value in regressions:
+        print(f"REGRESSION {key} {measure}: {base} -> {value}")
+    if regressions:
+        return 1
+    return 2 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,827 @@
+"""
+A recording stand in for the Tcl interpreter behind tkinter.
+
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=data)
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    root.tk.ops.clear()
+    sheet.MT.main_table_redraw_grid_and_text(redraw_header=True, redraw_row_index=True)
+    print(root.tk.counts(sheet.MT))
+
+Widgets are created and driven by tkinter exactly as usual, only the Tcl calls
+they make end up here instead of in Tcl/Tk. Every call is counted by widget
+and operation and canvas items are kept in memory with their coordinates,
+options and tags, so find, coords, bbox, gettags, scrolling and so on give
+the answers tksheet relies on. Text is measured with fake font metrics, a
+fixed width per character and a fixed height per line, which makes the
+results the same on every machine and needs no display.
+
+Stacking order is not modelled, raise and lower are only counted. Events are
+never generated, idle callbacks run on update and timers only run when
+FakeTk.advance() moves the fake clock past them.
+"""
+
+import re
+import tkinter as tk
+from collections import Counter
+from itertools import count
+
+WIDGET_COMMANDS = {
+    "button",
+    "canvas",
+    "checkbutton",
+    "entry",
+    "frame",
+    "label",
+    "listbox",
+    "menu",
+    "scrollbar",
+    "text",
+    "toplevel",
+    "ttk::button",
+    "ttk::combobox",
+    "ttk::entry",
+    "ttk::frame",
+    "ttk::label",
+    "ttk::scrollbar",
+}
+# requested sizes of widgets which were not given a width or height
+DEFAULT_SIZES = {
+    "canvas": (378, 265),
+    "scrollbar": (16, 16),
+    "ttk::scrollbar": (16, 16),
+}
+LIST_ITEM = re.compile(r"\{([^{}]*)\}|(\S+)")
+
+
+def splitlist(value):
+    if isinstance(value, (tuple, list)):
+        return tuple(value)
+    if isinstance(value, str):
+        return tuple(a if b == "" else b for a, b in LIST_ITEM.findall(value))
+    return (value,)
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def is_number(value):
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+    return True
+
+
+class FakeWidget:
+    def __init__(self, kind, path, options):
+        self.kind = kind
+        self.path = path
+        self.options = options
+        self.manager = None
+        self.grid_info = None
+        # entries of menus
+        self.entries = []
+
+    def requested_size(self):
+        dw, dh = DEFAULT_SIZES.get(self.kind, (0, 0))
+        return (
+            to_int(self.options.get("-width", dw)),
+            to_int(self.options.get("-height", dh)),
+        )
+
+
+class FakeCanvas(FakeWidget):
+    def __init__(self, kind, path, options):
+        super().__init__(kind, path, options)
+        # id: [type, coords, options, tags]
+        self.items = {}
+        # tag: {id: None}, dicts keep the items in creation order
+        self.tags = {}
+        self.next_id = count(1)
+        self.origin = [0, 0]
+
+
+class FakeTk:
+    def __init__(
+        self, width=1200, height=800, char_width=7, line_height=18, font_size=13
+    ):
+        # char_width and line_height are the metrics of a font_size font, other
+        # font sizes are scaled from them
+        self.char_width = char_width
+        self.line_height = line_height
+        self.font_size = font_size
+        self.ops = Counter()
+        self.commands = {}
+        self.variables = {}
+        self.widgets = {".": FakeWidget("toplevel", ".", {})}
+        self.size = (width, height)
+        self.grid_slaves = {}
+        self.grid_weights = {}
+        self.timers = {}
+        self.idle = {}
+        self.after_ids = count()
+        self.now = 0
+        self.clipboard = ""
+        self.focus = ""
+        self.font_metrics = {}
+
+    # results
+
+    def counts(self, widget=None):
+        # operation counts for a widget or path, or for everything
+        if widget is None:
+            c = Counter()
+            for (_, op), n in self.ops.items():
+                c[op] += n
+            return c
+        path = str(widget)
+        return Counter({op: n for (p, op), n in self.ops.items() if p == path})
+
+    def total(self, widget=None):
+        return sum(self.counts(widget).values())
+
+    def items(self, widget):
+        # the canvas items of a widget as {id: (type, coords, options, tags)}
+        return {i: tuple(item) for i, item in self.widgets[str(widget)].items.items()}
+
+    # the interface tkinter uses
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        # like _tkinter everything from the first None on is dropped
+        for i, a in enumerate(args):
+            if a is None:
+                args = args[:i]
+                break
+        cmd = args[0]
+        # commands come first, widgets renamed by tkinter code are proxied
+        if cmd in self.commands:
+            self.ops[("", "callback")] += 1
+            return self.commands[cmd](*args[1:])
+        if cmd in self.widgets:
+            w = self.widgets[cmd]
+            op = args[1] if len(args) > 1 else ""
+            if op in ("create", "add"):
+                op = f"{op} {args[2]}"
+            self.ops[(cmd, op)] += 1
+            if isinstance(w, FakeCanvas):
+                return self.canvas_command(w, args[1:])
+            return self.widget_command(w, args[1:])
+        if cmd in WIDGET_COMMANDS:
+            self.ops[("", cmd)] += 1
+            return self.create_widget(cmd, args[1], args[2:])
+        self.ops[("", cmd)] += 1
+        handler = getattr(self, f"cmd_{cmd}", None)
+        if handler is None:
+            return ""
+        return handler(*args[1:])
+
+    def eval(self, script):
+        self.ops[("", "eval")] += 1
+        return ""
+
+    def createcommand(self, name, func):
+        self.commands[name] = func
+
+    def deletecommand(self, name):
+        if self.commands.pop(name, None) is None:
+            raise tk.TclError(f'can\'t delete Tcl command "{name}"')
+
+    def splitlist(self, value):
+        return splitlist(value)
+
+    def split(self, value):
+        return splitlist(value)
+
+    def getint(self, value):
+        return to_int(value)
+
+    def getdouble(self, value):
+        return float(value)
+
+    def getboolean(self, value):
+        if isinstance(value, str):
+            return value.lower() in ("1", "true", "yes", "on")
+        return bool(value)
+
+    def wantobjects(self):
+        return 1
+
+    def globalsetvar(self, name, value):
+        self.variables[name] = value
+
+    setvar = globalsetvar
+
+    def globalgetvar(self, name):
+        if name not in self.variables:
+            raise tk.TclError(f'can\'t read "{name}": no such variable')
+        return self.variables[name]
+
+    getvar = globalgetvar
+
+    def globalunsetvar(self, name):
+        self.variables.pop(name, None)
+
+    unsetvar = globalunsetvar
+
+    def mainloop(self, n=0):
+        self.run_idle()
+
+    def dooneevent(self, flags=0):
+        return 0
+
+    def quit(self):
+        pass
+
+    # time
+
+    def run_idle(self):
+        # idle callbacks scheduled while running are run as well
+        for _ in range(1000):
+            if not self.idle:
+                return
+            pending, self.idle = self.idle, {}
+            for script in pending.values():
+                self.run_script(script)
+
+    def advance(self, ms):
+        # moves the clock on by ms, running the timers which come due in order
+        end = self.now + ms
+        while True:
+            due = [
+                (when, n, after_id)
+                for after_id, (when, n, _) in self.timers.items()
+                if when <= end
+            ]
+            if not due:
+                break
+            when, _, after_id = min(due)
+            self.now = when
+            self.run_script(self.timers.pop(after_id)[2])
+            self.run_idle()
+        self.now = end
+
+    def run_script(self, script):
+        if script in self.commands:
+            self.commands[script]()
+
+    # widgets
+
+    def create_widget(self, kind, path, args):
+        options = dict(zip(args[::2], args[1::2]))
+        if kind == "canvas":
+            self.widgets[path] = FakeCanvas(kind, path, options)
+        else:
+            self.widgets[path] = FakeWidget(kind, path, options)
+        return path
+
+    def widget_command(self, w, args):
+        op = args[0] if args else ""
+        if op == "configure":
+            return self.configure(w, args[1:])
+        if op == "cget":
+            return w.options.get(args[1], "")
+        if w.kind == "menu":
+            return self.menu_command(w, args)
+        return ""
+
+    def menu_command(self, w, args):
+        op = args[0]
+        if op == "add":
+            w.entries.append(dict(zip(args[2::2], args[3::2])))
+        elif op == "delete":
+            first = self.menu_index(w, args[1])
+            last = self.menu_index(w, args[2]) if len(args) > 2 else first
+            if first is not None and last is not None:
+                del w.entries[first : last + 1]
+        elif op == "index":
+            i = self.menu_index(w, args[1])
+            return "none" if i is None else i
+        elif op == "entrycget":
+            return w.entries[self.menu_index(w, args[1])].get(args[2], "")
+        elif op == "entryconfigure" and len(args) > 3:
+            w.entries[self.menu_index(w, args[1])].update(zip(args[2::2], args[3::2]))
+        return ""
+
+    def menu_index(self, w, index):
+        if index == "end" or index == "last":
+            return len(w.entries) - 1 if w.entries else None
+        if isinstance(index, int) or f"{index}".isdigit():
+            return min(int(index), len(w.entries) - 1) if w.entries else None
+        for i, entry in enumerate(w.entries):
+            if entry.get("-label") == index:
+                return i
+        raise tk.TclError(f'bad menu entry index "{index}"')
+
+    def configure(self, w, args):
+        if not args:
+            return tuple((k, "", "", "", v) for k, v in w.options.items())
+        if len(args) == 1:
+            return (args[0], "", "", "", w.options.get(args[0], ""))
+        w.options.update(zip(args[::2], args[1::2]))
+        if isinstance(w, FakeCanvas):
+            self.set_origin(w, w.origin[0], 0)
+            self.set_origin(w, w.origin[1], 1)
+        return ""
+
+    def parent(self, path):
+        parent = path.rpartition(".")[0]
+        return parent if parent else "."
+
+    def widget_size(self, path):
+        if path == ".":
+            return self.size
+        w = self.widgets[path]
+        if w.manager in ("pack", "place"):
+            return self.widget_size(self.parent(path))
+        if w.manager == "grid":
+            return self.grid_size(path)
+        return w.requested_size()
+
+    def grid_size(self, path):
+        master = self.parent(path)
+        info = self.widgets[path].grid_info
+        req = self.widgets[path].requested_size()
+        master_size = self.widget_size(master)
+        size = []
+        for axis, (at, span, sides) in enumerate(
+            (("-column", "-columnspan", "ew"), ("-row", "-rowspan", "ns"))
+        ):
+            mins = {}
+            for slave in self.grid_slaves.get(master, ()):
+                sinfo = self.widgets[slave].grid_info
+                i = to_int(sinfo.get(at, 0))
+                mins.setdefault(i, 0)
+                if to_int(sinfo.get(span, 1)) == 1:
+                    mins[i] = max(mins[i], self.widgets[slave].requested_size()[axis])
+            weights = {
+                i: w
+                for (m, a, i), w in self.grid_weights.items()
+                if m == master and a == axis and w
+            }
+            extra = master_size[axis] - sum(mins.values())
+            total_weight = sum(weights.values())
+            sizes = dict(mins)
+            if extra > 0 and total_weight:
+                for i, w in weights.items():
+                    sizes[i] = sizes.get(i, 0) + extra * w // total_weight
+            start = to_int(info.get(at, 0))
+            cell = sum(
+                sizes.get(i, 0) for i in range(start, start + to_int(info.get(span, 1)))
+            )
+            sticky = info.get("-sticky", "")
+            size.append(
+                cell if all(s in sticky for s in sides) else min(req[axis], cell)
+            )
+        return tuple(size)
+
+    def cmd_grid(self, op, *args):
+        if op == "configure":
+            paths = []
+            for a in args:
+                if not f"{a}".startswith("."):
+                    break
+                paths.append(a)
+            options = args[len(paths) :]
+            for path in paths:
+                w = self.widgets[path]
+                master = self.parent(path)
+                if w.manager != "grid":
+                    w.manager = "grid"
+                    w.grid_info = {}
+                    self.grid_slaves.setdefault(master, {})[path] = None
+                w.grid_info.update(zip(options[::2], options[1::2]))
+        elif op in ("forget", "remove"):
+            for path in args:
+                self.forget(path)
+        elif op in ("rowconfigure", "columnconfigure"):
+            axis = 1 if op == "rowconfigure" else 0
+            options = dict(zip(args[2::2], args[3::2]))
+            if "-weight" in options:
+                for i in splitlist(args[1]):
+                    self.grid_weights[(args[0], axis, to_int(i))] = to_int(
+                        options["-weight"]
+                    )
+        return ""
+
+    def forget(self, path):
+        w = self.widgets.get(path)
+        if w is not None and w.manager is not None:
+            self.grid_slaves.get(self.parent(path), {}).pop(path, None)
+            w.manager = None
+            w.grid_info = None
+
+    def cmd_pack(self, op, *args):
+        if op == "configure":
+            for path in args:
+                if f"{path}".startswith("."):
+                    self.forget(path)
+                    self.widgets[path].manager = "pack"
+        elif op == "forget":
+            for path in args:
+                self.forget(path)
+        return ""
+
+    def cmd_place(self, op, *args):
+        if op == "configure":
+            self.forget(args[0])
+            self.widgets[args[0]].manager = "place"
+        elif op == "forget":
+            self.forget(args[0])
+        return ""
+
+    def cmd_winfo(self, op, *args):
+        path = str(args[0]) if args else "."
+        if op == "exists":
+            return 1 if path in self.widgets else 0
+        if path not in self.widgets:
+            raise tk.TclError(f'bad window path name "{path}"')
+        if op == "width":
+            return self.widget_size(path)[0]
+        if op == "height":
+            return self.widget_size(path)[1]
+        if op == "reqwidth":
+            return self.widgets[path].requested_size()[0]
+        if op == "reqheight":
+            return self.widgets[path].requested_size()[1]
+        if op == "toplevel":
+            return "."
+        if op in ("ismapped", "viewable"):
+            return 1 if path == "." or self.widgets[path].manager else 0
+        if op == "screenwidth":
+            return 1920
+        if op == "screenheight":
+            return 1080
+        if op == "class":
+            return self.widgets[path].kind.capitalize()
+        if op == "children":
+            return tuple(
+                p for p in self.widgets if p != path and self.parent(p) == path
+            )
+        return 0
+
+    def cmd_destroy(self, *paths):
+        for path in paths:
+            for p in [p for p in self.widgets if p == path or p.startswith(f"{path}.")]:
+                if p != ".":
+                    self.forget(p)
+                    w = self.widgets.pop(p)
+                    self.grid_slaves.pop(p, None)
+                    # and any names it was renamed to
+                    for alias in [a for a, v in self.widgets.items() if v is w]:
+                        del self.widgets[alias]
+        return ""
+
+    def cmd_rename(self, old, new):
+        if old in self.widgets and new:
+            self.widgets[new] = self.widgets[old]
+        return ""
+
+    def cmd_after(self, op, *args):
+        if op == "cancel":
+            for a in args:
+                self.timers.pop(a, None)
+                self.idle.pop(a, None)
+            return ""
+        if op == "info":
+            if not args:
+                return tuple(self.timers) + tuple(self.idle)
+            if args[0] in self.timers:
+                return (self.timers[args[0]][2], "timer")
+            if args[0] in self.idle:
+                return (self.idle[args[0]], "idle")
+            raise tk.TclError(f'event "{args[0]}" doesn\'t exist')
+        n = next(self.after_ids)
+        after_id = f"after#{n}"
+        if op == "idle":
+            self.idle[after_id] = args[0]
+        elif args:
+            self.timers[after_id] = (self.now + to_int(op), n, args[0])
+        return after_id
+
+    def cmd_update(self, *args):
+        self.run_idle()
+        return ""
+
+    def cmd_focus(self, *args):
+        if not args:
+            return self.focus
+        if not args[0].startswith("-"):
+            self.focus = args[0]
+        return ""
+
+    def cmd_clipboard(self, op, *args):
+        if op == "clear":
+            self.clipboard = ""
+        elif op == "append":
+            self.clipboard += args[-1]
+        elif op == "get":
+            return self.clipboard
+        return ""
+
+    def cmd_info(self, op, *args):
+        if op == "exists":
+            return 1 if args[0] in self.variables else 0
+        return ""
+
+    def cmd_tk(self, op, *args):
+        if op == "windowingsystem":
+            return "x11"
+        if op == "scaling":
+            return 1.0
+        return ""
+
+    def cmd_font(self, op, *args):
+        if op == "measure":
+            cw, _ = self.metrics(args[0])
+            return (
+                max((len(line) for line in f"{args[-1]}".split("\n")), default=0) * cw
+            )
+        if op == "metrics":
+            _, lh = self.metrics(args[0])
+            ascent = lh * 3 // 4
+            return (
+                "-ascent",
+                ascent,
+                "-descent",
+                lh - ascent,
+                "-linespace",
+                lh,
+                "-fixed",
+                0,
+            )
+        return ""
+
+    # canvases
+
+    def metrics(self, font):
+        # (width of a character, height of a line) for a font
+        key = font if isinstance(font, str) else tuple(font)
+        if key not in self.font_metrics:
+            size = self.font_size
+            for part in splitlist(font):
+                try:
+                    size = abs(int(part)) or self.font_size
+                    break
+                except (TypeError, ValueError):
+                    pass
+            self.font_metrics[key] = (
+                max(1, round(self.char_width * size / self.font_size)),
+                max(1, round(self.line_height * size / self.font_size)),
+            )
+        return self.font_metrics[key]
+
+    def find(self, c, tag_or_id):
+        # the ids of the items matching a tag or id, in creation order
+        if isinstance(tag_or_id, int) or (
+            isinstance(tag_or_id, str) and tag_or_id.isdigit()
+        ):
+            i = int(tag_or_id)
+            return (i,) if i in c.items else ()
+        if tag_or_id == "all":
+            return tuple(c.items)
+        return tuple(c.tags.get(tag_or_id, ()))
+
+    def set_tags(self, c, i, tags):
+        for tag in c.items[i][3]:
+            ids = c.tags[tag]
+            del ids[i]
+            if not ids:
+                del c.tags[tag]
+        tags = tuple(dict.fromkeys(f"{t}" for t in splitlist(tags)))
+        c.items[i][3] = tags
+        for tag in tags:
+            c.tags.setdefault(tag, {})[i] = None
+
+    def item_options(self, c, i, args):
+        options = c.items[i][2]
+        for k, v in zip(args[::2], args[1::2]):
+            if k in ("-tags", "-tag"):
+                self.set_tags(c, i, v)
+            else:
+                options[k] = v
+
+    def item_bbox(self, c, i):
+        kind, coords, options, _ = c.items[i]
+        if not coords:
+            return None
+        if kind == "text":
+            cw, lh = self.metrics(options.get("-font", ""))
+            lines = f"{options.get('-text', '')}".split("\n")
+            w = max(len(line) for line in lines) * cw
+            h = len(lines) * lh
+            anchor = options.get("-anchor", "center")
+            x, y = coords[0], coords[1]
+            if "w" in anchor:
+                x1 = x
+            elif "e" in anchor:
+                x1 = x - w
+            else:
+                x1 = x - w // 2
+            if anchor.startswith("n"):
+                y1 = y
+            elif anchor.startswith("s"):
+                y1 = y - h
+            else:
+                y1 = y - h // 2
+            return (int(x1), int(y1), int(x1 + w), int(y1 + h))
+        if kind == "window":
+            win = options.get("-window")
+            w, h = self.widget_size(win) if win in self.widgets else (1, 1)
+            return (
+                int(coords[0]),
+                int(coords[1]),
+                int(coords[0] + w),
+                int(coords[1] + h),
+            )
+        xs = coords[::2]
+        ys = coords[1::2]
+        return (int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1)
+
+    def view_size(self, c, axis):
+        return self.widget_size(c.path)[axis]
+
+    def scrollregion(self, c):
+        region = c.options.get("-scrollregion")
+        if not region:
+            return None
+        return tuple(float(v) for v in splitlist(region))
+
+    def set_origin(self, c, origin, axis):
+        region = self.scrollregion(c)
+        origin = int(origin)
+        if region is not None:
+            low, high = region[axis], region[axis + 2]
+            origin = int(max(low, min(origin, high - self.view_size(c, axis))))
+        c.origin[axis] = origin
+
+    def view(self, c, axis, args):
+        region = self.scrollregion(c)
+        size = self.view_size(c, axis)
+        if not args:
+            if region is None:
+                return (0.0, 1.0)
+            low, high = region[axis], region[axis + 2]
+            total = high - low
+            if total <= 0:
+                return (0.0, 1.0)
+            return (
+                max(0.0, (c.origin[axis] - low) / total),
+                min(1.0, (c.origin[axis] + size - low) / total),
+            )
+        if args[0] == "moveto":
+            low, high = (region[axis], region[axis + 2]) if region else (0, size)
+            self.set_origin(c, low + int(float(args[1]) * (high - low) + 0.5), axis)
+        elif args[0] == "scroll":
+            n = to_int(args[1])
+            if args[2] == "pages":
+                step = size * 9 // 10
+            else:
+                step = to_int(
+                    c.options.get(
+                        "-yscrollincrement" if axis else "-xscrollincrement", 0
+                    )
+                )
+                step = step if step > 0 else size // 10
+            self.set_origin(c, c.origin[axis] + n * step, axis)
+        return ""
+
+    def canvas_command(self, c, args):
+        op = args[0]
+        if op == "create":
+            i = next(c.next_id)
+            rest = args[2:]
+            n = 0
+            while n < len(rest) and is_number(rest[n]):
+                n += 1
+            coords = rest[:n]
+            if len(coords) == 1:
+                coords = splitlist(coords[0])
+            c.items[i] = [args[1], [float(v) for v in coords], {}, ()]
+            self.item_options(c, i, rest[n:])
+            return i
+        if op == "coords":
+            ids = self.find(c, args[1])
+            if not ids:
+                return ""
+            if len(args) > 2:
+                coords = args[2:] if len(args) > 3 else splitlist(args[2])
+                c.items[ids[0]][1] = [float(v) for v in coords]
+                return ""
+            return tuple(c.items[ids[0]][1])
+        if op == "itemconfigure":
+            ids = self.find(c, args[1])
+            if len(args) > 3:
+                for i in ids:
+                    self.item_options(c, i, args[2:])
+                return ""
+            if not ids:
+                return ""
+            options = c.items[ids[0]][2]
+            if len(args) == 3:
+                return (args[2], "", "", "", options.get(args[2], ""))
+            return tuple((k, "", "", "", v) for k, v in options.items())
+        if op == "itemcget":
+            ids = self.find(c, args[1])
+            if not ids:
+                return ""
+            if args[2] in ("-tags", "-tag"):
+                return c.items[ids[0]][3]
+            return c.items[ids[0]][2].get(args[2], "")
+        if op == "bbox":
+            boxes = [
+                b
+                for tag_or_id in args[1:]
+                for i in self.find(c, tag_or_id)
+                for b in (self.item_bbox(c, i),)
+                if b is not None
+            ]
+            if not boxes:
+                return ""
+            return (
+                min(b[0] for b in boxes),
+                min(b[1] for b in boxes),
+                max(b[2] for b in boxes),
+                max(b[3] for b in boxes),
+            )
+        if op == "find":
+            how = args[1]
+            if how == "withtag":
+                return self.find(c, args[2])
+            if how == "all":
+                return tuple(c.items)
+            if how in ("overlapping", "enclosed"):
+                x1, y1, x2, y2 = (float(v) for v in args[2:6])
+                found = []
+                for i in c.items:
+                    b = self.item_bbox(c, i)
+                    if b is None:
+                        continue
+                    if how == "overlapping":
+                        if b[0] <= x2 and b[2] >= x1 and b[1] <= y2 and b[3] >= y1:
+                            found.append(i)
+                    elif b[0] > x1 and b[2] < x2 and b[1] > y1 and b[3] < y2:
+                        found.append(i)
+                return tuple(found)
+            return ()
+        if op == "gettags":
+            ids = self.find(c, args[1])
+            return c.items[ids[0]][3] if ids else ()
+        if op == "type":
+            ids = self.find(c, args[1])
+            return c.items[ids[0]][0] if ids else ""
+        if op == "delete":
+            for tag_or_id in args[1:]:
+                for i in self.find(c, tag_or_id):
+                    self.set_tags(c, i, ())
+                    del c.items[i]
+            return ""
+        if op == "move":
+            dx, dy = float(args[2]), float(args[3])
+            for i in self.find(c, args[1]):
+                coords = c.items[i][1]
+                coords[::2] = [x + dx for x in coords[::2]]
+                coords[1::2] = [y + dy for y in coords[1::2]]
+            return ""
+        if op == "addtag":
+            if args[2] == "withtag":
+                for i in self.find(c, args[3]):
+                    self.set_tags(c, i, c.items[i][3] + (args[1],))
+            return ""
+        if op == "dtag":
+            tag = args[2] if len(args) > 2 else args[1]
+            for i in self.find(c, args[1]):
+                self.set_tags(c, i, tuple(t for t in c.items[i][3] if t != tag))
+            return ""
+        if op == "xview":
+            return self.view(c, 0, args[1:])
+        if op == "yview":
+            return self.view(c, 1, args[1:])
+        if op == "canvasx":
+            return float(c.origin[0] + float(args[1]))
+        if op == "canvasy":
+            return float(c.origin[1] + float(args[1]))
+        return self.widget_command(c, args)
+
+
+class FakeRoot(tk.Tk):
+    # a Tk root on a FakeTk, widgets created in it record instead of draw
+    def __init__(self, width=1200, height=800, **kwargs):
+        self.master = None
+        self.children = {}
+        self._w = "."
+        self._tclCommands = None
+        self._last_child_ids = None
+        self.tk = FakeTk(width=width, height=height, **kwargs)
+
+    def report_callback_exception(self, exc, val, tb):
+        # callbacks run by the fake raise instead of printing
+        raise val
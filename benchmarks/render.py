@@ -0,0 +1,250 @@
+"""
+Benchmarks for drawing the table, header and index, run on the recording
+fake Tcl interpreter in benchmarks/fake_tk.py instead of Tk.
+
+    python benchmarks/render.py              # run and compare with the baseline
+    python benchmarks/render.py --save       # run and store the results as the baseline
+    python benchmarks/render.py --profile scroll_step
+    python benchmarks/render.py --ci         # fail if the baseline is missing
+
+No display is needed and X11 does not add noise, the time measured is the
+Python side of drawing alone. Each scenario draws a number of frames and
+records its best time per frame of --repeat runs and the canvas operations
+per frame of the table, header and index. Operation counts are the same on
+every machine so any change from the baseline is reported, times are
+reported when more than --tolerance worse. The script exits with 1 if
+anything was reported. With --ci it exits with 2 if there is no baseline or
+a result is missing from it, instead of passing.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import COLS, make_data  # noqa: E402
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import Sheet  # noqa: E402
+
+BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "render_baseline.json"
+)
+ROWS = 100_000
+SCENARIOS = {}
+
+
+def scenario(frames):
+    # a scenario is a function taking (sheet, frame) which draws one frame,
+    # functions named setup_<scenario> prepare the sheet first
+    def register(func):
+        SCENARIOS[func.__name__] = (func, frames)
+        return func
+
+    return register
+
+
+def redraw(sheet, header=True, index=True):
+    sheet.MT.main_table_redraw_grid_and_text(
+        redraw_header=header, redraw_row_index=index
+    )
+
+
+@scenario(20)
+def full(sheet, frame):
+    redraw(sheet)
+
+
+@scenario(20)
+def table_only(sheet, frame):
+    redraw(sheet, header=False, index=False)
+
+
+@scenario(100)
+def scroll_step(sheet, frame):
+    sheet.MT.yview_scroll(1, "units")
+    sheet.RI.yview_scroll(1, "units")
+    redraw(sheet, header=False)
+
+
+@scenario(50)
+def scroll_page(sheet, frame):
+    sheet.MT.yview_scroll(1, "pages")
+    sheet.RI.yview_scroll(1, "pages")
+    redraw(sheet, header=False)
+
+
+@scenario(20)
+def scroll_right(sheet, frame):
+    sheet.MT.xview_scroll(1, "pages")
+    sheet.CH.xview_scroll(1, "pages")
+    redraw(sheet, index=False)
+
+
+@scenario(50)
+def select_cells(sheet, frame):
+    sheet.select_cell(frame % 30, frame % COLS, redraw=False)
+    redraw(sheet)
+
+
+@scenario(50)
+def highlighted_scroll(sheet, frame):
+    scroll_step(sheet, frame)
+
+
+def setup_highlighted_scroll(sheet):
+    sheet.highlight_cells(
+        cells=[(r, c) for r in range(0, 300, 2) for c in range(0, COLS, 2)],
+        bg="yellow",
+    )
+    sheet.highlight_rows(rows=list(range(1, 300, 4)), bg="lightblue")
+    sheet.highlight_cells(row=0, column=1, canvas="header", bg="green")
+    for r in range(0, 300, 3):
+        sheet.create_dropdown(r, 1, values=["a", "b"], redraw=False)
+        sheet.create_checkbox(r, 3, redraw=False)
+
+
+@scenario(20)
+def wide(sheet, frame):
+    sheet.MT.xview_scroll(1, "pages")
+    sheet.CH.xview_scroll(1, "pages")
+    redraw(sheet)
+
+
+def setup_wide(sheet):
+    sheet.set_sheet_data([[f"{r},{c}" for c in range(200)] for r in range(1_000)])
+    sheet.set_column_widths([40] * 200)
+
+
+def new_sheet(root, name):
+    sheet = Sheet(root, data=make_data(ROWS))
+    sheet.enable_bindings()
+    sheet.pack(fill="both", expand=True)
+    setup = globals().get(f"setup_{name}")
+    if setup is not None:
+        setup(sheet)
+    root.update()
+    redraw(sheet)
+    root.update()
+    return sheet
+
+
+def run_once(name, profile=None):
+    # returns the time per frame and the operations per frame by canvas
+    func, frames = SCENARIOS[name]
+    root = FakeRoot(width=1200, height=800)
+    sheet = new_sheet(root, name)
+    canvases = {"table": sheet.MT, "header": sheet.CH, "index": sheet.RI}
+    root.tk.ops.clear()
+    if profile is not None:
+        profile.enable()
+    start = perf_counter()
+    for frame in range(frames):
+        func(sheet, frame)
+    elapsed = perf_counter() - start
+    if profile is not None:
+        profile.disable()
+    ops = {
+        f"{canvas}_ops": root.tk.total(widget) / frames
+        for canvas, widget in canvases.items()
+    }
+    ops["other_ops"] = root.tk.total() / frames - sum(ops.values())
+    root.destroy()
+    return elapsed / frames, ops
+
+
+def run(names, repeat):
+    results = {}
+    for name in names:
+        best = None
+        for _ in range(repeat):
+            seconds, ops = run_once(name)
+            best = seconds if best is None else min(best, seconds)
+        results[name] = {"seconds": round(best, 6), **ops}
+        print(
+            f"{name:<20} {best * 1000:>8.3f} ms/frame "
+            + " ".join(f"{k} {v:g}" for k, v in ops.items()),
+            flush=True,
+        )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # returns the times more than tolerance worse and all changed op counts
+    reports = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for measure, value in result.items():
+            base = baseline[key].get(measure)
+            if base is None:
+                continue
+            if measure == "seconds":
+                if value > base * (1 + tolerance):
+                    reports.append((key, measure, base, value))
+            elif value != base:
+                reports.append((key, measure, base, value))
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tksheet render benchmarks")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--ci",
+        action="store_true",
+        help="exit with 2 if there is no baseline or a result is not in it",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(SCENARIOS),
+        help="profile one run of a scenario and print the slowest functions",
+    )
+    args = parser.parse_args(argv)
+    if args.profile:
+        profile = cProfile.Profile()
+        run_once(args.profile, profile)
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(30)
+        return 0
+    results = run(args.only, args.repeat)
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"saved {len(results)} results to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --save to create one")
+        return 2 if args.ci else 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    missing = [key for key in results if key not in baseline] if args.ci else []
+    for key in missing:
+        print(f"MISSING {key}: not in {args.baseline}")
+    reports = compare(results, baseline, args.tolerance)
+    for key, measure, base, value in reports:
+        print(f"CHANGED {key} {measure}: {base} -> {value}")
+    if reports:
+        return 1
+    return 2 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
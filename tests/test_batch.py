@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import BoxSet, MovedRanges, RangeSet, Sheet  # noqa: E402
+from tksheet._tksheet_other_classes import (  # noqa: E402
+    merge_sheet_modified_events,
+    sheet_modified_event_data,
+)
+
+
+def make_sheet(data):
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=data)
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    return sheet
+
+
+def edit_positions(sheet):
+    for i in range(20):
+        sheet.insert_rows([["a", "b"]], idx=i * 7, heights=[30 + i])
+        sheet.insert_columns(1, idx=1, widths=[50 + i])
+        sheet.delete_rows({i * 3})
+        sheet.delete_row_position(i * 5)
+        sheet.insert_row_position(i * 2, height=17)
+
+
+def test_batch_positions_match_unbatched():
+    plain = make_sheet([[r, r] for r in range(200)])
+    edit_positions(plain)
+    batched = make_sheet([[r, r] for r in range(200)])
+    with batched.batch():
+        edit_positions(batched)
+        assert batched.MT.pending_row_heights is not None
+    assert batched.MT.row_positions == plain.MT.row_positions
+    assert batched.MT.col_positions == plain.MT.col_positions
+
+
+def test_merged_events_keep_ranges():
+    first = sheet_modified_event_data(
+        modified_cells=BoxSet([(0, 0, 2, 2)]),
+        modified_rows=RangeSet([(0, 5)]),
+        moved_rows=MovedRanges([(0, 2, 3)]),
+    )
+    second = sheet_modified_event_data(
+        modified_cells=BoxSet([(1, 1, 3, 3)]),
+        modified_rows=RangeSet([(3, 8)]),
+        moved_rows=MovedRanges([(4, 5, -4)]),
+        modified_cols=[1, 2],
+    )
+    merged = merge_sheet_modified_events([first, second])
+    assert isinstance(merged["modified"]["cells"], BoxSet)
+    assert sorted(merged["modified"]["cells"]) == sorted(
+        {(r, c) for r in range(2) for c in range(2)}
+        | {(r, c) for r in range(1, 3) for c in range(1, 3)}
+    )
+    assert merged["modified"]["rows"].ranges == [(0, 8)]
+    assert list(merged["moved"]["rows"]) == [(0, 3), (1, 4), (4, 0)]
+    assert merged["modified"]["cols"] == [1, 2]
@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import Sheet  # noqa: E402
+
+
+def make_sheet(data):
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=data)
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    return sheet
+
+
+def test_auto_size_after_moving_columns_with_hidden_columns():
+    sheet = make_sheet([["y", "x" * 40, "z"] for r in range(5)])
+    sheet.hide_columns({2})
+    for c in range(2):
+        sheet.column_width(c, "text")
+    narrow, wide = sheet.column_width(0), sheet.column_width(1)
+    assert narrow < wide
+    sheet.move_columns(0, 1, 1)
+    assert sheet.get_cell_data(0, 1) == "y"
+    for c in range(2):
+        sheet.column_width(c, "text")
+    assert sheet.column_width(0) == wide
+    assert sheet.column_width(1) == narrow
+
+
+def test_auto_size_after_font_change():
+    sheet = make_sheet([["x" * 10] for r in range(5)])
+    sheet.column_width(0, "text")
+    small = sheet.column_width(0)
+    sheet.font(("Arial", 30, "normal"))
+    sheet.column_width(0, "text")
+    assert sheet.column_width(0) > small
+
+
+def test_auto_size_after_changing_data_directly_and_refresh():
+    data = [["x" * 10] for r in range(5)]
+    sheet = make_sheet(data)
+    sheet.column_width(0, "text")
+    narrow = sheet.column_width(0)
+    data[0][0] = "x" * 30
+    sheet.refresh()
+    sheet.column_width(0, "text")
+    assert sheet.column_width(0) > narrow
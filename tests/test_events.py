@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import RangeSet, Sheet  # noqa: E402
+from tksheet._tksheet_other_classes import sheet_modified_event_data  # noqa: E402
+
+
+def make_sheet(**kwargs):
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=[["a"] * 3 for r in range(5)], **kwargs)
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    return root, sheet
+
+
+def test_subscriber_errors_are_reported_and_do_not_stop_others():
+    root, sheet = make_sheet()
+    errors, called = [], []
+    root.report_callback_exception = lambda exc, val, tb: errors.append(val)
+
+    def fails(event):
+        raise ValueError("subscriber")
+
+    sheet.bind_event("<<SheetModified>>", fails)
+    sheet.bind_event("<<SheetModified>>", called.append, add=True)
+    sheet.emit_event("<<SheetModified>>", sheet_modified_event_data())
+    assert [str(e) for e in errors] == ["subscriber"]
+    assert len(called) == 1
+
+
+def test_tk_event_generated_when_bound_with_tk():
+    root, sheet = make_sheet()
+    generated = []
+    sheet.tk_event_bound = lambda event: True
+    sheet.event_generate = lambda event, data: generated.append((event, data))
+    sheet.emit_event(
+        "<<SheetModified>>", sheet_modified_event_data(deleted_rows=RangeSet([(2, 4)]))
+    )
+    assert generated[0][0] == "<<SheetModified>>"
+    assert generated[0][1]["deleted"]["rows"] == [2, 3]
+    sheet.set_options(tk_events=False)
+    sheet.emit_event("<<SheetModified>>", sheet_modified_event_data())
+    assert len(generated) == 1
+
+
+def test_tk_event_not_generated_without_tk_bindings():
+    root, sheet = make_sheet()
+    generated = []
+    sheet.event_generate = lambda event, data: generated.append(event)
+    sheet.emit_event("<<SheetModified>>", sheet_modified_event_data())
+    assert not generated
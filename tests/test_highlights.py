@@ -0,0 +1,30 @@
+import random
+
+from tksheet._tksheet_options import CellRangeStore, OffsetIndex, cells_to_boxes
+
+
+def test_update_boxes_matches_cell_by_cell():
+    rng = random.Random(1)
+    for _ in range(100):
+        rows, cols = OffsetIndex(), OffsetIndex()
+        rows.delete(rng.sample(range(40), 5))
+        rows.insert(rng.randrange(30), 3)
+        cols.delete(rng.sample(range(15), 2))
+        store = CellRangeStore(rows, cols)
+        expected = {}
+        for _ in range(6):
+            cells = {(rng.randrange(30), rng.randrange(12)) for _ in range(40)}
+            if rng.random() < 0.6:
+                value = rng.choice("abc")
+                store.update_boxes(cells_to_boxes(cells), lambda v, value=value: value)
+                expected.update(dict.fromkeys(cells, value))
+            else:
+                store.delete_boxes(cells_to_boxes(cells))
+                for cell in cells:
+                    expected.pop(cell, None)
+        assert {
+            (r, c): store.get(r, c)
+            for r in range(30)
+            for c in range(12)
+            if store.get(r, c) is not None
+        } == expected
@@ -0,0 +1,37 @@
+import random
+
+from tksheet._tksheet_options import OffsetIndex
+
+
+def test_offset_index_matches_list():
+    rng = random.Random(2)
+    for _ in range(100):
+        index = OffsetIndex()
+        keys = list(range(80))
+        for _ in range(25):
+            op = rng.random()
+            if op < 0.35:
+                pos, num = rng.randrange(len(keys)), rng.randrange(1, 4)
+                index.insert(pos, num)
+                keys[pos:pos] = [index.next_key + 1 + i for i in range(num)]
+            elif op < 0.7:
+                positions = rng.sample(range(len(keys)), rng.randrange(1, 8))
+                removed = index.cut(positions)
+                assert [
+                    k for first, num in removed for k in range(first, first + num)
+                ] == [keys[p] for p in sorted(positions)]
+                for p in sorted(positions, reverse=True):
+                    del keys[p]
+            else:
+                start, num = rng.randrange(len(keys) - 4), rng.randrange(1, 5)
+                moveto = rng.randrange(len(keys) - num)
+                index.move(start, num, moveto)
+                moved = keys[start : start + num]
+                del keys[start : start + num]
+                keys[moveto:moveto] = moved
+            assert [index.key(p) for p in range(len(keys))] == keys
+            assert [index.pos(k) for k in keys] == list(range(len(keys)))
+            start = rng.randrange(len(keys))
+            stop = rng.randrange(start, len(keys) + 1)
+            runs = index.key_runs(start, stop)
+            assert [k for first, end in runs for k in range(first, end)] == keys[start:stop]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import Sheet  # noqa: E402
+
+
+def make_sheet(data):
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=data)
+    sheet.pack(fill="both", expand=True)
+    root.update()
+    return sheet
+
+
+def test_delete_rows_finishes_running_tasks():
+    sheet = make_sheet([[f"{r}-{c}" for c in range(40)] for r in range(2000)])
+    task = sheet.set_all_cell_sizes_to_text(background=True)
+    task.step()
+    assert not task.done
+    sheet.delete_rows(set(range(0, 2000, 2)))
+    assert task.done
+    assert len(sheet.MT.data) == len(sheet.MT.row_positions) - 1 == 1000
+
+
+def test_task_can_edit_sheet():
+    sheet = make_sheet([["a"] for r in range(10)])
+
+    def edit():
+        sheet.delete_rows({0})
+        yield 1, 1
+
+    task = sheet.run_task("edit", edit())
+    task.finish()
+    assert task.done and len(sheet.MT.data) == 9
@@ -0,0 +1,34 @@
+import sys
+
+from tksheet._tksheet_other_classes import UndoJournal, undo_storage_size
+
+
+def run_idle(scheduled):
+    while scheduled:
+        scheduled.pop(0)()
+
+
+def test_unpicklable_entry_is_skipped():
+    scheduled = []
+    journal = UndoJournal(schedule=scheduled.append)
+    journal.append(("delete_rows", {"dropdown": {"selection_function": lambda e: 0}}))
+    journal.append(("edit_cells", {(0, 0): "x" * 1000}))
+    run_idle(scheduled)
+    first, first_size, first_state = journal.undos[0]
+    second, second_size, second_state = journal.undos[1]
+    assert isinstance(first, tuple) and first_state == "final"
+    assert first_size == undo_storage_size(first)
+    assert isinstance(second, bytes) and second_state == "final"
+    assert second_size == sys.getsizeof(second)
+    assert journal.nbytes == first_size + second_size
+
+
+def test_sizes_measured_when_idle_without_compression():
+    scheduled = []
+    journal = UndoJournal(compress_level=None, schedule=scheduled.append)
+    entry = ("edit_cells", {(r, 0): f"{r}" for r in range(1000)})
+    journal.append(entry)
+    assert journal.nbytes < undo_storage_size(entry)
+    run_idle(scheduled)
+    assert journal.nbytes == undo_storage_size(entry)
+    assert journal[-1] is entry
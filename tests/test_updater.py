@@ -0,0 +1,28 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from fake_tk import FakeRoot  # noqa: E402
+from tksheet import Sheet  # noqa: E402
+
+
+def test_worker_posts_only_queue_updates():
+    root = FakeRoot(width=1200, height=800)
+    sheet = Sheet(root, data=[["a"] * 3 for r in range(10)])
+    worker = threading.Thread(
+        target=sheet.post_updates, args=([("cell", 0, 0, "worker")],)
+    )
+    worker.start()
+    worker.join()
+    assert len(sheet.sheet_updater) == 1
+    assert sheet.sheet_updater.after_id is None
+    updater = sheet.updater()
+    assert updater.after_interval_ms == updater.interval_ms
+    root.tk.advance(updater.interval_ms)
+    root.update()
+    assert sheet.get_cell_data(0, 0) == "worker"
+    assert updater.after_interval_ms == updater.idle_interval_ms
+    updater.stop()
+    assert updater.after_id is None
@@ -1,8 +1,169 @@
 from ._tksheet_column_headers import ColumnHeaders
 from ._tksheet_main_table import MainTable
-from ._tksheet_other_classes import TextEditor_, TextEditor
+from ._tksheet_model import SheetModel
+from ._tksheet_other_classes import (
+    CurrentlySelectedClass,
+    CtrlKeyEvent,
+    PasteEvent,
+    UndoEvent,
+    SheetEvent,
+    SelectCellEvent,
+    SelectColumnEvent,
+    SelectRowEvent,
+    DeselectionEvent,
+    SelectionBoxEvent,
+    InsertEvent,
+    DeleteRowColumnEvent,
+    EditCellEvent,
+    EditHeaderEvent,
+    EditIndexEvent,
+    BeginDragDropEvent,
+    EndDragDropEvent,
+    ResizeEvent,
+    DropDownModifiedEvent,
+    RangeSet,
+    BoxSet,
+    MovedRanges,
+    TextEditor_,
+    TextEditor,
+    dropdown_search_function,
+    get_dropdown_kwargs,
+    get_dropdown_dict,
+    get_checkbox_kwargs,
+    get_checkbox_dict,
+    num2alpha,
+)
 from ._tksheet_row_index import RowIndex
 from ._tksheet_top_left_rectangle import TopLeftRectangle
-from ._tksheet_vars import *
-from ._tksheet_formatters import *
-from ._tksheet import Sheet
\ No newline at end of file
+from ._tksheet_vars import (
+    USER_OS,
+    ctrl_key,
+    rc_binding,
+    symbols_set,
+    nonelike,
+    truthy,
+    falsy,
+    arrowkey_bindings_helper,
+    emitted_events,
+    get_font,
+    get_index_font,
+    get_heading_font,
+    theme_light_blue,
+    theme_light_green,
+    theme_dark,
+    theme_black,
+    theme_dark_blue,
+    theme_dark_green,
+    ColorMap,
+    Color_Map_,
+)
+from ._tksheet_formatters import (
+    is_none_like,
+    to_int,
+    to_float,
+    to_bool,
+    try_to_bool,
+    is_bool_like,
+    to_str,
+    float_to_str,
+    percentage_to_str,
+    bool_to_str,
+    int_formatter,
+    float_formatter,
+    percentage_formatter,
+    bool_formatter,
+    FormatterPipeline,
+    formatter,
+    format_data,
+    format_data_many,
+    data_to_str,
+    get_data_with_valid_check,
+    get_clipboard_data,
+    Formatter,
+    FormatterSpec,
+    FormattedValue,
+)
+from ._tksheet import Sheet
+
+__all__ = [
+    "ColumnHeaders",
+    "MainTable",
+    "SheetModel",
+    "CurrentlySelectedClass",
+    "CtrlKeyEvent",
+    "PasteEvent",
+    "UndoEvent",
+    "SheetEvent",
+    "SelectCellEvent",
+    "SelectColumnEvent",
+    "SelectRowEvent",
+    "DeselectionEvent",
+    "SelectionBoxEvent",
+    "InsertEvent",
+    "DeleteRowColumnEvent",
+    "EditCellEvent",
+    "EditHeaderEvent",
+    "EditIndexEvent",
+    "BeginDragDropEvent",
+    "EndDragDropEvent",
+    "ResizeEvent",
+    "DropDownModifiedEvent",
+    "RangeSet",
+    "BoxSet",
+    "MovedRanges",
+    "TextEditor_",
+    "TextEditor",
+    "dropdown_search_function",
+    "get_dropdown_kwargs",
+    "get_dropdown_dict",
+    "get_checkbox_kwargs",
+    "get_checkbox_dict",
+    "num2alpha",
+    "RowIndex",
+    "TopLeftRectangle",
+    "USER_OS",
+    "ctrl_key",
+    "rc_binding",
+    "symbols_set",
+    "nonelike",
+    "truthy",
+    "falsy",
+    "arrowkey_bindings_helper",
+    "emitted_events",
+    "get_font",
+    "get_index_font",
+    "get_heading_font",
+    "theme_light_blue",
+    "theme_light_green",
+    "theme_dark",
+    "theme_black",
+    "theme_dark_blue",
+    "theme_dark_green",
+    "ColorMap",
+    "Color_Map_",
+    "is_none_like",
+    "to_int",
+    "to_float",
+    "to_bool",
+    "try_to_bool",
+    "is_bool_like",
+    "to_str",
+    "float_to_str",
+    "percentage_to_str",
+    "bool_to_str",
+    "int_formatter",
+    "float_formatter",
+    "percentage_formatter",
+    "bool_formatter",
+    "FormatterPipeline",
+    "formatter",
+    "format_data",
+    "format_data_many",
+    "data_to_str",
+    "get_data_with_valid_check",
+    "get_clipboard_data",
+    "Formatter",
+    "FormatterSpec",
+    "FormattedValue",
+    "Sheet",
+]
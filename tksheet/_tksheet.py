@@ -1,18 +1,46 @@
+import bisect
+import sys
 import tkinter as tk
-from collections import deque
-from itertools import accumulate, chain, islice
+from contextlib import contextmanager
+from itertools import accumulate, chain, count, islice, repeat
 from tkinter import ttk
-
-from ._tksheet_column_headers import *
-from ._tksheet_formatters import *
-from ._tksheet_main_table import *
-from ._tksheet_other_classes import *
-from ._tksheet_row_index import *
-from ._tksheet_top_left_rectangle import *
-from ._tksheet_vars import *
+from typing import Union
+
+from ._tksheet_column_headers import ColumnHeaders
+from ._tksheet_main_table import MainTable
+from ._tksheet_options import cells_to_boxes
+from ._tksheet_other_classes import (
+    GeneratedMouseEvent,
+    SelectCellEvent,
+    SheetEvent,
+    SheetUpdater,
+    dropdown_search_function,
+    expand_event_ranges,
+    get_checkbox_kwargs,
+    get_dropdown_kwargs,
+    is_iterable,
+)
+from ._tksheet_row_index import RowIndex
+from ._tksheet_top_left_rectangle import TopLeftRectangle
+from ._tksheet_vars import (
+    emitted_events,
+    get_font,
+    get_heading_font,
+    get_index_font,
+    rc_binding,
+    theme_black,
+    theme_dark,
+    theme_dark_blue,
+    theme_dark_green,
+    theme_light_blue,
+    theme_light_green,
+)
+
+__all__ = ["Sheet", "Sheet_Dropdown"]
 
 
 class Sheet(tk.Frame):
+
     def __init__(
         self,
         parent,
@@ -32,6 +60,10 @@ class Sheet(tk.Frame):
         to_clipboard_delimiter="\t",
         to_clipboard_quotechar='"',
         to_clipboard_lineterminator="\n",
+        copy_chunk_rows: int = 10000,
+        paste_chunk_cells: int = 100000,
+        task_budget_ms: int = 20,
+        auto_width_sample_rows: int = 5000,
         from_clipboard_delimiters=["\t"],
         show_default_header_for_empty: bool = True,
         show_default_index_for_empty: bool = True,
@@ -58,6 +90,8 @@ class Sheet(tk.Frame):
         row_index: list = None,
         index: list = None,
         after_redraw_time_ms: int = 20,
+        event_ranges: bool = False,
+        tk_events: bool = True,
         row_index_width: int = None,
         auto_resize_default_row_index: bool = True,
         set_all_heights_and_widths: bool = False,
@@ -74,6 +108,8 @@ class Sheet(tk.Frame):
         displayed_rows: list = [],
         all_rows_displayed: bool = True,
         max_undos: int = 30,
+        max_undo_bytes: int = None,
+        undo_compression_level: int = 6,
         outline_thickness: int = 0,
         outline_color: str = theme_light_blue["outline_color"],
         column_drag_and_drop_perform: bool = True,
@@ -149,6 +185,12 @@ class Sheet(tk.Frame):
         self.dropdown_class = Sheet_Dropdown
         self.after_redraw_id = None
         self.after_redraw_time_ms = after_redraw_time_ms
+        self.event_subscribers = {}
+        self.event_ranges = event_ranges
+        self.tk_events = tk_events
+        self.event_funcids = count()
+        # created here on the tk thread, only polls once updater() is called
+        self.sheet_updater = SheetUpdater(self)
         if width is not None or height is not None:
             self.grid_propagate(0)
         if width is not None:
@@ -224,6 +266,10 @@ class Sheet(tk.Frame):
             to_clipboard_delimiter=to_clipboard_delimiter,
             to_clipboard_quotechar=to_clipboard_quotechar,
             to_clipboard_lineterminator=to_clipboard_lineterminator,
+            copy_chunk_rows=copy_chunk_rows,
+            paste_chunk_cells=paste_chunk_cells,
+            task_budget_ms=task_budget_ms,
+            auto_width_sample_rows=auto_width_sample_rows,
             from_clipboard_delimiters=from_clipboard_delimiters,
             column_headers_canvas=self.CH,
             row_index_canvas=self.RI,
@@ -266,6 +312,8 @@ class Sheet(tk.Frame):
             empty_horizontal=empty_horizontal,
             empty_vertical=empty_vertical,
             max_undos=max_undos,
+            max_undo_bytes=max_undo_bytes,
+            undo_compression_level=undo_compression_level,
         )
         self.TL = TopLeftRectangle(
             parentframe=self,
@@ -276,24 +324,21 @@ class Sheet(tk.Frame):
             top_left_fg=top_left_fg,
             top_left_fg_highlight=top_left_fg_highlight,
         )
-        self.yscroll = ttk.Scrollbar(
-            self, command=self.MT.set_yviews, orient="vertical"
-        )
-        self.xscroll = ttk.Scrollbar(
-            self, command=self.MT.set_xviews, orient="horizontal"
-        )
+        # scrollbars are built when they are first shown
+        self._yscroll = None
+        self._xscroll = None
         if show_top_left:
             self.TL.grid(row=0, column=0)
         if show_table:
             self.MT.grid(row=1, column=1, sticky="nswe")
-            self.MT["xscrollcommand"] = self.xscroll.set
-            self.MT["yscrollcommand"] = self.yscroll.set
+            self.MT["xscrollcommand"] = self.set_xscroll
+            self.MT["yscrollcommand"] = self.set_yscroll
         if show_row_index:
             self.RI.grid(row=1, column=0, sticky="nswe")
-            self.RI["yscrollcommand"] = self.yscroll.set
+            self.RI["yscrollcommand"] = self.set_yscroll
         if show_header:
             self.CH.grid(row=0, column=1, sticky="nswe")
-            self.CH["xscrollcommand"] = self.xscroll.set
+            self.CH["xscrollcommand"] = self.set_xscroll
         if show_x_scrollbar:
             self.xscroll.grid(row=2, column=0, columnspan=2, sticky="nswe")
             self.xscroll_showing = True
@@ -358,7 +403,9 @@ class Sheet(tk.Frame):
             self.MT.focus_set()
 
     def set_refresh_timer(self, redraw=True):
-        if redraw and self.after_redraw_id is None:
+        if redraw and self.MT.batch_depth:
+            self.MT.batch_redraw = True
+        elif redraw and self.after_redraw_id is None:
             self.after_redraw_id = self.after(
                 self.after_redraw_time_ms, self.after_redraw
             )
@@ -369,6 +416,32 @@ class Sheet(tk.Frame):
         )
         self.after_redraw_id = None
 
+    @property
+    def yscroll(self):
+        if self._yscroll is None:
+            self._yscroll = ttk.Scrollbar(
+                self, command=self.MT.set_yviews, orient="vertical"
+            )
+            self._yscroll.set(*self.MT.yview())
+        return self._yscroll
+
+    @property
+    def xscroll(self):
+        if self._xscroll is None:
+            self._xscroll = ttk.Scrollbar(
+                self, command=self.MT.set_xviews, orient="horizontal"
+            )
+            self._xscroll.set(*self.MT.xview())
+        return self._xscroll
+
+    def set_yscroll(self, first, last):
+        if self._yscroll is not None:
+            self._yscroll.set(first, last)
+
+    def set_xscroll(self, first, last):
+        if self._xscroll is not None:
+            self._xscroll.set(first, last)
+
     def show(self, canvas="all"):
         if canvas == "all":
             self.hide()
@@ -378,23 +451,23 @@ class Sheet(tk.Frame):
             self.MT.grid(row=1, column=1, sticky="nswe")
             self.yscroll.grid(row=0, column=2, rowspan=3, sticky="nswe")
             self.xscroll.grid(row=2, column=0, columnspan=2, sticky="nswe")
-            self.MT["xscrollcommand"] = self.xscroll.set
-            self.CH["xscrollcommand"] = self.xscroll.set
-            self.MT["yscrollcommand"] = self.yscroll.set
-            self.RI["yscrollcommand"] = self.yscroll.set
+            self.MT["xscrollcommand"] = self.set_xscroll
+            self.CH["xscrollcommand"] = self.set_xscroll
+            self.MT["yscrollcommand"] = self.set_yscroll
+            self.RI["yscrollcommand"] = self.set_yscroll
             self.xscroll_showing = True
             self.yscroll_showing = True
             self.xscroll_disabled = False
             self.yscroll_disabled = False
         elif canvas == "row_index":
             self.RI.grid(row=1, column=0, sticky="nswe")
-            self.MT["yscrollcommand"] = self.yscroll.set
-            self.RI["yscrollcommand"] = self.yscroll.set
+            self.MT["yscrollcommand"] = self.set_yscroll
+            self.RI["yscrollcommand"] = self.set_yscroll
             self.MT.show_index = True
         elif canvas == "header":
             self.CH.grid(row=0, column=1, sticky="nswe")
-            self.MT["xscrollcommand"] = self.xscroll.set
-            self.CH["xscrollcommand"] = self.xscroll.set
+            self.MT["xscrollcommand"] = self.set_xscroll
+            self.CH["xscrollcommand"] = self.set_xscroll
             self.MT.show_header = True
         elif canvas == "top_left":
             self.TL.grid(row=0, column=0)
@@ -418,8 +491,10 @@ class Sheet(tk.Frame):
             self.CH["xscrollcommand"] = 0
             self.MT.show_header = False
             self.MT.grid_forget()
-            self.yscroll.grid_forget()
-            self.xscroll.grid_forget()
+            if self._yscroll is not None:
+                self._yscroll.grid_forget()
+            if self._xscroll is not None:
+                self._xscroll.grid_forget()
             self.xscroll_showing = False
             self.yscroll_showing = False
             self.xscroll_disabled = True
@@ -435,11 +510,13 @@ class Sheet(tk.Frame):
         elif canvas.lower() == "top_left":
             self.TL.grid_forget()
         elif canvas.lower() == "x_scrollbar":
-            self.xscroll.grid_forget()
+            if self._xscroll is not None:
+                self._xscroll.grid_forget()
             self.xscroll_showing = False
             self.xscroll_disabled = True
         elif canvas.lower() == "y_scrollbar":
-            self.yscroll.grid_forget()
+            if self._yscroll is not None:
+                self._yscroll.grid_forget()
             self.yscroll_showing = False
             self.yscroll_disabled = True
 
@@ -721,24 +798,91 @@ class Sheet(tk.Frame):
                 if binding == "deselect":
                     self.MT.deselection_binding_func = func
 
+    def updater(self, interval_ms=None, budget_ms=None, idle_interval_ms=None):
+        # must first be called on the tk thread, the updater can then be
+        # used from any thread
+        if interval_ms is not None:
+            self.sheet_updater.interval_ms = interval_ms
+        if budget_ms is not None:
+            self.sheet_updater.budget_ms = budget_ms
+        if idle_interval_ms is not None:
+            self.sheet_updater.idle_interval_ms = idle_interval_ms
+        self.sheet_updater.start()
+        return self.sheet_updater
+
+    def post_updates(self, updates):
+        # any thread, the updates are applied once updater() has been called
+        self.sheet_updater.post(updates)
+
+    @contextmanager
+    def batch(self):
+        # redraws, <<SheetModified>> events and undo entries are held
+        # until the end of the block and then done once
+        self.MT.begin_batch()
+        try:
+            yield self
+        finally:
+            event_data = self.MT.end_batch()
+            if event_data is not None:
+                self.emit_event("<<SheetModified>>", event_data)
+
     def emit_event(self, event, data={}):
+        if event == "<<SheetModified>>" and self.MT.batch_depth:
+            self.MT.batch_events.append(data)
+            return
         data['name']=self.name
-        self.event_generate(event, data=data)
+        # functions are called directly with the data dict itself, it is
+        # not passed through tk as a string
+        subscribers = self.event_subscribers.get(event)
+        tk_bound = self.tk_events and self.tk_event_bound(event)
+        if (subscribers or tk_bound) and not self.event_ranges:
+            expand_event_ranges(data)
+        if subscribers:
+            sheet_event = SheetEvent(data, self)
+            for funcid, func in tuple(subscribers):
+                # reported like an error in a tk callback, the sheet's
+                # change and the other functions still go ahead
+                try:
+                    if func(sheet_event) == "break":
+                        break
+                except Exception:
+                    self._root().report_callback_exception(*sys.exc_info())
+        if tk_bound:
+            self.event_generate(event, data=data)
+
+    def tk_event_bound(self, event):
+        # whether a function is bound using tk to the sheet's bindtags for
+        # event, e.g. by bind() or the root's bind(), in one tcl call
+        return bool(
+            int(
+                self.tk.call(
+                    "apply",
+                    "{w e} {foreach tag [bindtags $w] "
+                    "{if {[bind $tag $e] ne {}} {return 1}}; return 0}",
+                    self._w,
+                    event,
+                )
+                or 0
+            )
+        )
 
     def bind_event(self, sequence, func, add=None):
-        widget = self
-
-        def _substitute(*args):
-            e = lambda: None
-            e.data = eval(args[0])
-            e.widget = widget
-            return (e,)
-
-        funcid = widget._register(func, _substitute, needcleanup=1)
-        cmd = '{0}if {{"[{1} %d]" == "break"}} break\n'.format(
-            "+" if add else "", funcid
-        )
-        widget.tk.call("bind", widget._w, sequence, cmd)
+        # like tk bind, without add the sequence's other functions are removed
+        if not add or sequence not in self.event_subscribers:
+            self.event_subscribers[sequence] = []
+        funcid = f"sheet_event{next(self.event_funcids)}"
+        self.event_subscribers[sequence].append((funcid, func))
+        return funcid
+
+    def unbind_event(self, sequence, funcid=None):
+        if funcid is None:
+            self.event_subscribers.pop(sequence, None)
+        elif sequence in self.event_subscribers:
+            self.event_subscribers[sequence] = [
+                (id_, func)
+                for id_, func in self.event_subscribers[sequence]
+                if id_ != funcid
+            ]
 
     def bind(self, binding, func, add=None):
         if binding == "<ButtonPress-1>":
@@ -771,6 +915,9 @@ class Sheet(tk.Frame):
             self.CH.extra_rc_func = func
             self.RI.extra_rc_func = func
             self.TL.extra_rc_func = func
+        elif binding in emitted_events:
+            # generated on the sheet itself when tk_events is True
+            return super().bind(binding, func, add=add)
         else:
             self.MT.bind(binding, func, add=add)
             self.CH.bind(binding, func, add=add)
@@ -808,6 +955,8 @@ class Sheet(tk.Frame):
             self.CH.extra_rc_func = None
             self.RI.extra_rc_func = None
             self.TL.extra_rc_func = None
+        elif binding in emitted_events:
+            super().unbind(binding)
         else:
             self.MT.unbind(binding)
             self.CH.unbind(binding)
@@ -909,7 +1058,12 @@ class Sheet(tk.Frame):
             )
         ]
 
-    def set_all_cell_sizes_to_text(self, redraw=True):
+    def set_all_cell_sizes_to_text(self, redraw=True, background=False):
+        if background:
+            return self.MT.run_task(
+                "set_all_cell_sizes_to_text",
+                self.MT.yield_all_cell_sizes_to_text(visible_first=True),
+            )
         self.MT.set_all_cell_sizes_to_text()
         self.set_refresh_timer(redraw)
         return self.MT.row_positions, self.MT.col_positions
@@ -1155,15 +1309,38 @@ class Sheet(tk.Frame):
     def copy(self, event=None):
         self.MT.ctrl_c()
 
+    def cancel_copy(self):
+        return self.MT.cancel_copy()
+
     def paste(self, event=None):
         self.MT.ctrl_v()
 
+    def finish_paste(self):
+        self.MT.finish_paste()
+
+    def run_task(self, name, generator, progress=None, complete=None):
+        return self.MT.run_task(
+            name, generator, on_progress=progress, on_complete=complete
+        )
+
+    def get_task(self, name):
+        return self.MT.tasks.get(name)
+
+    def cancel_task(self, name=None):
+        self.MT.cancel_task(name)
+
+    def finish_tasks(self):
+        self.MT.finish_tasks()
+
     def delete(self, event=None):
         self.MT.delete_key()
 
     def undo(self, event=None):
         self.MT.ctrl_z()
 
+    def redo(self, event=None):
+        self.MT.ctrl_y()
+
     def delete_row_position(self, idx: int, deselect_all=False):
         self.MT.del_row_position(idx=idx, deselect_all=deselect_all)
 
@@ -1180,70 +1357,7 @@ class Sheet(tk.Frame):
             to_del = set(rows)
         if not to_del:
             return
-        self.MT.data[:] = [row for r, row in enumerate(self.MT.data) if r not in to_del]
-        if self.MT.all_rows_displayed:
-            self.set_row_heights(
-                row_heights=(
-                    h
-                    for r, h in enumerate(
-                        int(b - a)
-                        for a, b in zip(
-                            self.MT.row_positions,
-                            islice(
-                                self.MT.row_positions, 1, len(self.MT.row_positions)
-                            ),
-                        )
-                    )
-                    if r not in to_del
-                )
-            )
-        else:
-            dispset = set(self.MT.displayed_rows)
-            heights_to_del = {i for i, r in enumerate(to_bis) if r in dispset}
-            if heights_to_del:
-                self.set_row_heights(
-                    row_heights=(
-                        h
-                        for r, h in enumerate(
-                            int(b - a)
-                            for a, b in zip(
-                                self.MT.row_positions,
-                                islice(
-                                    self.MT.row_positions, 1, len(self.MT.row_positions)
-                                ),
-                            )
-                        )
-                        if r not in heights_to_del
-                    )
-                )
-            self.MT.displayed_rows = [
-                r for r in self.MT.displayed_rows if r not in to_del
-            ]
-        to_bis = sorted(to_del)
-        self.MT.cell_options = {
-            (
-                r
-                if not bisect.bisect_left(to_bis, r)
-                else r - bisect.bisect_left(to_bis, r),
-                c,
-            ): v
-            for (r, c), v in self.MT.cell_options.items()
-            if r not in to_del
-        }
-        self.MT.row_options = {
-            r
-            if not bisect.bisect_left(to_bis, r)
-            else r - bisect.bisect_left(to_bis, r): v
-            for r, v in self.MT.row_options.items()
-            if r not in to_del
-        }
-        self.RI.cell_options = {
-            r
-            if not bisect.bisect_left(to_bis, r)
-            else r - bisect.bisect_left(to_bis, r): v
-            for r, v in self.RI.cell_options.items()
-            if r not in to_del
-        }
+        self.MT.delete_rows_data(to_del, del_index=False)
         self.set_refresh_timer(redraw)
 
     def insert_row_position(
@@ -1270,8 +1384,9 @@ class Sheet(tk.Frame):
                 height = self.MT.get_lines_cell_height(
                     int(self.MT.default_row_height[0])
                 )
-                for r in range(number - len(self.MT.data)):
-                    self.MT.insert_row_position("end", height)
+                self.MT.insert_row_positions(
+                    "end", heights=list(repeat(height, number - len(self.MT.data)))
+                )
         elif number < len(self.MT.data):
             if not self.MT.all_rows_displayed:
                 self.MT.display_rows(
@@ -1290,8 +1405,9 @@ class Sheet(tk.Frame):
         if number > total_cols:
             if mod_positions:
                 width = self.MT.default_column_width
-                for c in range(number - total_cols):
-                    self.MT.insert_col_position("end", width)
+                self.MT.insert_col_positions(
+                    "end", widths=list(repeat(width, number - total_cols))
+                )
         elif number < total_cols:
             if not self.MT.all_columns_displayed:
                 self.MT.display_columns(
@@ -1345,76 +1461,7 @@ class Sheet(tk.Frame):
             to_del = set(columns)
         if not to_del:
             return
-        self.MT.data[:] = [
-            [e for c, e in enumerate(r) if c not in to_del] for r in self.MT.data
-        ]
-        to_bis = sorted(to_del)
-        if self.MT.all_columns_displayed:
-            self.set_column_widths(
-                column_widths=(
-                    w
-                    for c, w in enumerate(
-                        int(b - a)
-                        for a, b in zip(
-                            self.MT.col_positions,
-                            islice(
-                                self.MT.col_positions, 1, len(self.MT.col_positions)
-                            ),
-                        )
-                    )
-                    if c not in to_del
-                )
-            )
-        else:
-            dispset = set(self.MT.displayed_columns)
-            widths_to_del = {i for i, c in enumerate(to_bis) if c in dispset}
-            if widths_to_del:
-                self.set_column_widths(
-                    column_widths=(
-                        w
-                        for c, w in enumerate(
-                            int(b - a)
-                            for a, b in zip(
-                                self.MT.col_positions,
-                                islice(
-                                    self.MT.col_positions, 1, len(self.MT.col_positions)
-                                ),
-                            )
-                        )
-                        if c not in widths_to_del
-                    )
-                )
-            self.MT.displayed_columns = [
-                c
-                if not bisect.bisect_left(to_bis, c)
-                else c - bisect.bisect_left(to_bis, c)
-                for c in self.MT.displayed_columns
-                if c not in to_del
-            ]
-        self.MT.cell_options = {
-            (
-                r,
-                c
-                if not bisect.bisect_left(to_bis, c)
-                else c - bisect.bisect_left(to_bis, c),
-            ): v
-            for (r, c), v in self.MT.cell_options.items()
-            if c not in to_del
-        }
-        self.MT.col_options = {
-            c
-            if not bisect.bisect_left(to_bis, c)
-            else c - bisect.bisect_left(to_bis, c): v
-            for c, v in self.MT.col_options.items()
-            if c not in to_del
-        }
-        self.CH.cell_options = {
-            c
-            if not bisect.bisect_left(to_bis, c)
-            else c - bisect.bisect_left(to_bis, c): v
-            for c, v in self.CH.cell_options.items()
-            if c not in to_del
-        }
+        self.MT.delete_cols_data(to_del, del_headers=False)
         self.set_refresh_timer(redraw)
 
     def insert_column_position(
@@ -1857,22 +1904,41 @@ class Sheet(tk.Frame):
         self.RI.readonly_index(rows=rows, readonly=readonly)
         self.set_refresh_timer(redraw)
 
-    def dehighlight_all(self, redraw=True):
-        for k in self.MT.cell_options:
-            if "highlight" in self.MT.cell_options[k]:
-                del self.MT.cell_options[k]["highlight"]
-        for k in self.MT.row_options:
-            if "highlight" in self.MT.row_options[k]:
-                del self.MT.row_options[k]["highlight"]
-        for k in self.MT.col_options:
-            if "highlight" in self.MT.col_options[k]:
-                del self.MT.col_options[k]["highlight"]
-        for k in self.RI.cell_options:
-            if "highlight" in self.RI.cell_options[k]:
-                del self.RI.cell_options[k]["highlight"]
-        for k in self.CH.cell_options:
-            if "highlight" in self.CH.cell_options[k]:
-                del self.CH.cell_options[k]["highlight"]
+    def add_highlight_rule(
+        self,
+        columns=None,
+        predicate=None,
+        bg=None,
+        fg=None,
+        priority=0,
+        key_column=None,
+        redraw=True,
+    ):
+        if predicate is None:
+            raise ValueError("predicate argument must be callable or a comparison")
+        rule_id = self.MT.add_highlight_rule(
+            columns,
+            predicate,
+            bg=bg,
+            fg=fg,
+            priority=priority,
+            key_column=key_column,
+        )
+        self.set_refresh_timer(redraw)
+        return rule_id
+
+    def delete_highlight_rule(self, rule_id=None, redraw=True):
+        self.MT.delete_highlight_rule(rule_id)
+        self.set_refresh_timer(redraw)
+
+    def get_highlight_rules(self):
+        return list(self.MT.highlight_rules)
+
+    def dehighlight_all(self, redraw=True, background=False):
+        if background:
+            return self.MT.run_task("dehighlight_all", self.MT.yield_dehighlight_all())
+        for _ in self.MT.yield_dehighlight_all():
+            pass
         self.set_refresh_timer(redraw)
 
     def dehighlight_rows(self, rows=[], redraw=True):
@@ -1995,57 +2061,37 @@ class Sheet(tk.Frame):
         if bg is None and fg is None:
             return
         if canvas == "table":
+            if overwrite:
+
+                def highlight(old):
+                    return (bg, fg)
+
+            else:
+
+                def highlight(old):
+                    if old is None:
+                        return (bg, fg)
+                    return (old[0] if bg is None else bg, old[1] if fg is None else fg)
+
             if cells:
-                for r_, c_ in cells:
-                    if (r_, c_) not in self.MT.cell_options:
-                        self.MT.cell_options[(r_, c_)] = {}
-                    if "highlight" in self.MT.cell_options[(r_, c_)] and not overwrite:
-                        self.MT.cell_options[(r_, c_)]["highlight"] = (
-                            self.MT.cell_options[(r_, c_)]["highlight"][0]
-                            if bg is None
-                            else bg,
-                            self.MT.cell_options[(r_, c_)]["highlight"][1]
-                            if fg is None
-                            else fg,
-                        )
-                    else:
-                        self.MT.cell_options[(r_, c_)]["highlight"] = (bg, fg)
+                boxes = cells_to_boxes(cells)
+            elif (
+                isinstance(row, str)
+                and row.lower() == "all"
+                and isinstance(column, int)
+            ):
+                boxes = ((0, column, self.MT.total_data_rows(), column + 1),)
+            elif (
+                isinstance(column, str)
+                and column.lower() == "all"
+                and isinstance(row, int)
+            ):
+                boxes = ((row, 0, row + 1, self.MT.total_data_cols()),)
+            elif isinstance(row, int) and isinstance(column, int):
+                boxes = ((row, column, row + 1, column + 1),)
             else:
-                if (
-                    isinstance(row, str)
-                    and row.lower() == "all"
-                    and isinstance(column, int)
-                ):
-                    riter = range(self.MT.total_data_rows())
-                    citer = (column,)
-                elif (
-                    isinstance(column, str)
-                    and column.lower() == "all"
-                    and isinstance(row, int)
-                ):
-                    riter = (row,)
-                    citer = range(self.MT.total_data_cols())
-                elif isinstance(row, int) and isinstance(column, int):
-                    riter = (row,)
-                    citer = (column,)
-                for r_ in riter:
-                    for c_ in citer:
-                        if (r_, c_) not in self.MT.cell_options:
-                            self.MT.cell_options[(r_, c_)] = {}
-                        if (
-                            "highlight" in self.MT.cell_options[(r_, c_)]
-                            and not overwrite
-                        ):
-                            self.MT.cell_options[(r_, c_)]["highlight"] = (
-                                self.MT.cell_options[(r_, c_)]["highlight"][0]
-                                if bg is None
-                                else bg,
-                                self.MT.cell_options[(r_, c_)]["highlight"][1]
-                                if fg is None
-                                else fg,
-                            )
-                        else:
-                            self.MT.cell_options[(r_, c_)]["highlight"] = (bg, fg)
+                boxes = ()
+            self.MT.highlight_ranges.update_boxes(boxes, highlight)
         elif canvas in ("row_index", "index"):
             if bg is None and fg is None:
                 return
@@ -2092,6 +2138,7 @@ class Sheet(tk.Frame):
         self, row=0, column=0, cells=[], canvas="table", all_=False, redraw=True
     ):
         if row == "all" and canvas == "table":
+            self.MT.highlight_ranges.clear()
             for k, v in self.MT.cell_options.items():
                 if "highlight" in v:
                     del self.MT.cell_options[k]["highlight"]
@@ -2105,12 +2152,18 @@ class Sheet(tk.Frame):
                     del self.CH.cell_options[k]["highlight"]
         if canvas == "table":
             if cells and not all_:
-                for t in cells:
-                    try:
-                        del self.MT.cell_options[t]["highlight"]
-                    except Exception:
-                        pass
+                self.MT.highlight_ranges.delete_boxes(cells_to_boxes(cells))
+                if self.MT.cell_options:
+                    for t in cells:
+                        try:
+                            del self.MT.cell_options[t]["highlight"]
+                        except Exception:
+                            pass
             elif not all_:
+                if isinstance(row, int) and isinstance(column, int):
+                    self.MT.highlight_ranges.delete_box(
+                        row, column, row + 1, column + 1
+                    )
                 if (
                     row,
                     column,
@@ -2119,6 +2172,7 @@ class Sheet(tk.Frame):
                 ]:
                     del self.MT.cell_options[(row, column)]["highlight"]
             elif all_:
+                self.MT.highlight_ranges.clear()
                 for k in self.MT.cell_options:
                     if "highlight" in self.MT.cell_options[k]:
                         del self.MT.cell_options[k]["highlight"]
@@ -2161,24 +2215,40 @@ class Sheet(tk.Frame):
     def delete_out_of_bounds_options(self):
         maxc = self.total_columns()
         maxr = self.total_rows()
-        self.MT.cell_options = {
-            k: v for k, v in self.MT.cell_options.items() if k[0] < maxr and k[1] < maxc
-        }
-        self.RI.cell_options = {
-            k: v for k, v in self.RI.cell_options.items() if k < maxr
-        }
-        self.CH.cell_options = {
-            k: v for k, v in self.CH.cell_options.items() if k < maxc
-        }
-        self.MT.col_options = {k: v for k, v in self.MT.col_options.items() if k < maxc}
-        self.MT.row_options = {k: v for k, v in self.MT.row_options.items() if k < maxr}
+        self.MT.cell_options.reset(
+            {
+                k: v
+                for k, v in self.MT.cell_options.items()
+                if k[0] < maxr and k[1] < maxc
+            }
+        )
+        self.MT.highlight_ranges.reset(
+            {
+                (r1, c1, min(r2, maxr), min(c2, maxc)): v
+                for (r1, c1, r2, c2), v in self.MT.highlight_ranges.boxes().items()
+                if r1 < maxr and c1 < maxc
+            }
+        )
+        self.RI.cell_options.reset(
+            {k: v for k, v in self.RI.cell_options.items() if k < maxr}
+        )
+        self.CH.cell_options.reset(
+            {k: v for k, v in self.CH.cell_options.items() if k < maxc}
+        )
+        self.MT.col_options.reset(
+            {k: v for k, v in self.MT.col_options.items() if k < maxc}
+        )
+        self.MT.row_options.reset(
+            {k: v for k, v in self.MT.row_options.items() if k < maxr}
+        )
 
     def reset_all_options(self):
-        self.MT.cell_options = {}
-        self.RI.cell_options = {}
-        self.CH.cell_options = {}
-        self.MT.col_options = {}
-        self.MT.row_options = {}
+        self.MT.cell_options.clear()
+        self.MT.highlight_ranges.clear()
+        self.RI.cell_options.clear()
+        self.CH.cell_options.clear()
+        self.MT.col_options.clear()
+        self.MT.row_options.clear()
 
     def get_cell_options(self, canvas="table"):
         if canvas == "table":
@@ -2188,13 +2258,28 @@ class Sheet(tk.Frame):
         elif canvas == "header":
             return self.CH.cell_options
 
-    def get_highlighted_cells(self, canvas="table"):
+    def get_highlighted_cells(self, canvas="table", ranges=False):
         if canvas == "table":
-            return {
+            highlights = {
                 k: v["highlight"]
                 for k, v in self.MT.cell_options.items()
                 if "highlight" in v
             }
+            boxes = self.MT.highlight_ranges.boxes()
+            if ranges:
+                return {
+                    **{
+                        (r, c, r + 1, c + 1): v
+                        for (r, c), v in highlights.items()
+                        if self.MT.highlight_ranges.get(r, c) is None
+                    },
+                    **boxes,
+                }
+            for (r1, c1, r2, c2), v in boxes.items():
+                for r in range(r1, r2):
+                    for c in range(c1, c2):
+                        highlights[(r, c)] = v
+            return highlights
         elif canvas == "row_index":
             return {
                 k: v["highlight"]
@@ -2355,6 +2440,18 @@ class Sheet(tk.Frame):
             self.MT.to_clipboard_quotechar = kwargs["to_clipboard_quotechar"]
         if "to_clipboard_lineterminator" in kwargs:
             self.MT.to_clipboard_lineterminator = kwargs["to_clipboard_lineterminator"]
+        if "copy_chunk_rows" in kwargs:
+            self.MT.copy_chunk_rows = kwargs["copy_chunk_rows"]
+        if "paste_chunk_cells" in kwargs:
+            self.MT.paste_chunk_cells = kwargs["paste_chunk_cells"]
+        if "task_budget_ms" in kwargs:
+            self.MT.task_budget_ms = kwargs["task_budget_ms"]
+        if "auto_width_sample_rows" in kwargs:
+            self.MT.auto_width_sample_rows = kwargs["auto_width_sample_rows"]
+        if "event_ranges" in kwargs:
+            self.event_ranges = kwargs["event_ranges"]
+        if "tk_events" in kwargs:
+            self.tk_events = kwargs["tk_events"]
         if "from_clipboard_delimiters" in kwargs:
             self.MT.from_clipboard_delimiters = kwargs["from_clipboard_delimiters"]
         if "show_dropdown_borders" in kwargs:
@@ -2499,6 +2596,17 @@ class Sheet(tk.Frame):
             self.MT.max_header_height = float(kwargs["max_header_height"])
         if "max_index_width" in kwargs:
             self.MT.max_index_width = float(kwargs["max_index_width"])
+        if "max_undos" in kwargs or "max_undo_bytes" in kwargs:
+            if "max_undos" in kwargs:
+                self.MT.max_undos = kwargs["max_undos"]
+            if "max_undo_bytes" in kwargs:
+                self.MT.max_undo_bytes = kwargs["max_undo_bytes"]
+            self.MT.undo_storage.set_limits(
+                maxlen=self.MT.max_undos, max_bytes=self.MT.max_undo_bytes
+            )
+        if "undo_compression_level" in kwargs:
+            self.MT.undo_storage.compress_level = kwargs["undo_compression_level"]
+            self.MT.undo_storage.schedule_compress()
         if "font" in kwargs:
             self.MT.font(kwargs["font"])
         if "header_font" in kwargs:
@@ -2809,6 +2917,7 @@ class Sheet(tk.Frame):
         verify=False,
         reset_highlights=False,
         keep_formatting=True,
+        background=False,
     ):
         if verify and (
             not isinstance(data, list) or not all(isinstance(row, list) for row in data)
@@ -2818,14 +2927,31 @@ class Sheet(tk.Frame):
             )
         if reset_highlights:
             self.dehighlight_all()
-        return self.MT.data_reference(
+        data = self.MT.data_reference(
             data,
             reset_col_positions,
             reset_row_positions,
             redraw,
             return_id=False,
             keep_formatting=keep_formatting,
+            reapply_formatting=not background,
         )
+        if background and keep_formatting:
+            return self.reapply_formatting(background=True)
+        return data
+
+    def update_sheet_data(self, data=[[]], key=None, redraw=True, verify=False):
+        if verify and (
+            not isinstance(data, list) or not all(isinstance(row, list) for row in data)
+        ):
+            raise ValueError(
+                "Data argument must be a list of lists, sublists being rows"
+            )
+        if key is not None and not callable(key):
+            raise ValueError("key argument must be callable or None")
+        self.MT.update_data(data, key=key)
+        self.set_refresh_timer(redraw)
+        return self.MT.data
 
     def set_cell_data(self, r, c, value="", redraw=False, keep_formatting=True):
         if not keep_formatting:
@@ -2842,6 +2968,8 @@ class Sheet(tk.Frame):
         if not keep_formatting:
             self.MT.delete_row_format(r, clear_values=False)
         maxidx = len(self.MT.data[r]) - 1
+        if not values or len(values) > maxidx + 1:
+            self.MT.invalidate_col_text_widths()
         if not values:
             self.MT.data[r][:] = self.MT.get_empty_row_seq(r, len(self.MT.data[r]))
         if add_columns:
@@ -2932,6 +3060,7 @@ class Sheet(tk.Frame):
         mod_column_positions=True,
         redraw=True,
     ):
+        self.MT.finish_tasks()
         if equalize_data_row_lengths:
             old_total = self.MT.equalize_data_row_lengths()
         else:
@@ -2977,58 +3106,30 @@ class Sheet(tk.Frame):
                     else widths,
                     deselect_all=deselect_all,
                 )
-        maxidx = len(self.MT.data) - 1
-        if add_rows:
-            height = self.MT.default_row_height[1]
-            if idx == "end":
-                for values in reversed(data):
-                    for rn, v in enumerate(values):
-                        if rn > maxidx:
-                            self.MT.data.append(
-                                self.MT.get_empty_row_seq(rn, old_total)
-                            )
-                            if self.MT.all_rows_displayed:
-                                self.MT.insert_row_position("end", height=height)
-                            maxidx += 1
-                        self.MT.data[rn].append(v)
-            else:
-                for values in reversed(data):
-                    for rn, v in enumerate(values):
-                        if rn > maxidx:
-                            self.MT.data.append(
-                                self.MT.get_empty_row_seq(rn, old_total)
-                            )
-                            if self.MT.all_rows_displayed:
-                                self.MT.insert_row_position("end", height=height)
-                            maxidx += 1
-                        self.MT.data[rn].insert(idx, v)
+        if isinstance(columns, int):
+            rows_values = data
         else:
+            numrows = max(map(len, data), default=0)
+            if add_rows and numrows > len(self.MT.data):
+                if self.MT.all_rows_displayed:
+                    self.MT.insert_row_positions(
+                        "end", heights=numrows - len(self.MT.data)
+                    )
+                self.MT.data.extend(
+                    self.MT.get_empty_row_seq(rn, old_total)
+                    for rn in range(len(self.MT.data), numrows)
+                )
+            rows_values = (
+                [column[rn] for column in data if rn < len(column)]
+                for rn in range(numrows)
+            )
+        for row, values in zip(self.MT.data, rows_values):
             if idx == "end":
-                for values in reversed(data):
-                    for rn, v in enumerate(values):
-                        if rn > maxidx:
-                            break
-                        self.MT.data[rn].append(v)
+                row.extend(values)
             else:
-                for values in reversed(data):
-                    for rn, v in enumerate(values):
-                        if rn > maxidx:
-                            break
-                        self.MT.data[rn].insert(idx, v)
+                row[idx:idx] = values
         if isinstance(idx, int):
-            num_add = len(data)
-            self.MT.cell_options = {
-                (rn, cn if cn < idx else cn + num_add): t2
-                for (rn, cn), t2 in self.MT.cell_options.items()
-            }
-            self.MT.col_options = {
-                cn if cn < idx else cn + num_add: t
-                for cn, t in self.MT.col_options.items()
-            }
-            self.CH.cell_options = {
-                cn if cn < idx else cn + num_add: t
-                for cn, t in self.CH.cell_options.items()
-            }
+            self.MT.col_offsets.insert(idx, numcols)
         self.set_refresh_timer(redraw)
 
     def insert_row(
@@ -3061,6 +3162,7 @@ class Sheet(tk.Frame):
         mod_row_positions=True,
         redraw=True,
     ):
+        self.MT.finish_tasks()
         total_cols = None
         datarn = len(self.MT.data) if idx == "end" else idx
         if isinstance(rows, int):
@@ -3118,22 +3220,15 @@ class Sheet(tk.Frame):
                 deselect_all=deselect_all,
             )
         if isinstance(idx, str) and idx.lower() == "end":
+            self.MT.mark_col_text_widths(
+                range(len(self.MT.data), len(self.MT.data) + len(data))
+            )
             self.MT.data.extend(data)
         else:
             self.MT.data[idx:idx] = data
             num_add = len(data)
-            self.MT.cell_options = {
-                (rn if rn < idx else rn + num_add, cn): t2
-                for (rn, cn), t2 in self.MT.cell_options.items()
-            }
-            self.MT.row_options = {
-                rn if rn < idx else rn + num_add: t
-                for rn, t in self.MT.row_options.items()
-            }
-            self.RI.cell_options = {
-                rn if rn < idx else rn + num_add: t
-                for rn, t in self.RI.cell_options.items()
-            }
+            self.MT.row_offsets.insert(idx, num_add)
+            self.MT.mark_col_text_widths(range(idx, idx + num_add))
         self.set_refresh_timer(redraw)
 
     def sheet_data_dimensions(self, total_rows=None, total_columns=None):
@@ -3304,7 +3399,7 @@ class Sheet(tk.Frame):
         )
 
     def reset_undos(self):
-        self.MT.undo_storage = deque(maxlen=self.MT.max_undos)
+        self.MT.undo_storage.clear()
 
     def redraw(self, redraw_header=True, redraw_row_index=True):
         self.MT.main_table_redraw_grid_and_text(
@@ -3312,6 +3407,8 @@ class Sheet(tk.Frame):
         )
 
     def refresh(self, redraw_header=True, redraw_row_index=True):
+        # data may have been changed directly, measured widths are dropped
+        self.MT.invalidate_col_text_widths()
         self.MT.main_table_redraw_grid_and_text(
             redraw_header=redraw_header, redraw_row_index=redraw_row_index
         )
@@ -3466,6 +3563,7 @@ class Sheet(tk.Frame):
     def click_checkbox(self, r, c, checked=None):
         kwargs = self.MT.get_cell_kwargs(r, c, key="checkbox")
         if kwargs:
+            self.MT.mark_col_text_widths((r,), c)
             if not type(self.MT.data[r][c]) == bool:
                 if checked is None:
                     self.MT.data[r][c] = False
@@ -3900,10 +3998,11 @@ class Sheet(tk.Frame):
     def close_index_dropdown(self, r):
         self.RI.close_dropdown_window(r)
 
-    def reapply_formatting(self):
-        self.MT.reapply_formatting()
-
-    def reapply_formatting(self):
+    def reapply_formatting(self, background=False):
+        if background:
+            return self.MT.run_task(
+                "reapply_formatting", self.MT.yield_reapply_formatting()
+            )
         self.MT.reapply_formatting()
 
     def delete_all_formatting(self, clear_values=False):
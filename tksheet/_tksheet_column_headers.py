@@ -1,13 +1,30 @@
-import pickle
 import tkinter as tk
-import zlib
 from collections import defaultdict
 from itertools import accumulate, chain, cycle, islice
 from math import ceil, floor
 
-from ._tksheet_formatters import *
-from ._tksheet_other_classes import *
-from ._tksheet_vars import *
+from ._tksheet_formatters import is_bool_like, try_to_bool
+from ._tksheet_other_classes import (
+    BeginDragDropEvent,
+    DefaultLabels,
+    DraggedRowColumn,
+    DrawnItem,
+    DropDownModifiedEvent,
+    EditHeaderEvent,
+    EndDragDropEvent,
+    ResizeEvent,
+    SelectColumnEvent,
+    SelectionBoxEvent,
+    TextCfg,
+    TextEditor,
+    get_checkbox_dict,
+    get_dropdown_dict,
+    get_seq_without_gaps_at_index,
+    sheet_modified_event_data,
+)
+from ._tksheet_vars import USER_OS, Color_Map_, rc_binding, symbols_set
+
+__all__ = ["ColumnHeaders"]
 
 
 class ColumnHeaders(tk.Canvas):
@@ -91,6 +108,7 @@ class ColumnHeaders(tk.Canvas):
 
         self.column_drag_and_drop_perform = kwargs["column_drag_and_drop_perform"]
         self.default_header = kwargs["default_header"].lower()
+        self.default_labels = DefaultLabels()
         self.header_bg = kwargs["header_bg"]
         self.header_fg = kwargs["header_fg"]
         self.header_grid_fg = kwargs["header_grid_fg"]
@@ -204,6 +222,7 @@ class ColumnHeaders(tk.Canvas):
     def rc(self, event):
         self.mouseclick_outside_editor_or_dropdown_all_canvases()
         self.focus_set()
+        self.MT.build_rc_menus()
         popup_menu = None
         if self.MT.identify_col(x=event.x, allow_end=False) is None:
             self.MT.deselect("all")
@@ -973,9 +992,7 @@ class ColumnHeaders(tk.Canvas):
                     )
                     if self.MT.undo_enabled:
                         self.MT.undo_storage.append(
-                            zlib.compress(
-                                pickle.dumps(("move_cols", orig_selected, new_selected))
-                            )
+                            ("move_cols", orig_selected, new_selected)
                         )
                     self.MT.main_table_redraw_grid_and_text(
                         redraw_header=True, redraw_row_index=True
@@ -1192,11 +1209,6 @@ class ColumnHeaders(tk.Canvas):
     ):
         if col < 0:
             return
-        qconf = self.MT.txt_measure_canvas.itemconfig
-        qbbox = self.MT.txt_measure_canvas.bbox
-        qtxtm = self.MT.txt_measure_canvas_text
-        qtxth = self.MT.txt_h
-        qfont = self.MT.table_font
         self.fix_header()
         if width is None:
             w = self.MT.min_column_width
@@ -1222,21 +1234,25 @@ class ColumnHeaders(tk.Canvas):
             hw, hh_ = self.get_cell_dimensions(datacn)
             # table
             if self.MT.data:
-                for datarn in iterable:
-                    txt = self.MT.get_valid_cell_data_as_str(
-                        datarn, datacn, get_displayed=True
+                top = [] if self.MT.all_rows_displayed else None
+                if displayed_only:
+                    tw = self.MT.get_col_text_width(datacn, iterable)
+                else:
+                    tw = self.MT.get_cached_col_text_width(datacn)
+                if tw is None and len(iterable) > self.MT.auto_width_sample_rows:
+                    # a sample is measured now and the rest when idle
+                    x1, y1, x2, y2 = self.MT.get_canvas_visible_area()
+                    start_row, end_row = self.MT.get_visible_rows(y1, y2)
+                    sample = self.MT.get_col_width_sample(
+                        datacn, iterable, iterable[start_row:end_row]
                     )
-                    if txt:
-                        qconf(qtxtm, text=txt, font=qfont)
-                        b = qbbox(qtxtm)
-                        if self.MT.get_cell_kwargs(
-                            datarn, datacn, key="dropdown"
-                        ) or self.MT.get_cell_kwargs(datarn, datacn, key="checkbox"):
-                            tw = b[2] - b[0] + qtxth + 7
-                        else:
-                            tw = b[2] - b[0] + 7
-                        if tw > w:
-                            w = tw
+                    tw = self.MT.get_col_text_width(datacn, sample, top)
+                    self.MT.refine_col_widths(((datacn, sample, tw, top),))
+                elif tw is None:
+                    tw = self.MT.get_col_text_width(datacn, iterable, top)
+                    self.MT.store_col_text_widths(datacn, top)
+                if tw > w:
+                    w = tw
             if w > hw:
                 new_width = w
             else:
@@ -1770,7 +1786,7 @@ class ColumnHeaders(tk.Canvas):
             lns = self.get_valid_cell_data_as_str(datacn, fix=False).split("\n")
             if lns == [""]:
                 if self.show_default_header_for_empty:
-                    lns = (get_n2a(datacn, self.default_header),)
+                    lns = (self.default_labels.get(datacn, self.default_header),)
                 else:
                     continue
             if mw > self.MT.header_txt_w and not (
@@ -2314,15 +2330,11 @@ class ColumnHeaders(tk.Canvas):
             if not check_input_valid or self.input_valid_for_cell(datacn, value):
                 if self.MT.undo_enabled and undo:
                     self.MT.undo_storage.append(
-                        zlib.compress(
-                            pickle.dumps(
-                                (
-                                    "edit_header",
-                                    {datacn: self.MT._headers[datacn]},
-                                    self.MT.get_boxes(include_current=False),
-                                    self.MT.currently_selected(),
-                                )
-                            )
+                        (
+                            "edit_header",
+                            {datacn: self.MT._headers[datacn]},
+                            self.MT.get_boxes(include_current=False),
+                            self.MT.currently_selected(),
                         )
                     )
                 self.set_cell_data(datacn=datacn, value=value)
@@ -2777,8 +2789,10 @@ class ColumnHeaders(tk.Canvas):
         self.existing_dropdown_window = None
 
     def get_cell_kwargs(self, datacn, key="dropdown", cell=True, entire=True):
-        if cell and datacn in self.cell_options and key in self.cell_options[datacn]:
-            return self.cell_options[datacn][key]
+        if cell:
+            options = self.cell_options.get(datacn)
+            if options and key in options:
+                return options[key]
         if entire and key in self.options:
             return self.options[key]
         return {}
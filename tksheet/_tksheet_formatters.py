@@ -1,7 +1,33 @@
 from typing import Any, Union
 
-from ._tksheet_other_classes import *
-from ._tksheet_vars import *
+from ._tksheet_vars import falsy, nonelike, truthy
+
+__all__ = [
+    "is_none_like",
+    "to_int",
+    "to_float",
+    "to_bool",
+    "try_to_bool",
+    "is_bool_like",
+    "to_str",
+    "float_to_str",
+    "percentage_to_str",
+    "bool_to_str",
+    "int_formatter",
+    "float_formatter",
+    "percentage_formatter",
+    "bool_formatter",
+    "FormatterPipeline",
+    "formatter",
+    "format_data",
+    "format_data_many",
+    "data_to_str",
+    "get_data_with_valid_check",
+    "get_clipboard_data",
+    "Formatter",
+    "FormatterSpec",
+    "FormattedValue",
+]
 
 
 def is_none_like(n: Any):
@@ -159,6 +185,167 @@ def bool_formatter(
     )
 
 
+# types which format functions return unchanged
+format_function_types = {to_int: int, to_float: float, to_bool: bool}
+
+
+def get_format_function(format_function, kwargs):
+    # format function with its kwargs resolved
+    if format_function is to_float:
+        return (
+            lambda value: float(value)
+            if type(value) is str and not value.endswith("%")
+            else to_float(value)
+        )
+    if format_function is to_bool:
+        _truthy = kwargs.get("truthy", truthy)
+        _falsy = kwargs.get("falsy", falsy)
+
+        def bool_function(value):
+            if type(value) == bool:
+                return value
+            v = value.lower() if isinstance(value, str) else value
+            if v in _truthy:
+                return True
+            elif v in _falsy:
+                return False
+            raise ValueError(f'Cannot map "{value}" to bool.')
+
+        return bool_function
+    if format_function is to_int:
+        return to_int
+    return lambda value: format_function(value, **kwargs)
+
+
+def get_to_str_function(to_str_function, kwargs):
+    # to str function with its kwargs resolved
+    if to_str_function in (to_str, bool_to_str):
+        return lambda value: f"{value}"
+    if to_str_function is float_to_str:
+        decimals = kwargs.get("decimals")
+        if not isinstance(decimals, int):
+            return (
+                lambda value: f"{int(value)}"
+                if isinstance(value, float) and value.is_integer()
+                else f"{value}"
+            )
+
+        def decimals_to_str(value):
+            if isinstance(value, float):
+                if value.is_integer():
+                    return f"{int(value)}"
+                if decimals:
+                    return f"{round(value, decimals)}"
+                return f"{int(round(value, decimals))}"
+            return f"{value}"
+
+        return decimals_to_str
+    return lambda value: to_str_function(value, **kwargs)
+
+
+class FormatterPipeline(dict):
+    # a dict of formatter options which also has parse() and to_str()
+    # functions built from the options with only the steps they need
+    # parse() is format_data() and to_str() is data_to_str()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compile()
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.compile()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.compile()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.compile()
+
+    def compile(self):
+        self.parse = self.compile_parse()
+        self.to_str = self.compile_to_str()
+
+    def compile_parse(self):
+        kwargs = dict(self)
+        datatypes = kwargs.pop("datatypes", int)
+        nullable = kwargs.pop("nullable", True)
+        pre_format_function = kwargs.pop("pre_format_function", None)
+        format_function = kwargs.pop("format_function", to_int)
+        post_format_function = kwargs.pop("post_format_function", None)
+        same_type = format_function_types.get(format_function, ())
+        convert = get_format_function(format_function, kwargs)
+        if nullable:
+
+            def parse(value):
+                if isinstance(value, same_type):
+                    return value
+                if isinstance(value, str):
+                    if value.lower().replace(" ", "") in nonelike:
+                        return None
+                elif value in nonelike:
+                    return None
+                try:
+                    return convert(value)
+                except Exception:
+                    return value
+
+        else:
+
+            def parse(value):
+                if isinstance(value, same_type):
+                    return value
+                try:
+                    return convert(value)
+                except Exception:
+                    return value
+
+        if pre_format_function:
+            parse_value = parse
+
+            def parse(value):
+                return parse_value(pre_format_function(value))
+
+        if post_format_function:
+            parse_pre_post = parse
+
+            def parse(value):
+                value = parse_pre_post(value)
+                if isinstance(value, datatypes):
+                    return post_format_function(value)
+                return value
+
+        return parse
+
+    def compile_to_str(self):
+        kwargs = dict(self)
+        datatypes = kwargs.pop("datatypes", int)
+        nullable = kwargs.pop("nullable", True)
+        invalid_value = kwargs.pop("invalid_value", "NaN")
+        convert = get_to_str_function(kwargs.pop("to_str_function", to_str), kwargs)
+
+        def value_to_str(value):
+            if not isinstance(value, datatypes):
+                return invalid_value
+            if value is None and nullable:
+                return ""
+            return convert(value)
+
+        return value_to_str
+
+    def parse_many(self, values):
+        parse = self.parse
+        return [parse(value) for value in values]
+
+    def to_str_many(self, values):
+        to_str = self.to_str
+        return [to_str(value) for value in values]
+
+
 def formatter(
     datatypes,
     format_function,
@@ -169,20 +356,22 @@ def formatter(
     post_format_function=None,
     clipboard_function=None,
     **kwargs,
-) -> dict:
-    return {
-        **dict(
-            datatypes=datatypes,
-            format_function=format_function,
-            to_str_function=to_str_function,
-            invalid_value=invalid_value,
-            nullable=nullable,
-            pre_format_function=pre_format_function,
-            post_format_function=post_format_function,
-            clipboard_function=clipboard_function,
-        ),
-        **kwargs,
-    }
+) -> FormatterPipeline:
+    return FormatterPipeline(
+        {
+            **dict(
+                datatypes=datatypes,
+                format_function=format_function,
+                to_str_function=to_str_function,
+                invalid_value=invalid_value,
+                nullable=nullable,
+                pre_format_function=pre_format_function,
+                post_format_function=post_format_function,
+                clipboard_function=clipboard_function,
+            ),
+            **kwargs,
+        }
+    )
 
 
 def format_data(
@@ -208,6 +397,54 @@ def format_data(
     return value
 
 
+def format_data_many(
+    values,
+    datatypes=int,
+    nullable=True,
+    pre_format_function=None,
+    format_function=to_int,
+    post_format_function=None,
+    **kwargs,
+) -> list:
+    # same as format_data() for every value but the options are only
+    # looked up once and common types are checked without function calls
+    if pre_format_function:
+        values = [pre_format_function(value) for value in values]
+    same_type = format_function_types.get(format_function)
+    parse_float = format_function is to_float
+    formatted = []
+    for value in values:
+        if type(value) is str:
+            if nullable and value.lower().replace(" ", "") in nonelike:
+                value = None
+            elif parse_float and not value.endswith("%"):
+                try:
+                    value = float(value)
+                except Exception:
+                    pass
+            else:
+                try:
+                    value = format_function(value, **kwargs)
+                except Exception:
+                    pass
+        elif same_type is not None and isinstance(value, same_type):
+            pass
+        elif nullable and is_none_like(value):
+            value = None
+        else:
+            try:
+                value = format_function(value, **kwargs)
+            except Exception:
+                pass
+        formatted.append(value)
+    if post_format_function:
+        formatted = [
+            post_format_function(value) if isinstance(value, datatypes) else value
+            for value in formatted
+        ]
+    return formatted
+
+
 def data_to_str(
     value="",
     datatypes=int,
@@ -328,3 +565,128 @@ class Formatter:
                 pass
         # if comparing to anything else, compare the values
         return self.value == __value
+
+
+class FormatterSpec:
+    # the options of a FormattedValue, shared by every cell formatted
+    # with the same options and not changed after it is created
+    __slots__ = (
+        "options",
+        "valid_datatypes",
+        "nullable",
+        "invalid_value",
+        "pre_format_function",
+        "format_function",
+        "post_format_function",
+        "to_str_function",
+        "clipboard_function",
+        "kwargs",
+    )
+
+    def __init__(self, options):
+        options = dict(options)
+        options.pop("spec", None)
+        kwargs = dict(options)
+        datatypes = kwargs.pop("datatypes", int)
+        nullable = kwargs.pop("nullable", True)
+        if nullable:
+            if isinstance(datatypes, (list, tuple)):
+                datatypes = tuple({type_ for type_ in datatypes} | {type(None)})
+            else:
+                datatypes = (datatypes, type(None))
+        elif isinstance(datatypes, (list, tuple)) and type(None) in datatypes:
+            raise TypeError("Non-nullable cells cannot have NoneType as a datatype.")
+        elif datatypes is type(None):
+            raise TypeError("Non-nullable cells cannot have NoneType as a datatype.")
+        set_ = super().__setattr__
+        set_("options", options)
+        set_("valid_datatypes", datatypes)
+        set_("nullable", nullable)
+        set_("invalid_value", kwargs.pop("invalid_value", "NaN"))
+        set_("pre_format_function", kwargs.pop("pre_format_function", None))
+        format_function = kwargs.pop("format_function", to_int)
+        set_("post_format_function", kwargs.pop("post_format_function", None))
+        to_str_function = kwargs.pop("to_str_function", to_str)
+        set_("clipboard_function", kwargs.pop("clipboard_function", None))
+        set_("format_function", get_format_function(format_function, kwargs))
+        set_("to_str_function", get_to_str_function(to_str_function, kwargs))
+        set_("kwargs", kwargs)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} cannot be changed.")
+
+    def __reduce__(self):
+        return (self.__class__, (self.options,))
+
+    def valid(self, value) -> bool:
+        return isinstance(value, self.valid_datatypes)
+
+
+class FormattedValue:
+    # a lighter alternative to Formatter for formatter_class, each cell
+    # only holds its value and a FormatterSpec shared with other cells
+    __slots__ = ("value", "spec")
+
+    def __init__(self, value, spec=None, **kwargs):
+        if spec is None:
+            spec = FormatterSpec(kwargs)
+        self.spec = spec
+        try:
+            self.value = self.format_data(value)
+        except Exception:
+            self.value = f"{value}"
+
+    def __str__(self):
+        spec = self.spec
+        if not spec.valid(self.value):
+            return spec.invalid_value
+        if self.value is None and spec.nullable:
+            return ""
+        return spec.to_str_function(self.value)
+
+    def valid(self, value=None) -> bool:
+        if value is None:
+            value = self.value
+        return self.spec.valid(value)
+
+    def format_data(self, value):
+        spec = self.spec
+        if spec.pre_format_function:
+            value = spec.pre_format_function(value)
+        value = (
+            None
+            if (spec.nullable and is_none_like(value))
+            else spec.format_function(value)
+        )
+        if spec.post_format_function and self.valid(value):
+            value = spec.post_format_function(value)
+        return value
+
+    def get_data_with_valid_check(self):
+        if self.valid():
+            return self.value
+        return self.spec.invalid_value
+
+    def get_clipboard_data(self):
+        if self.spec.clipboard_function is not None:
+            return self.spec.clipboard_function(self.value, **self.spec.kwargs)
+        if isinstance(self.value, (int, float, bool)):
+            return self.value
+        return self.__str__()
+
+    def __eq__(self, __value: object) -> bool:
+        # in case of custom formatter class
+        # compare the values
+        try:
+            if hasattr(__value, "value"):
+                return self.value == __value.value
+        except Exception:
+            pass
+        # if comparing to a string, format the string and compare
+        if isinstance(__value, str):
+            try:
+                return self.value == self.format_data(__value)
+            except Exception:
+                pass
+        # if comparing to anything else, compare the values
+        return self.value == __value
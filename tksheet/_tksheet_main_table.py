@@ -8,14 +8,53 @@ from collections import defaultdict, deque
 from itertools import accumulate, chain, cycle, islice, product, repeat
 from math import ceil, floor
 from tkinter import TclError
-from typing import Any, Union
 
-from ._tksheet_formatters import *
-from ._tksheet_other_classes import *
-from ._tksheet_vars import *
-
-
-class MainTable(tk.Canvas):
+from ._tksheet_formatters import is_bool_like
+from ._tksheet_model import SheetModel
+from ._tksheet_options import TopSizes
+from ._tksheet_other_classes import (
+    BoxSet,
+    CtrlKeyEvent,
+    CurrentlySelectedClass,
+    DeleteRowColumnEvent,
+    DeselectionEvent,
+    DrawnItem,
+    DropDownModifiedEvent,
+    EditCellEvent,
+    IdleTask,
+    InsertEvent,
+    MovedRanges,
+    PasteEvent,
+    RangeSet,
+    ResizeEvent,
+    SelectCellEvent,
+    SelectionBoxEvent,
+    TextCfg,
+    TextEditor,
+    TextMeasure,
+    UndoEvent,
+    diff_sheet_rows,
+    get_checkbox_dict,
+    get_dropdown_dict,
+    insert_items,
+    is_iterable,
+    merge_sheet_modified_events,
+    sheet_modified_event_data,
+    sniff_clipboard_dialect,
+)
+from ._tksheet_vars import (
+    USER_OS,
+    Color_Map_,
+    arrowkey_bindings_helper,
+    ctrl_key,
+    rc_binding,
+    symbols_set,
+)
+
+__all__ = ["MainTable"]
+
+
+class MainTable(SheetModel, tk.Canvas):
     def __init__(self, *args, **kwargs):
         tk.Canvas.__init__(
             self,
@@ -23,6 +62,14 @@ class MainTable(tk.Canvas):
             background=kwargs["table_bg"],
             highlightthickness=0,
         )
+        SheetModel.__init__(
+            self,
+            max_undos=kwargs["max_undos"],
+            max_undo_bytes=kwargs["max_undo_bytes"],
+            undo_compression_level=kwargs["undo_compression_level"],
+            auto_width_sample_rows=kwargs["auto_width_sample_rows"],
+            schedule=self.after_idle,
+        )
         self.parentframe = kwargs["parentframe"]
         self.b1_pressed_loc = None
         self.existing_dropdown_canvas_id = None
@@ -53,10 +100,7 @@ class MainTable(tk.Canvas):
         self.hidd_dropdown = {}
         self.hidd_checkbox = {}
 
-        self.cell_options = {}
-        self.col_options = {}
-        self.row_options = {}
-        self.options = {}
+        self.col_width_queue = deque()
 
         """
         cell options dict looks like:
@@ -85,12 +129,18 @@ class MainTable(tk.Canvas):
         self.extra_header_rc_menu_funcs = {}
         self.extra_empty_space_rc_menu_funcs = {}
 
-        self.max_undos = kwargs["max_undos"]
-        self.undo_storage = deque(maxlen=kwargs["max_undos"])
-
         self.to_clipboard_delimiter = kwargs["to_clipboard_delimiter"]
         self.to_clipboard_quotechar = kwargs["to_clipboard_quotechar"]
         self.to_clipboard_lineterminator = kwargs["to_clipboard_lineterminator"]
+        self.copy_chunk_rows = kwargs["copy_chunk_rows"]
+        self.copy_job = None
+        self.paste_chunk_cells = kwargs["paste_chunk_cells"]
+        self.paste_job = None
+        self.batch_events = []
+        self.batch_redraw = False
+        self.batch_boxes = False
+        self.tasks = {}
+        self.task_budget_ms = kwargs["task_budget_ms"]
         self.from_clipboard_delimiters = (
             kwargs["from_clipboard_delimiters"]
             if isinstance(kwargs["from_clipboard_delimiters"], str)
@@ -175,7 +225,6 @@ class MainTable(tk.Canvas):
         self.show_dropdown_borders = kwargs["show_dropdown_borders"]
         self.drag_selection_enabled = False
         self.select_all_enabled = False
-        self.undo_enabled = False
         self.cut_enabled = False
         self.copy_enabled = False
         self.paste_enabled = False
@@ -200,9 +249,9 @@ class MainTable(tk.Canvas):
         self.RI = kwargs["row_index_canvas"]
         self.RI.MT = self
         self.RI.CH = kwargs["column_headers_canvas"]
+        self.RI.cell_options = self.index_options
+        self.CH.cell_options = self.header_options
         self.TL = None  # is set from within TopLeftRectangle() __init__
-        self.all_columns_displayed = True
-        self.all_rows_displayed = True
         self.align = kwargs["align"]
         self.table_font = kwargs["font"]
         self.font_fam = kwargs["font"][0]
@@ -216,10 +265,7 @@ class MainTable(tk.Canvas):
         self.header_font_fam = kwargs["header_font"][0]
         self.header_font_sze = kwargs["header_font"][1]
         self.header_font_wgt = kwargs["header_font"][2]
-        self.txt_measure_canvas = tk.Canvas(self)
-        self.txt_measure_canvas_text = self.txt_measure_canvas.create_text(
-            0, 0, text="", font=self.table_font
-        )
+        self.text_measure = TextMeasure.get(self)
         self.text_editor = None
         self.text_editor_id = None
 
@@ -491,234 +537,169 @@ class MainTable(tk.Canvas):
                 ] = "rows"
             return boxes
 
+    def get_clipboard_writer(self, s):
+        return csv.writer(
+            s,
+            dialect=csv.excel_tab,
+            delimiter=self.to_clipboard_delimiter,
+            quotechar=self.to_clipboard_quotechar,
+            lineterminator=self.to_clipboard_lineterminator,
+        )
+
     def ctrl_c(self, event=None):
         currently_selected = self.currently_selected()
         if currently_selected:
-            s = io.StringIO()
-            writer = csv.writer(
-                s,
-                dialect=csv.excel_tab,
-                delimiter=self.to_clipboard_delimiter,
-                quotechar=self.to_clipboard_quotechar,
-                lineterminator=self.to_clipboard_lineterminator,
-            )
-            rows = []
             if currently_selected.type_ in ("cell", "column"):
                 boxes, maxrows = self.get_ctrl_x_c_boxes()
-                if self.extra_begin_ctrl_c_func is not None:
-                    try:
-                        self.extra_begin_ctrl_c_func(
-                            CtrlKeyEvent(
-                                "begin_ctrl_c", boxes, currently_selected, tuple()
-                            )
-                        )
-                    except Exception:
-                        return
-                for rn in range(maxrows):
-                    row = []
-                    for r1, c1, r2, c2 in boxes:
-                        if r2 - r1 < maxrows:
-                            continue
-                        datarn = (
-                            (r1 + rn)
-                            if self.all_rows_displayed
-                            else self.displayed_rows[r1 + rn]
-                        )
-                        for c in range(c1, c2):
-                            datacn = (
-                                c
-                                if self.all_columns_displayed
-                                else self.displayed_columns[c]
-                            )
-                            row.append(self.get_cell_clipboard(datarn, datacn))
-                    writer.writerow(row)
-                    rows.append(row)
+                numrows = maxrows
             else:
                 boxes = self.get_ctrl_x_c_boxes()
-                if self.extra_begin_ctrl_c_func is not None:
-                    try:
-                        self.extra_begin_ctrl_c_func(
-                            CtrlKeyEvent(
-                                "begin_ctrl_c", boxes, currently_selected, tuple()
-                            )
-                        )
-                    except Exception:
-                        return
-                for r1, c1, r2, c2 in boxes:
-                    for rn in range(r2 - r1):
-                        row = []
-                        datarn = (
-                            (r1 + rn)
-                            if self.all_rows_displayed
-                            else self.displayed_rows[r1 + rn]
-                        )
-                        for c in range(c1, c2):
-                            datacn = (
-                                c
-                                if self.all_columns_displayed
-                                else self.displayed_columns[c]
-                            )
-                            row.append(self.get_cell_clipboard(datarn, datacn))
-                        writer.writerow(row)
-                        rows.append(row)
-            for r1, c1, r2, c2 in boxes:
-                self.show_ctrl_outline(
-                    canvas="table", start_cell=(c1, r1), end_cell=(c2, r2)
-                )
-            self.clipboard_clear()
-            self.clipboard_append(s.getvalue())
-            self.update_idletasks()
-            if self.extra_end_ctrl_c_func is not None:
-                self.extra_end_ctrl_c_func(
-                    CtrlKeyEvent("end_ctrl_c", boxes, currently_selected, rows)
+                maxrows = None
+                numrows = sum(r2 - r1 for r1, c1, r2, c2 in boxes)
+            if self.extra_begin_ctrl_c_func is not None:
+                try:
+                    self.extra_begin_ctrl_c_func(
+                        CtrlKeyEvent("begin_ctrl_c", boxes, currently_selected, tuple())
+                    )
+                except Exception:
+                    return
+            self.cancel_copy()
+            s = io.StringIO()
+            self.copy_job = {
+                "rows": self.yield_copy_rows(boxes, maxrows),
+                "numrows": numrows,
+                "copied": 0,
+                "s": s,
+                "writer": self.get_clipboard_writer(s),
+                "kept_rows": None if self.extra_end_ctrl_c_func is None else [],
+                "boxes": boxes,
+                "currently_selected": currently_selected,
+                "after_id": None,
+            }
+            if numrows > self.copy_chunk_rows:
+                self.config(cursor="watch")
+            self.copy_chunk()
+
+    def copy_chunk(self):
+        # large copies are written copy_chunk_rows rows at a time
+        # using after() so that the table stays responsive
+        job = self.copy_job
+        job["after_id"] = None
+        writer = job["writer"]
+        kept_rows = job["kept_rows"]
+        for row in islice(job["rows"], self.copy_chunk_rows):
+            writer.writerow(row)
+            if kept_rows is not None:
+                kept_rows.append(row)
+            job["copied"] += 1
+        if job["copied"] < job["numrows"]:
+            self.parentframe.emit_event(
+                "<<SheetCopyProgress>>",
+                {"copied_rows": job["copied"], "total_rows": job["numrows"]},
+            )
+            job["after_id"] = self.after(1, self.copy_chunk)
+            return
+        self.copy_job = None
+        self.config(cursor="")
+        for r1, c1, r2, c2 in job["boxes"]:
+            self.show_ctrl_outline(
+                canvas="table", start_cell=(c1, r1), end_cell=(c2, r2)
+            )
+        self.clipboard_clear()
+        self.clipboard_append(job["s"].getvalue())
+        self.update_idletasks()
+        if self.extra_end_ctrl_c_func is not None:
+            self.extra_end_ctrl_c_func(
+                CtrlKeyEvent(
+                    "end_ctrl_c", job["boxes"], job["currently_selected"], kept_rows
                 )
+            )
+
+    def cancel_copy(self):
+        # stops a copy which is still in progress, the clipboard is unchanged
+        if self.copy_job is not None:
+            if self.copy_job["after_id"] is not None:
+                self.after_cancel(self.copy_job["after_id"])
+            self.copy_job = None
+            self.config(cursor="")
+            return True
+        return False
 
     def ctrl_x(self, event=None):
+        self.finish_paste()
+        self.finish_tasks()
         if not self.anything_selected():
             return
         undo_storage = {}
         s = io.StringIO()
-        writer = csv.writer(
-            s,
-            dialect=csv.excel_tab,
-            delimiter=self.to_clipboard_delimiter,
-            quotechar=self.to_clipboard_quotechar,
-            lineterminator=self.to_clipboard_lineterminator,
-        )
+        writer = self.get_clipboard_writer(s)
         currently_selected = self.currently_selected()
-        rows = []
         changes = 0
         if currently_selected.type_ in ("cell", "column"):
             boxes, maxrows = self.get_ctrl_x_c_boxes()
-            if self.extra_begin_ctrl_x_func is not None:
-                try:
-                    self.extra_begin_ctrl_x_func(
-                        CtrlKeyEvent("begin_ctrl_x", boxes, currently_selected, tuple())
-                    )
-                except Exception:
-                    return
-            for rn in range(maxrows):
-                row = []
-                for r1, c1, r2, c2 in boxes:
-                    if r2 - r1 < maxrows:
-                        continue
-                    datarn = (
-                        (r1 + rn)
-                        if self.all_rows_displayed
-                        else self.displayed_rows[r1 + rn]
-                    )
-                    for c in range(c1, c2):
-                        datacn = (
-                            c
-                            if self.all_columns_displayed
-                            else self.displayed_columns[c]
-                        )
-                        row.append(self.get_cell_clipboard(datarn, datacn))
-                writer.writerow(row)
-                rows.append(row)
-            for rn in range(maxrows):
-                for r1, c1, r2, c2 in boxes:
-                    if r2 - r1 < maxrows:
-                        continue
-                    datarn = (
-                        (r1 + rn)
-                        if self.all_rows_displayed
-                        else self.displayed_rows[r1 + rn]
-                    )
-                    for c in range(c1, c2):
-                        datacn = (
-                            c
-                            if self.all_columns_displayed
-                            else self.displayed_columns[c]
-                        )
-                        if self.input_valid_for_cell(datarn, datacn, ""):
-                            if self.undo_enabled:
-                                undo_storage[(datarn, datacn)] = self.get_cell_data(
-                                    datarn, datacn
-                                )
-                            self.set_cell_data(datarn, datacn, "")
-                            changes += 1
+            get_value = self.get_cell_clipboard
         else:
             boxes = self.get_ctrl_x_c_boxes()
-            if self.extra_begin_ctrl_x_func is not None:
-                try:
-                    self.extra_begin_ctrl_x_func(
-                        CtrlKeyEvent("begin_ctrl_x", boxes, currently_selected, tuple())
-                    )
-                except Exception:
-                    return
-            for r1, c1, r2, c2 in boxes:
-                for rn in range(r2 - r1):
-                    row = []
-                    datarn = (
-                        (r1 + rn)
-                        if self.all_rows_displayed
-                        else self.displayed_rows[r1 + rn]
-                    )
-                    for c in range(c1, c2):
-                        datacn = (
-                            c
-                            if self.all_columns_displayed
-                            else self.displayed_columns[c]
-                        )
-                        row.append(self.get_cell_data(datarn, datacn))
-                    writer.writerow(row)
-                    rows.append(row)
-            for r1, c1, r2, c2 in boxes:
-                for rn in range(r2 - r1):
-                    datarn = (
-                        (r1 + rn)
-                        if self.all_rows_displayed
-                        else self.displayed_rows[r1 + rn]
+            maxrows = None
+            get_value = self.get_cell_data
+        if self.extra_begin_ctrl_x_func is not None:
+            try:
+                self.extra_begin_ctrl_x_func(
+                    CtrlKeyEvent("begin_ctrl_x", boxes, currently_selected, tuple())
+                )
+            except Exception:
+                return
+        self.cancel_copy()
+        if self.extra_end_ctrl_x_func is None:
+            writer.writerows(self.yield_copy_rows(boxes, maxrows, get_value))
+        else:
+            copied_rows = list(self.yield_copy_rows(boxes, maxrows, get_value))
+            writer.writerows(copied_rows)
+        for r1, c1, r2, c2 in (
+            boxes
+            if maxrows is None
+            else [box for box in boxes if box[2] - box[0] >= maxrows]
+        ):
+            for r in range(r1, r1 + maxrows if maxrows is not None else r2):
+                datarn = r if self.all_rows_displayed else self.displayed_rows[r]
+                for c in range(c1, c2):
+                    datacn = (
+                        c if self.all_columns_displayed else self.displayed_columns[c]
                     )
-                    for c in range(c1, c2):
-                        datacn = (
-                            c
-                            if self.all_columns_displayed
-                            else self.displayed_columns[c]
-                        )
-                        if self.input_valid_for_cell(datarn, datacn, ""):
-                            if self.undo_enabled:
-                                undo_storage[(datarn, datacn)] = self.get_cell_data(
-                                    datarn, datacn
-                                )
-                            self.set_cell_data(datarn, datacn, "")
-                            changes += 1
+                    if self.input_valid_for_cell(datarn, datacn, ""):
+                        if self.undo_enabled:
+                            undo_storage[(datarn, datacn)] = self.get_cell_data(
+                                datarn, datacn
+                            )
+                        self.set_cell_data(datarn, datacn, "")
+                        changes += 1
         if changes and self.undo_enabled:
             self.undo_storage.append(
-                zlib.compress(
-                    pickle.dumps(
-                        ("edit_cells", undo_storage, boxes, currently_selected)
-                    )
-                )
+                ("edit_cells", undo_storage, boxes, currently_selected)
             )
         self.clipboard_clear()
         self.clipboard_append(s.getvalue())
         self.update_idletasks()
         self.refresh()
         event_data = sheet_modified_event_data(action="edit_cells")
-        event_data['modified']['cells'] = []
-        event_data['modified']['rows'] = []
-        event_data['modified']['cols'] = []
+        cell_boxes, row_ranges, col_ranges = [], [], []
         for (r1, c1, r2, c2), type_ in boxes.items():
             self.show_ctrl_outline(
                 canvas="table", start_cell=(c1, r1), end_cell=(c2, r2)
             )
             if type_ == "cells":
-                rows = list(range(r1, r2))
-                columns = list(range(c1, c2))
-                cells = [(r, c) for r in rows for c in columns]
-                event_data['modified']['cells'] += cells
+                cell_boxes.append((r1, c1, r2, c2))
             if type_ == "row":
-                rows = list(range(r1, r2))
-                event_data['modified']['rows'] += rows
+                row_ranges.append((r1, r2))
             if type_ == "column":
-                columns = list(range(c1, c2))
-                event_data['modified']['cols'] += columns
-            
+                col_ranges.append((c1, c2))
+        event_data["modified"]["cells"] = BoxSet(cell_boxes)
+        event_data["modified"]["rows"] = RangeSet(row_ranges)
+        event_data["modified"]["cols"] = RangeSet(col_ranges)
+
         if self.extra_end_ctrl_x_func is not None:
             self.extra_end_ctrl_x_func(
-                CtrlKeyEvent("end_ctrl_x", boxes, currently_selected, rows)
+                CtrlKeyEvent("end_ctrl_x", boxes, currently_selected, copied_rows)
             )
         self.parentframe.emit_event("<<SheetModified>>", data=event_data)
 
@@ -752,6 +733,8 @@ class MainTable(tk.Canvas):
         )
 
     def ctrl_v(self, event=None):
+        self.finish_paste()
+        self.finish_tasks()
         if not self.expand_sheet_if_paste_too_big and (
             len(self.col_positions) == 1 or len(self.row_positions) == 1
         ):
@@ -776,22 +759,21 @@ class MainTable(tk.Canvas):
             data = self.clipboard_get()
         except Exception:
             return
-        try:
-            dialect = csv.Sniffer().sniff(
-                data, delimiters=self.from_clipboard_delimiters
-            )
-        except Exception:
-            dialect = csv.excel_tab
         data = list(
-            csv.reader(io.StringIO(data), dialect=dialect, skipinitialspace=True)
+            csv.reader(
+                io.StringIO(data),
+                dialect=sniff_clipboard_dialect(data, self.from_clipboard_delimiters),
+                skipinitialspace=True,
+            )
         )
         if not data:
             return
-        numcols = len(max(data, key=len))
-        numrows = len(data)
-        for rn, r in enumerate(data):
-            if len(r) < numcols:
-                data[rn].extend(list(repeat("", numcols - len(r))))
+        # rows are not padded or repeated, values are read using
+        # modulo of the pasted rows/columns when filling a larger box
+        src_numcols = numcols = len(max(data, key=len))
+        src_numrows = numrows = len(data)
+        if not src_numcols:
+            return
         (
             lastbox_r1,
             lastbox_c1,
@@ -801,17 +783,9 @@ class MainTable(tk.Canvas):
         lastbox_numrows = lastbox_r2 - lastbox_r1
         lastbox_numcols = lastbox_c2 - lastbox_c1
         if lastbox_numrows > numrows and lastbox_numrows % numrows == 0:
-            nd = []
-            for times in range(int(lastbox_numrows / numrows)):
-                nd.extend([r.copy() for r in data])
-            data.extend(nd)
-            numrows *= int(lastbox_numrows / numrows)
+            numrows = lastbox_numrows
         if lastbox_numcols > numcols and lastbox_numcols % numcols == 0:
-            for rn, r in enumerate(data):
-                for times in range(int(lastbox_numcols / numcols)):
-                    data[rn].extend(r.copy())
-            numcols *= int(lastbox_numcols / numcols)
-        undo_storage = {}
+            numcols = lastbox_numcols
         if self.expand_sheet_if_paste_too_big:
             added_rows = 0
             added_cols = 0
@@ -856,17 +830,22 @@ class MainTable(tk.Canvas):
             numcols = len(self.col_positions) - 1 - selected_c
         if selected_r + numrows > len(self.row_positions) - 1:
             numrows = len(self.row_positions) - 1 - selected_r
+
+        def get_value(ndr, ndc):
+            row = data[ndr % src_numrows]
+            ndc %= src_numcols
+            return row[ndc] if ndc < len(row) else ""
+
         if (
             self.extra_begin_ctrl_v_func is not None
             or self.extra_end_ctrl_v_func is not None
         ):
             rows = [
-                [
-                    data[ndr][ndc]
-                    for ndc, c in enumerate(range(selected_c, selected_c + numcols))
-                ]
-                for ndr, r in enumerate(range(selected_r, selected_r + numrows))
+                [get_value(ndr, ndc) for ndc in range(numcols)]
+                for ndr in range(numrows)
             ]
+        else:
+            rows = None
         if self.extra_begin_ctrl_v_func is not None:
             try:
                 self.extra_begin_ctrl_v_func(
@@ -874,45 +853,185 @@ class MainTable(tk.Canvas):
                 )
             except Exception:
                 return
-        changes = 0
-        for ndr, r in enumerate(range(selected_r, selected_r + numrows)):
-            datarn = r if self.all_rows_displayed else self.displayed_rows[r]
-            for ndc, c in enumerate(range(selected_c, selected_c + numcols)):
-                datacn = c if self.all_columns_displayed else self.displayed_columns[c]
-                if self.input_valid_for_cell(datarn, datacn, data[ndr][ndc]):
-                    if self.undo_enabled:
-                        undo_storage[(datarn, datacn)] = self.get_cell_data(
-                            datarn, datacn
-                        )
-                    self.set_cell_data(datarn, datacn, data[ndr][ndc])
-                    changes += 1
+        datarns = (
+            list(range(selected_r, selected_r + numrows))
+            if self.all_rows_displayed
+            else self.displayed_rows[selected_r : selected_r + numrows]
+        )
+        datacns = (
+            list(range(selected_c, selected_c + numcols))
+            if self.all_columns_displayed
+            else self.displayed_columns[selected_c : selected_c + numcols]
+        )
+        if datarns and datacns and max(datarns) >= len(self.data):
+            self.fix_data_len(max(datarns), max(datacns))
+        self.paste_job = {
+            "currently_selected": currently_selected,
+            "box": (selected_r, selected_c, selected_r + numrows, selected_c + numcols),
+            "added_rows_cols": added_rows_cols,
+            "rows": rows,
+            "undo_storage": {} if self.undo_enabled else None,
+            "changes": 0,
+            "after_id": None,
+        }
+        self.paste_job["paste"] = self.paste_cells(
+            datarns, datacns, get_value, self.paste_job
+        )
+        if numrows * numcols > self.paste_chunk_cells:
+            self.config(cursor="watch")
+            self.paste_job["after_id"] = self.after_idle(self.paste_chunk)
+        else:
+            self.finish_paste()
+
+    def paste_cells(self, datarns, datacns, get_value, job):
+        # generator, pastes column by column resolving the columns options
+        # once, rows and cells with their own options use the per cell path
+        # yields after every paste_chunk_cells cells
+        undo_storage = job["undo_storage"]
+        done = 0
+        for ndc, datacn in enumerate(datacns):
+            self.mark_col_text_widths(datarns, datacn)
+            readonly = self.get_cell_kwargs(
+                None, datacn, key="readonly", cell=False, row=False
+            )
+            fmt = self.get_cell_kwargs(
+                None, datacn, key="format", cell=False, row=False
+            )
+            checkbox = self.get_cell_kwargs(
+                None, datacn, key="checkbox", cell=False, row=False
+            )
+            dropdown = self.get_cell_kwargs(
+                None, datacn, key="dropdown", cell=False, row=False
+            )
+            per_cell = bool(fmt and fmt["formatter"] is not None)
+            check_rows = bool(self.row_options)
+            check_cells = bool(self.cell_options)
+            for ndr, datarn in enumerate(datarns):
+                value = get_value(ndr, ndc)
+                if (
+                    per_cell
+                    or (check_rows and datarn in self.row_options)
+                    or (check_cells and (datarn, datacn) in self.cell_options)
+                ):
+                    if self.input_valid_for_cell(datarn, datacn, value):
+                        if undo_storage is not None:
+                            undo_storage[(datarn, datacn)] = self.get_cell_data(
+                                datarn, datacn
+                            )
+                        self.set_cell_data(datarn, datacn, value)
+                        job["changes"] += 1
+                    continue
+                if readonly:
+                    continue
+                row = self.data[datarn]
+                if datacn >= len(row):
+                    self.fix_row_len(datarn, datacn)
+                old = row[datacn]
+                if fmt:
+                    value = fmt.parse(value)
+                    if old == value:
+                        continue
+                elif (
+                    old == value
+                    or (checkbox and not is_bool_like(value))
+                    or (
+                        dropdown
+                        and dropdown["validate_input"]
+                        and value not in dropdown["values"]
+                    )
+                ):
+                    continue
+                if undo_storage is not None:
+                    undo_storage[(datarn, datacn)] = old
+                row[datacn] = value
+                job["changes"] += 1
+            done += len(datarns)
+            if done >= self.paste_chunk_cells:
+                done = 0
+                yield
+
+    def paste_chunk(self):
+        job = self.paste_job
+        job["after_id"] = None
+        if next(job["paste"], StopIteration) is StopIteration:
+            self.finish_paste()
+        else:
+            job["after_id"] = self.after_idle(self.paste_chunk)
+
+    def run_task(self, name, gen, on_progress=None, on_complete=None):
+        # a task of the same name which is still running is cancelled first
+        self.cancel_task(name)
+
+        def progress(task):
+            self.parentframe.set_refresh_timer()
+            if on_progress is not None:
+                on_progress(task)
+
+        def complete(task):
+            if self.tasks.get(name) is task:
+                del self.tasks[name]
+            self.parentframe.set_refresh_timer()
+            if on_complete is not None:
+                on_complete(task)
+            self.parentframe.emit_event(
+                "<<SheetTaskComplete>>",
+                {"task": name, "cancelled": task.cancelled},
+            )
+
+        task = IdleTask(
+            name,
+            gen,
+            schedule=self.after_idle,
+            unschedule=self.after_cancel,
+            budget_ms=self.task_budget_ms,
+            on_progress=progress,
+            on_complete=complete,
+        )
+        self.tasks[name] = task
+        return task.start()
+
+    def cancel_task(self, name=None):
+        if name is None:
+            for task in tuple(self.tasks.values()):
+                task.cancel()
+        elif name in self.tasks:
+            self.tasks[name].cancel()
+
+    def finish_tasks(self):
+        # completes all tasks which are still in progress, e.g. before rows
+        # or columns are added or removed
+        for task in tuple(self.tasks.values()):
+            task.finish()
+
+    def finish_paste(self):
+        # completes a paste which is still in progress
+        job = self.paste_job
+        if job is None:
+            return
+        if job["after_id"] is not None:
+            self.after_cancel(job["after_id"])
+        for _ in job["paste"]:
+            pass
+        self.paste_job = None
+        self.config(cursor="")
+        currently_selected = job["currently_selected"]
+        selected_r, selected_c, r2, c2 = job["box"]
+        added_rows, added_cols = added_rows_cols = job["added_rows_cols"]
+        rows = job["rows"]
         if self.expand_sheet_if_paste_too_big and self.undo_enabled:
             self.equalize_data_row_lengths()
         self.deselect("all")
-        if changes and self.undo_enabled:
+        if job["changes"] and self.undo_enabled:
             self.undo_storage.append(
-                zlib.compress(
-                    pickle.dumps(
-                        (
-                            "edit_cells_paste",
-                            undo_storage,
-                            {
-                                (
-                                    selected_r,
-                                    selected_c,
-                                    selected_r + numrows,
-                                    selected_c + numcols,
-                                ): "cells"
-                            },  # boxes
-                            currently_selected,
-                            added_rows_cols,
-                        )
-                    )
+                (
+                    "edit_cells_paste",
+                    job["undo_storage"],
+                    {job["box"]: "cells"},  # boxes
+                    currently_selected,
+                    added_rows_cols,
                 )
             )
-        self.create_selected(
-            selected_r, selected_c, selected_r + numrows, selected_c + numcols, "cells"
-        )
+        self.create_selected(selected_r, selected_c, r2, c2, "cells")
         self.set_currently_selected(selected_r, selected_c, type_="cell")
         self.see(
             r=selected_r,
@@ -930,19 +1049,32 @@ class MainTable(tk.Canvas):
             )
         event_data = sheet_modified_event_data(action="edit_cells_paste")
         if added_rows_cols != (0, 0):
-            rows = [r for r in range(len(self.row_positions)-added_rows-1, len(self.row_positions)-1)]
-            event_data['modified']['rows'] = rows
-            event_data['added']['rows'] = rows
-            cols = [c for c in range(len(self.col_positions)-added_cols-1, len(self.col_positions)-1)]
-            event_data['modified']['cols'] = cols
-            event_data['added']['cols'] = cols
-        r1, c1, r2, c2 = selected_r, selected_c, selected_r + numrows, selected_c + numcols
-        rows = [r for r in range(r1, r2)]
-        cols = [c for c in range(c1, c2)]
-        event_data['modified']['cells'] = [(r, c) for r in rows for c in cols]
+            rows = RangeSet(
+                [
+                    (
+                        len(self.row_positions) - added_rows - 1,
+                        len(self.row_positions) - 1,
+                    )
+                ]
+            )
+            event_data["modified"]["rows"] = rows
+            event_data["added"]["rows"] = rows
+            cols = RangeSet(
+                [
+                    (
+                        len(self.col_positions) - added_cols - 1,
+                        len(self.col_positions) - 1,
+                    )
+                ]
+            )
+            event_data["modified"]["cols"] = cols
+            event_data["added"]["cols"] = cols
+        event_data["modified"]["cells"] = BoxSet([job["box"]])
         self.parentframe.emit_event("<<SheetModified>>", data=event_data)
 
     def delete_key(self, event=None):
+        self.finish_paste()
+        self.finish_tasks()
         if not self.anything_selected():
             return
         currently_selected = self.currently_selected()
@@ -984,28 +1116,19 @@ class MainTable(tk.Canvas):
             )
         if changes and self.undo_enabled:
             self.undo_storage.append(
-                zlib.compress(
-                    pickle.dumps(
-                        ("edit_cells", undo_storage, boxes, currently_selected)
-                    )
-                )
+                ("edit_cells", undo_storage, boxes, currently_selected)
             )
         self.refresh()
-        event_data = sheet_modified_event_data(action='edit_cells')
-        event_data['modified']['cells'] = []
-        event_data['modified']['rows'] = []
-        event_data['modified']['cols'] = []
-        for (r1, c1, r2, c2), type_ in boxes.items():
-            if type_ == 'cells':
-                rows = [r for r in range(r1, r2)]
-                cols = [c for c in range(c1, c2)]
-                event_data['modified']['cells'] += [(r, c) for r in rows for c in cols]
-            elif type_ == 'rows':
-                rows = [r for r in range(r1, r2)]
-                event_data['modified']['rows'] += rows
-            elif type_ == 'columns':
-                cols = [c for c in range(c1, c2)]
-                event_data['modified']['cols'] += cols
+        event_data = sheet_modified_event_data(action="edit_cells")
+        event_data["modified"]["cells"] = BoxSet(
+            box for box, type_ in boxes.items() if type_ == "cells"
+        )
+        event_data["modified"]["rows"] = RangeSet(
+            (r1, r2) for (r1, c1, r2, c2), type_ in boxes.items() if type_ == "rows"
+        )
+        event_data["modified"]["cols"] = RangeSet(
+            (c1, c2) for (r1, c1, r2, c2), type_ in boxes.items() if type_ == "columns"
+        )
         self.parentframe.emit_event("<<SheetModified>>", data = event_data)
 
     def move_columns_adjust_options_dict(
@@ -1017,6 +1140,7 @@ class MainTable(tk.Canvas):
         create_selections=True,
         index_type="displayed",
     ):
+        self.finish_tasks()
         c = int(col)
         to_move_max = to_move_min + num_cols
         to_del = to_move_max + num_cols
@@ -1089,30 +1213,7 @@ class MainTable(tk.Canvas):
                     if isinstance(self._headers, list) and self._headers:
                         self._headers[c:c] = self._headers[to_move_min:to_move_max]
                         self._headers[to_move_max:to_del] = []
-                self.CH.cell_options = {
-                    newcolsdct[k]
-                    if k in newcolsdct
-                    else k + num_cols
-                    if k < to_move_min and k >= c
-                    else k: v
-                    for k, v in self.CH.cell_options.items()
-                }
-                self.cell_options = {
-                    (k[0], newcolsdct[k[1]])
-                    if k[1] in newcolsdct
-                    else (k[0], k[1] + num_cols)
-                    if k[1] < to_move_min and k[1] >= c
-                    else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.col_options = {
-                    newcolsdct[k]
-                    if k in newcolsdct
-                    else k + num_cols
-                    if k < to_move_min and k >= c
-                    else k: v
-                    for k, v in self.col_options.items()
-                }
+                self.col_offsets.move(to_move_min, num_cols, c)
                 if index_type != "displayed":
                     self.displayed_columns = sorted(
                         int(newcolsdct[k])
@@ -1135,30 +1236,7 @@ class MainTable(tk.Canvas):
                     if isinstance(self._headers, list) and self._headers:
                         self._headers[c:c] = self._headers[to_move_min:to_move_max]
                         self._headers[to_move_min:to_move_max] = []
-                self.CH.cell_options = {
-                    newcolsdct[k]
-                    if k in newcolsdct
-                    else k - num_cols
-                    if k < c and k > to_move_min
-                    else k: v
-                    for k, v in self.CH.cell_options.items()
-                }
-                self.cell_options = {
-                    (k[0], newcolsdct[k[1]])
-                    if k[1] in newcolsdct
-                    else (k[0], k[1] - num_cols)
-                    if k[1] < c and k[1] > to_move_min
-                    else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.col_options = {
-                    newcolsdct[k]
-                    if k in newcolsdct
-                    else k - num_cols
-                    if k < c and k > to_move_min
-                    else k: v
-                    for k, v in self.col_options.items()
-                }
+                self.col_offsets.move(to_move_min, num_cols, c - num_cols)
                 if index_type != "displayed":
                     self.displayed_columns = sorted(
                         int(newcolsdct[k])
@@ -1238,18 +1316,7 @@ class MainTable(tk.Canvas):
                             idx += 1
                     self._headers = new
                 dispset = {b: a for a, b in dispset.items()}
-                self.CH.cell_options = {
-                    dispset[k] if k in dispset else k: v
-                    for k, v in self.CH.cell_options.items()
-                }
-                self.cell_options = {
-                    (k[0], dispset[k[1]]) if k[1] in dispset else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.col_options = {
-                    dispset[k] if k in dispset else k: v
-                    for k, v in self.col_options.items()
-                }
+                self.remap_col_options(lambda k: dispset[k] if k in dispset else k)
         return new_selected, {b: a for a, b in dispset.items()}
 
     def move_rows_adjust_options_dict(
@@ -1261,6 +1328,7 @@ class MainTable(tk.Canvas):
         create_selections=True,
         index_type="displayed",
     ):
+        self.finish_tasks()
         r = int(row)
         to_move_max = to_move_min + num_rows
         to_del = to_move_max + num_rows
@@ -1334,30 +1402,7 @@ class MainTable(tk.Canvas):
                     if isinstance(self._row_index, list) and self._row_index:
                         self._row_index[r:r] = self._row_index[to_move_min:to_move_max]
                         self._row_index[to_move_max:to_del] = []
-                self.RI.cell_options = {
-                    newrowsdct[k]
-                    if k in newrowsdct
-                    else k + num_rows
-                    if k < to_move_min and k >= r
-                    else k: v
-                    for k, v in self.RI.cell_options.items()
-                }
-                self.cell_options = {
-                    (newrowsdct[k[0]], k[1])
-                    if k[0] in newrowsdct
-                    else (k[0] + num_rows, k[1])
-                    if k[0] < to_move_min and k[0] >= r
-                    else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.row_options = {
-                    newrowsdct[k]
-                    if k in newrowsdct
-                    else k + num_rows
-                    if k < to_move_min and k >= r
-                    else k: v
-                    for k, v in self.row_options.items()
-                }
+                self.row_offsets.move(to_move_min, num_rows, r)
                 if index_type != "displayed":
                     self.displayed_rows = sorted(
                         int(newrowsdct[k])
@@ -1379,30 +1424,7 @@ class MainTable(tk.Canvas):
                     if isinstance(self._row_index, list) and self._row_index:
                         self._row_index[r:r] = self._row_index[to_move_min:to_move_max]
                         self._row_index[to_move_min:to_move_max] = []
-                self.RI.cell_options = {
-                    newrowsdct[k]
-                    if k in newrowsdct
-                    else k - num_rows
-                    if k < r and k > to_move_min
-                    else k: v
-                    for k, v in self.RI.cell_options.items()
-                }
-                self.cell_options = {
-                    (newrowsdct[k[0]], k[1])
-                    if k[0] in newrowsdct
-                    else (k[0] - num_rows, k[1])
-                    if k[0] < r and k[0] > to_move_min
-                    else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.row_options = {
-                    newrowsdct[k]
-                    if k in newrowsdct
-                    else k - num_rows
-                    if k < r and k > to_move_min
-                    else k: v
-                    for k, v in self.row_options.items()
-                }
+                self.row_offsets.move(to_move_min, num_rows, r - num_rows)
                 if index_type != "displayed":
                     self.displayed_rows = sorted(
                         int(newrowsdct[k])
@@ -1476,27 +1498,20 @@ class MainTable(tk.Canvas):
                             idx += 1
                     self._row_index = new
                 dispset = {b: a for a, b in dispset.items()}
-                self.RI.cell_options = {
-                    dispset[k] if k in dispset else k: v
-                    for k, v in self.RI.cell_options.items()
-                }
-                self.cell_options = {
-                    (dispset[k[0]], k[1]) if k[0] in dispset else k: v
-                    for k, v in self.cell_options.items()
-                }
-                self.row_options = {
-                    dispset[k] if k in dispset else k: v
-                    for k, v in self.row_options.items()
-                }
+                self.remap_row_options(lambda k: dispset[k] if k in dispset else k)
         return new_selected, {b: a for a, b in dispset.items()}
 
     def ctrl_z(self, event=None):
+        self.finish_paste()
+        self.finish_tasks()
         if not self.undo_storage:
             return
         if not isinstance(self.undo_storage[-1], (tuple, dict)):
             undo_storage = pickle.loads(zlib.decompress(self.undo_storage[-1]))
         else:
             undo_storage = self.undo_storage[-1]
+        boxes = self.get_boxes()
+        currently_selected = self.currently_selected()
         self.deselect("all")
         event_data = sheet_modified_event_data(action=f"undo_{undo_storage[0]}")
         if self.extra_begin_ctrl_z_func is not None:
@@ -1507,25 +1522,148 @@ class MainTable(tk.Canvas):
             except Exception:
                 return
         self.undo_storage.pop()
+        self.undo_storage.push(
+            self.replay_undo_storage(
+                undo_storage, event_data, boxes, currently_selected
+            ),
+            redo=True,
+        )
+        self.refresh()
+        if self.extra_end_ctrl_z_func is not None:
+            self.extra_end_ctrl_z_func(
+                UndoEvent("end_ctrl_z", undo_storage[0], undo_storage)
+            )
+        self.parentframe.emit_event("<<SheetModified>>", event_data)
+
+    def ctrl_y(self, event=None):
+        self.finish_paste()
+        self.finish_tasks()
+        if not self.undo_storage.redos:
+            return
+        redo_storage = self.undo_storage.pop_redo()
+        if not isinstance(redo_storage, (tuple, dict)):
+            redo_storage = pickle.loads(zlib.decompress(redo_storage))
+        boxes = self.get_boxes()
+        currently_selected = self.currently_selected()
+        self.deselect("all")
+        event_data = sheet_modified_event_data(action=f"redo_{redo_storage[0]}")
+        self.undo_storage.push(
+            self.replay_undo_storage(
+                redo_storage, event_data, boxes, currently_selected
+            )
+        )
+        self.refresh()
+        self.parentframe.emit_event("<<SheetModified>>", event_data)
+
+    def replay_undo_storage(self, undo_storage, event_data, boxes, currently_selected):
+        # reverses a stored change, returns the change that reverses it
+        if undo_storage[0] in ("edit_cells_paste", "edit_cells_expand"):
+            self.invalidate_col_text_widths()
+        if undo_storage[0] == "batch":
+            redo_entries = []
+            events = []
+            for entry in reversed(undo_storage[1]):
+                events.append(sheet_modified_event_data())
+                redo_entries.append(
+                    self.replay_undo_storage(
+                        entry, events[-1], boxes, currently_selected
+                    )
+                )
+            merged = merge_sheet_modified_events(events)
+            for k in ("modified", "deleted", "added", "moved"):
+                event_data[k] = merged[k]
+            return ("batch", redo_entries)
+
         if undo_storage[0] in ("edit_header",):
+            redo_storage = (
+                "edit_header",
+                {c: self._headers[c] for c in undo_storage[1]},
+                boxes,
+                currently_selected,
+            )
             for c, v in undo_storage[1].items():
                 self._headers[c] = v
             self.reselect_from_get_boxes(undo_storage[2])
-            self.set_currently_selected(0, undo_storage[3][1], type_="column")
+            if undo_storage[3]:
+                self.set_currently_selected(0, undo_storage[3][1], type_="column")
             event_data['modified']['cols'] = list(undo_storage[1].keys())
 
         if undo_storage[0] in ("edit_index",):
+            redo_storage = (
+                "edit_index",
+                {r: self._row_index[r] for r in undo_storage[1]},
+                boxes,
+                currently_selected,
+            )
             for r, v in undo_storage[1].items():
                 self._row_index[r] = v
             self.reselect_from_get_boxes(undo_storage[2])
-            self.set_currently_selected(0, undo_storage[3][1], type_="row")
+            if undo_storage[3]:
+                self.set_currently_selected(0, undo_storage[3][1], type_="row")
             event_data['modified']['rows'] = list(undo_storage[1].keys())
 
-        if undo_storage[0] in ("edit_cells", "edit_cells_paste"):
+        if undo_storage[0] in ("edit_cells", "edit_cells_paste", "edit_cells_expand"):
+            if undo_storage[0] == "edit_cells_expand":
+                added_rows, added_cols = undo_storage[4]
+                if added_cols > 0:
+                    if not self.all_columns_displayed:
+                        total_data_cols = self.total_data_cols()
+                        self.displayed_columns.extend(
+                            range(total_data_cols, total_data_cols + added_cols)
+                        )
+                    event_data["added"]["cols"] = list(
+                        range(
+                            len(self.col_positions) - 1,
+                            len(self.col_positions) - 1 + added_cols,
+                        )
+                    )
+                    self.insert_col_positions(widths=int(added_cols))
+                if added_rows > 0:
+                    if not self.all_rows_displayed:
+                        total_data_rows = self.total_data_rows()
+                        self.displayed_rows.extend(
+                            range(total_data_rows, total_data_rows + added_rows)
+                        )
+                    event_data["added"]["rows"] = list(
+                        range(
+                            len(self.row_positions) - 1,
+                            len(self.row_positions) - 1 + added_rows,
+                        )
+                    )
+                    self.insert_row_positions(heights=int(added_rows))
+                redo_storage = (
+                    "edit_cells_paste",
+                    {cell: self.get_cell_data(*cell) for cell in undo_storage[1]},
+                    boxes,
+                    currently_selected,
+                    undo_storage[4],
+                )
+            elif (
+                undo_storage[0] == "edit_cells_paste"
+                and self.expand_sheet_if_paste_too_big
+                and (undo_storage[4][0] > 0 or undo_storage[4][1] > 0)
+            ):
+                redo_storage = (
+                    "edit_cells_expand",
+                    {cell: self.get_cell_data(*cell) for cell in undo_storage[1]},
+                    boxes,
+                    currently_selected,
+                    undo_storage[4],
+                )
+            else:
+                redo_storage = (
+                    undo_storage[0],
+                    {cell: self.get_cell_data(*cell) for cell in undo_storage[1]},
+                    boxes,
+                    currently_selected,
+                    *undo_storage[4:],
+                )
             cells = []
             for (datarn, datacn), v in undo_storage[1].items():
                 self.set_cell_data(datarn, datacn, v)
                 cells.append((datarn, datacn))
+            if undo_storage[0] == "edit_cells_expand":
+                self.equalize_data_row_lengths()
             start_row = float("inf")
             start_col = float("inf")
             if (
@@ -1589,6 +1727,7 @@ class MainTable(tk.Canvas):
                 event_data['deleted']['cols'] = deleted_cols
 
         elif undo_storage[0] == "move_cols":
+            redo_storage = ("move_cols", undo_storage[2], undo_storage[1])
             c = undo_storage[1][0]
             origin = c
             to_move_min = undo_storage[2][0]
@@ -1617,6 +1756,7 @@ class MainTable(tk.Canvas):
             )
 
         elif undo_storage[0] == "move_rows":
+            redo_storage = ("move_rows", undo_storage[2], undo_storage[1])
             r = undo_storage[1][0]
             origin = r
             to_move_min = undo_storage[2][0]
@@ -1645,51 +1785,26 @@ class MainTable(tk.Canvas):
             )
 
         elif undo_storage[0] == "insert_rows":
-            self.displayed_rows = undo_storage[1]["displayed_rows"]
-            self.data[
-                undo_storage[1]["data_row_num"] : undo_storage[1]["data_row_num"]
-                + undo_storage[1]["numrows"]
-            ] = []
-            try:
-                self._row_index[
-                    undo_storage[1]["data_row_num"] : undo_storage[1]["data_row_num"]
-                    + undo_storage[1]["numrows"]
-                ] = []
-            except Exception:
-                pass
-            self.del_row_positions(
-                undo_storage[1]["sheet_row_num"],
-                undo_storage[1]["numrows"],
-                deselect_all=False,
-            )
-            to_del = set(
+            numrows = undo_storage[1]["numrows"]
+            datarn = undo_storage[1]["data_row_num"]
+            sheet_rows = undo_storage[1].get(
+                "sheet_rows",
                 range(
                     undo_storage[1]["sheet_row_num"],
-                    undo_storage[1]["sheet_row_num"] + undo_storage[1]["numrows"],
-                )
+                    undo_storage[1]["sheet_row_num"] + numrows,
+                ),
             )
-            numrows = undo_storage[1]["numrows"]
-            idx = undo_storage[1]["sheet_row_num"] + undo_storage[1]["numrows"]
-            self.cell_options = {
-                (rn if rn < idx else rn - numrows, cn): t2
-                for (rn, cn), t2 in self.cell_options.items()
-                if rn not in to_del
-            }
-            self.row_options = {
-                rn if rn < idx else rn - numrows: t
-                for rn, t in self.row_options.items()
-                if rn not in to_del
-            }
-            self.RI.cell_options = {
-                rn if rn < idx else rn - numrows: t
-                for rn, t in self.RI.cell_options.items()
-                if rn not in to_del
-            }
-            modified_rows = list(range(undo_storage[1]["sheet_row_num"], len(self.row_positions)-1))
-            moved_rows = [(end+len(to_del), end) for end in modified_rows]
-            event_data['deleted']['rows'] = list(to_del)
-            event_data['modified']['rows'] = modified_rows
-            event_data['moved']['rows'] = moved_rows
+            redo_storage = self.delete_rows_displayed(
+                sheet_rows,
+                set(undo_storage[1].get("data_rows", range(datarn, datarn + numrows))),
+                selection_boxes=boxes,
+            )
+            self.displayed_rows = undo_storage[1]["displayed_rows"]
+            num = len(set(sheet_rows))
+            start, stop = undo_storage[1]["sheet_row_num"], len(self.row_positions) - 1
+            event_data["deleted"]["rows"] = RangeSet.from_indexes(sheet_rows)
+            event_data["modified"]["rows"] = RangeSet([(start, stop)])
+            event_data["moved"]["rows"] = MovedRanges([(start + num, stop + num, -num)])
             if len(self.row_positions) > 1:
                 start_row = (
                     undo_storage[1]["sheet_row_num"]
@@ -1708,48 +1823,26 @@ class MainTable(tk.Canvas):
                 )
 
         elif undo_storage[0] == "insert_cols":
-            self.displayed_columns = undo_storage[1]["displayed_columns"]
-            qx = undo_storage[1]["data_col_num"]
-            qnum = undo_storage[1]["numcols"]
-            for rn in range(len(self.data)):
-                self.data[rn][qx : qx + qnum] = []
-            try:
-                self._headers[qx : qx + qnum] = []
-            except Exception:
-                pass
-            self.del_col_positions(
-                undo_storage[1]["sheet_col_num"],
-                undo_storage[1]["numcols"],
-                deselect_all=False,
-            )
-            to_del = set(
+            numcols = undo_storage[1]["numcols"]
+            datacn = undo_storage[1]["data_col_num"]
+            sheet_cols = undo_storage[1].get(
+                "sheet_cols",
                 range(
                     undo_storage[1]["sheet_col_num"],
-                    undo_storage[1]["sheet_col_num"] + undo_storage[1]["numcols"],
-                )
+                    undo_storage[1]["sheet_col_num"] + numcols,
+                ),
             )
-            numcols = undo_storage[1]["numcols"]
-            idx = undo_storage[1]["sheet_col_num"] + undo_storage[1]["numcols"]
-            self.cell_options = {
-                (rn, cn if cn < idx else cn - numcols): t2
-                for (rn, cn), t2 in self.cell_options.items()
-                if cn not in to_del
-            }
-            self.col_options = {
-                cn if cn < idx else cn - numcols: t
-                for cn, t in self.col_options.items()
-                if cn not in to_del
-            }
-            self.CH.cell_options = {
-                cn if cn < idx else cn - numcols: t
-                for cn, t in self.CH.cell_options.items()
-                if cn not in to_del
-            }
-            modified_cols = list(range(undo_storage[1]["sheet_col_num"], len(self.col_positions)-1))
-            moved_cols = [(end+len(to_del), end) for end in modified_cols]
-            event_data['deleted']['cols'] = list(to_del)
-            event_data['modified']['cols'] = modified_cols
-            event_data['moved']['cols'] = moved_cols
+            redo_storage = self.delete_cols_displayed(
+                sheet_cols,
+                set(undo_storage[1].get("data_cols", range(datacn, datacn + numcols))),
+                selection_boxes=boxes,
+            )
+            self.displayed_columns = undo_storage[1]["displayed_columns"]
+            num = len(set(sheet_cols))
+            start, stop = undo_storage[1]["sheet_col_num"], len(self.col_positions) - 1
+            event_data["deleted"]["cols"] = RangeSet.from_indexes(sheet_cols)
+            event_data["modified"]["cols"] = RangeSet([(start, stop)])
+            event_data["moved"]["cols"] = MovedRanges([(start + num, stop + num, -num)])
             if len(self.col_positions) > 1:
                 start_col = (
                     undo_storage[1]["sheet_col_num"]
@@ -1768,22 +1861,57 @@ class MainTable(tk.Canvas):
                 )
 
         elif undo_storage[0] == "delete_rows":
+            saved_displayed_rows = list(self.displayed_rows)
             self.displayed_rows = undo_storage[1]["displayed_rows"]
-            deleted_rows = []
-            for rn, r in reversed(undo_storage[1]["deleted_rows"]):
-                deleted_rows.append(rn)
-                self.data.insert(rn, r)
-            for rn, h in reversed(tuple(undo_storage[1]["rowheights"].items())):
-                self.insert_row_position(idx=rn, height=h)
-            self.cell_options = undo_storage[1]["cell_options"]
-            self.row_options = undo_storage[1]["row_options"]
-            self.RI.cell_options = undo_storage[1]["RI_cell_options"]
-            for rn, r in reversed(undo_storage[1]["deleted_index_values"]):
-                try:
-                    self._row_index.insert(rn, r)
-                except Exception:
-                    continue
+            sheet_rows = sorted(undo_storage[1]["rowheights"])
+            data_rows = (
+                sheet_rows
+                if self.all_rows_displayed
+                else [self.displayed_rows[r] for r in sheet_rows]
+            )
+            deleted_rows = [rn for rn, r in reversed(undo_storage[1]["deleted_rows"])]
+            self.data[:] = insert_items(
+                self.data, reversed(undo_storage[1]["deleted_rows"])
+            )
+            self.row_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        insert_items(
+                            (
+                                int(b - a)
+                                for a, b in zip(
+                                    self.row_positions,
+                                    islice(self.row_positions, 1, None),
+                                )
+                            ),
+                            reversed(tuple(undo_storage[1]["rowheights"].items())),
+                        ),
+                    )
+                )
+            )
+            self.row_offsets.insert_many(data_rows)
+            self.mark_col_text_widths(data_rows)
+            self.cell_options.update(undo_storage[1]["cell_options"])
+            self.highlight_ranges.update(undo_storage[1]["highlights"])
+            self.row_options.update(undo_storage[1]["row_options"])
+            self.RI.cell_options.update(undo_storage[1]["RI_cell_options"])
+            if isinstance(self._row_index, list):
+                self._row_index[:] = insert_items(
+                    self._row_index, reversed(undo_storage[1]["deleted_index_values"])
+                )
             self.reselect_from_get_boxes(undo_storage[1]["selection_boxes"])
+            redo_storage = (
+                "insert_rows",
+                {
+                    "data_row_num": data_rows[0],
+                    "displayed_rows": saved_displayed_rows,
+                    "sheet_row_num": sheet_rows[0],
+                    "numrows": len(sheet_rows),
+                    "data_rows": data_rows,
+                    "sheet_rows": sheet_rows,
+                },
+            )
             modified_rows = list(range(min(deleted_rows), len(self.row_positions)-1))
             added_rows = deleted_rows
             moved_rows = [(end-len(deleted_rows), end) for end in modified_rows if end not in deleted_rows]
@@ -1792,40 +1920,70 @@ class MainTable(tk.Canvas):
             event_data['moved']['rows'] = moved_rows
 
         elif undo_storage[0] == "delete_cols":
+            saved_displayed_columns = list(self.displayed_columns)
             self.displayed_columns = undo_storage[1]["displayed_columns"]
-            self.cell_options = undo_storage[1]["cell_options"]
-            self.col_options = undo_storage[1]["col_options"]
-            self.CH.cell_options = undo_storage[1]["CH_cell_options"]
-            deleted_cols = []
-            for cn, w in reversed(tuple(undo_storage[1]["colwidths"].items())):
-                deleted_cols.append(cn)
-                self.insert_col_position(idx=cn, width=w)
-            for cn, rowdict in reversed(tuple(undo_storage[1]["deleted_cols"].items())):
-                for rn, v in rowdict.items():
-                    try:
-                        self.data[rn].insert(cn, v)
-                    except Exception:
-                        continue
-            for cn, v in reversed(
-                tuple(undo_storage[1]["deleted_header_values"].items())
-            ):
-                try:
-                    self._headers.insert(cn, v)
-                except Exception:
-                    continue
+            sheet_cols = sorted(undo_storage[1]["colwidths"])
+            data_cols = (
+                sheet_cols
+                if self.all_columns_displayed
+                else [self.displayed_columns[c] for c in sheet_cols]
+            )
+            self.col_offsets.insert_many(data_cols)
+            self.cell_options.update(undo_storage[1]["cell_options"])
+            self.highlight_ranges.update(undo_storage[1]["highlights"])
+            self.col_options.update(undo_storage[1]["col_options"])
+            self.CH.cell_options.update(undo_storage[1]["CH_cell_options"])
+            deleted_cols = [cn for cn in reversed(undo_storage[1]["colwidths"])]
+            self.col_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        insert_items(
+                            (
+                                int(b - a)
+                                for a, b in zip(
+                                    self.col_positions,
+                                    islice(self.col_positions, 1, None),
+                                )
+                            ),
+                            reversed(tuple(undo_storage[1]["colwidths"].items())),
+                        ),
+                    )
+                )
+            )
+            deleted_data_cols = tuple(reversed(undo_storage[1]["deleted_cols"].items()))
+            for rn, row in enumerate(self.data):
+                to_insert = [
+                    (cn, rowdict[rn])
+                    for cn, rowdict in deleted_data_cols
+                    if rn in rowdict
+                ]
+                if to_insert:
+                    row[:] = insert_items(row, to_insert)
+            if isinstance(self._headers, list):
+                self._headers[:] = insert_items(
+                    self._headers,
+                    reversed(tuple(undo_storage[1]["deleted_header_values"].items())),
+                )
             self.reselect_from_get_boxes(undo_storage[1]["selection_boxes"])
+            redo_storage = (
+                "insert_cols",
+                {
+                    "data_col_num": data_cols[0],
+                    "displayed_columns": saved_displayed_columns,
+                    "sheet_col_num": sheet_cols[0],
+                    "numcols": len(sheet_cols),
+                    "data_cols": data_cols,
+                    "sheet_cols": sheet_cols,
+                },
+            )
             modified_cols = list(range(min(deleted_cols), len(self.col_positions)-1))
             added_cols = deleted_cols
             moved_cols = [(end-len(deleted_cols), end) for end in modified_cols if end not in deleted_cols]
             event_data['added']['cols'] = added_cols
             event_data['modified']['cols'] = modified_cols
             event_data['moved']['cols'] = moved_cols
-        self.refresh()
-        if self.extra_end_ctrl_z_func is not None:
-            self.extra_end_ctrl_z_func(
-                UndoEvent("end_ctrl_z", undo_storage[0], undo_storage)
-            )
-        self.parentframe.emit_event("<<SheetModified>>", event_data)
+        return redo_storage
 
     def bind_arrowkeys(self, keys: dict = {}):
         for canvas in (self, self.parentframe, self.CH, self.RI, self.TL):
@@ -2026,113 +2184,6 @@ class MainTable(tk.Canvas):
             else:
                 self.select_cell(row, column, redraw=redraw)
 
-    def align_rows(
-        self, rows=[], align="global", align_index=False
-    ):  # "center", "w", "e" or "global"
-        if isinstance(rows, str) and rows.lower() == "all" and align == "global":
-            for r in self.row_options:
-                if "align" in self.row_options[r]:
-                    del self.row_options[r]["align"]
-            if align_index:
-                for r in self.RI.cell_options:
-                    if r in self.RI.cell_options and "align" in self.RI.cell_options[r]:
-                        del self.RI.cell_options[r]["align"]
-            return
-        if isinstance(rows, int):
-            rows_ = [rows]
-        elif isinstance(rows, str) and rows.lower() == "all":
-            rows_ = (r for r in range(self.total_data_rows()))
-        else:
-            rows_ = rows
-        if align == "global":
-            for r in rows_:
-                if r in self.row_options and "align" in self.row_options[r]:
-                    del self.row_options[r]["align"]
-                if (
-                    align_index
-                    and r in self.RI.cell_options
-                    and "align" in self.RI.cell_options[r]
-                ):
-                    del self.RI.cell_options[r]["align"]
-        else:
-            for r in rows_:
-                if r not in self.row_options:
-                    self.row_options[r] = {}
-                self.row_options[r]["align"] = align
-                if align_index:
-                    if r not in self.RI.cell_options:
-                        self.RI.cell_options[r] = {}
-                    self.RI.cell_options[r]["align"] = align
-
-    def align_columns(
-        self, columns=[], align="global", align_header=False
-    ):  # "center", "w", "e" or "global"
-        if isinstance(columns, str) and columns.lower() == "all" and align == "global":
-            for c in self.col_options:
-                if "align" in self.col_options[c]:
-                    del self.col_options[c]["align"]
-            if align_header:
-                for c in self.CH.cell_options:
-                    if c in self.CH.cell_options and "align" in self.CH.cell_options[c]:
-                        del self.CH.cell_options[c]["align"]
-            return
-        if isinstance(columns, int):
-            cols_ = [columns]
-        elif isinstance(columns, str) and columns.lower() == "all":
-            cols_ = (c for c in range(self.total_data_cols()))
-        else:
-            cols_ = columns
-        if align == "global":
-            for c in cols_:
-                if c in self.col_options and "align" in self.col_options[c]:
-                    del self.col_options[c]["align"]
-                if (
-                    align_header
-                    and c in self.CH.cell_options
-                    and "align" in self.CH.cell_options[c]
-                ):
-                    del self.CH.cell_options[c]["align"]
-        else:
-            for c in cols_:
-                if c not in self.col_options:
-                    self.col_options[c] = {}
-                self.col_options[c]["align"] = align
-                if align_header:
-                    if c not in self.CH.cell_options:
-                        self.CH.cell_options[c] = {}
-                    self.CH.cell_options[c]["align"] = align
-
-    def align_cells(
-        self, row=0, column=0, cells=[], align="global"
-    ):  # "center", "w", "e" or "global"
-        if isinstance(row, str) and row.lower() == "all" and align == "global":
-            for r, c in self.cell_options:
-                if "align" in self.cell_options[(r, c)]:
-                    del self.cell_options[(r, c)]["align"]
-            return
-        if align == "global":
-            if cells:
-                for r, c in cells:
-                    if (r, c) in self.cell_options and "align" in self.cell_options[
-                        (r, c)
-                    ]:
-                        del self.cell_options[(r, c)]["align"]
-            else:
-                if (row, column) in self.cell_options and "align" in self.cell_options[
-                    (row, column)
-                ]:
-                    del self.cell_options[(row, column)]["align"]
-        else:
-            if cells:
-                for r, c in cells:
-                    if (r, c) not in self.cell_options:
-                        self.cell_options[(r, c)] = {}
-                    self.cell_options[(r, c)]["align"] = align
-            else:
-                if (row, column) not in self.cell_options:
-                    self.cell_options[(row, column)] = {}
-                self.cell_options[(row, column)]["align"] = align
-
     def deselect(self, r=None, c=None, cell=None, redraw=True):
         deselected = tuple()
         deleted_boxes = {}
@@ -2582,10 +2633,13 @@ class MainTable(tk.Canvas):
                 for s2 in ("z", "Z"):
                     for widget in (self, self.RI, self.CH, self.TL):
                         widget.bind(f"<{ctrl_key}-{s2}>", self.ctrl_z)
+                for s2 in ("y", "Y"):
+                    for widget in (self, self.RI, self.CH, self.TL):
+                        widget.bind(f"<{ctrl_key}-{s2}>", self.ctrl_y)
                 self.undo_enabled = True
             else:
                 for s1 in ("Control", "Command"):
-                    for s2 in ("z", "Z"):
+                    for s2 in ("z", "Z", "y", "Y"):
                         for widget in (self, self.RI, self.CH, self.TL):
                             widget.unbind(f"<{s1}-{s2}>")
                 self.undo_enabled = False
@@ -2629,6 +2683,13 @@ class MainTable(tk.Canvas):
         menu.add_command(**kwargs)
 
     def create_rc_menus(self):
+        # menus are built when a right click is about to show one
+        self.rc_menus_stale = True
+
+    def build_rc_menus(self):
+        if not self.rc_menus_stale:
+            return
+        self.rc_menus_stale = False
         if not self.rc_popup_menu:
             self.rc_popup_menu = tk.Menu(self, tearoff=0, background=self.popup_menu_bg)
         if not self.CH.ch_rc_popup_menu:
@@ -3275,6 +3336,7 @@ class MainTable(tk.Canvas):
     def rc(self, event=None):
         self.mouseclick_outside_editor_or_dropdown_all_canvases()
         self.focus_set()
+        self.build_rc_menus()
         popup_menu = None
         if self.single_selection_enabled and all(
             v is None
@@ -3918,39 +3980,36 @@ class MainTable(tk.Canvas):
             self.CH.xview_scroll(-1, "units")
         self.main_table_redraw_grid_and_text(redraw_header=True)
 
+    # text is measured on a canvas shared by all sheets of the same root
+    @property
+    def txt_measure_canvas(self):
+        return self.text_measure.canvas
+
+    @property
+    def txt_measure_canvas_text(self):
+        return self.text_measure.text
+
     def get_txt_w(self, txt, font=None):
-        self.txt_measure_canvas.itemconfig(
-            self.txt_measure_canvas_text,
-            text=txt,
-            font=self.table_font if font is None else font,
-        )
-        b = self.txt_measure_canvas.bbox(self.txt_measure_canvas_text)
-        return b[2] - b[0]
+        return self.text_measure.dimensions(
+            txt, self.table_font if font is None else font
+        )[0]
 
     def get_txt_h(self, txt, font=None):
-        self.txt_measure_canvas.itemconfig(
-            self.txt_measure_canvas_text,
-            text=txt,
-            font=self.table_font if font is None else font,
-        )
-        b = self.txt_measure_canvas.bbox(self.txt_measure_canvas_text)
-        return b[3] - b[1]
+        return self.text_measure.dimensions(
+            txt, self.table_font if font is None else font
+        )[1]
 
     def get_txt_dimensions(self, txt, font=None):
-        self.txt_measure_canvas.itemconfig(
-            self.txt_measure_canvas_text,
-            text=txt,
-            font=self.table_font if font is None else font,
+        return self.text_measure.dimensions(
+            txt, self.table_font if font is None else font
         )
-        b = self.txt_measure_canvas.bbox(self.txt_measure_canvas_text)
-        return b[2] - b[0], b[3] - b[1]
 
     def get_lines_cell_height(self, n, font=None):
         return (
-            self.get_txt_h(
-                txt="\n".join(["j^|" for lines in range(n)]) if n > 1 else "j^|",
-                font=self.table_font if font is None else font,
-            )
+            self.text_measure.font_dimensions(
+                "\n".join(["j^|" for lines in range(n)]) if n > 1 else "j^|",
+                self.table_font if font is None else font,
+            )[1]
             + 5
         )
 
@@ -3986,8 +4045,10 @@ class MainTable(tk.Canvas):
             return self.table_font
 
     def set_font_help(self):
-        self.txt_h = self.get_txt_h("|ZXjy*'^")
-        self.txt_w = self.get_txt_w("|")
+        # measured text widths are for the old font
+        self.invalidate_col_text_widths()
+        self.txt_h = self.text_measure.font_dimensions("|ZXjy*'^", self.table_font)[1]
+        self.txt_w = self.text_measure.font_dimensions("|", self.table_font)[0]
         self.half_txt_h = ceil(self.txt_h / 2)
         if self.half_txt_h % 2 == 0:
             self.fl_ins = self.half_txt_h + 2
@@ -4033,7 +4094,8 @@ class MainTable(tk.Canvas):
             return self.header_font
 
     def set_header_font_help(self):
-        self.header_txt_w, self.header_txt_h = self.get_txt_dimensions(
+        self.invalidate_col_text_widths()
+        self.header_txt_w, self.header_txt_h = self.text_measure.font_dimensions(
             "|", self.header_font
         )
         self.header_half_txt_h = ceil(self.header_txt_h / 2)
@@ -4058,7 +4120,7 @@ class MainTable(tk.Canvas):
         self.CH.set_height(self.default_header_height[1])
 
     def set_index_font_help(self):
-        pass
+        self.invalidate_col_text_widths()
 
     def data_reference(
         self,
@@ -4068,14 +4130,18 @@ class MainTable(tk.Canvas):
         redraw=False,
         return_id=True,
         keep_formatting=True,
+        reapply_formatting=True,
     ):
         if isinstance(newdataref, (list, tuple)):
+            self.finish_tasks()
+            self.invalidate_col_text_widths()
             self.data = newdataref
             if keep_formatting:
-                self.reapply_formatting()
+                if reapply_formatting:
+                    self.reapply_formatting()
             else:
                 self.delete_all_formatting(clear_values=False)
-            self.undo_storage = deque(maxlen=self.max_undos)
+            self.undo_storage.clear()
             if reset_col_positions:
                 self.reset_col_positions()
             if reset_row_positions:
@@ -4089,6 +4155,66 @@ class MainTable(tk.Canvas):
         else:
             return self.data
 
+    def update_data(self, newdata, key=None):
+        self.invalidate_col_text_widths()
+        old_total = len(self.data)
+        new_to_old = diff_sheet_rows(self.data, newdata, key)
+        old_to_new = {rn: i for i, rn in enumerate(new_to_old) if rn is not None}
+        deleted_rows = [rn for rn in range(old_total) if rn not in old_to_new]
+        added_rows = [i for i, rn in enumerate(new_to_old) if rn is None]
+        moved_rows = [(rn, i) for rn, i in old_to_new.items() if rn != i]
+        if deleted_rows or added_rows or moved_rows:
+            if key is None:
+                self.row_offsets.delete(deleted_rows)
+                self.row_offsets.insert(old_total, len(added_rows))
+            else:
+                shift = len(newdata) - old_total
+                self.remap_row_options(
+                    lambda rn: old_to_new.get(rn) if rn < old_total else rn + shift
+                )
+            self.remap_row_positions(new_to_old, old_to_new, old_total, len(newdata))
+            if isinstance(self._row_index, list) and self._row_index:
+                self._row_index[:] = [
+                    self._row_index[rn]
+                    if rn is not None and rn < len(self._row_index)
+                    else self.RI.get_value_for_empty_cell(i)
+                    for i, rn in enumerate(new_to_old)
+                ] + self._row_index[old_total:]
+            self.undo_storage.clear()
+        old_data = self.data
+        self.data[:] = [old_data[rn] if rn is not None else [] for rn in new_to_old]
+        modified_cells = []
+        for datarn, (rn, row) in enumerate(zip(new_to_old, newdata)):
+            if rn is None:
+                for datacn, v in enumerate(row):
+                    self.set_cell_data(datarn, datacn, v)
+                continue
+            current = self.data[datarn]
+            for datacn, v in enumerate(row):
+                if datacn >= len(current) or current[datacn] != v:
+                    self.set_cell_data(datarn, datacn, v)
+                    modified_cells.append((datarn, datacn))
+            if len(current) > len(row):
+                modified_cells.extend(
+                    (datarn, datacn) for datacn in range(len(row), len(current))
+                )
+                del current[len(row) :]
+        if self.all_columns_displayed:
+            total_cols = max(map(len, self.data), default=0)
+            if total_cols > len(self.col_positions) - 1:
+                self.insert_col_positions(
+                    widths=total_cols - len(self.col_positions) + 1
+                )
+        event_data = sheet_modified_event_data(
+            action="update_sheet_data",
+            modified_cells=modified_cells,
+            deleted_rows=deleted_rows,
+            added_rows=added_rows,
+            moved_rows=moved_rows,
+        )
+        self.parentframe.emit_event("<<SheetModified>>", event_data)
+        return event_data
+
     def get_cell_dimensions(self, datarn, datacn):
         txt = self.get_valid_cell_data_as_str(datarn, datacn, get_displayed=True)
         if txt:
@@ -4183,17 +4309,177 @@ class MainTable(tk.Canvas):
             else:
                 return False
 
+    def get_fitted_col_width(self, datacn):
+        # the width auto sizing would give datacn, None if it is not known
+        # without measuring the whole column
+        tw = self.get_cached_col_text_width(datacn)
+        if tw is None:
+            return None
+        w = max(self.CH.get_cell_dimensions(datacn)[0], tw)
+        if w <= self.min_column_width:
+            return int(self.min_column_width)
+        elif w > self.max_column_width:
+            return int(self.max_column_width)
+        return w
+
+    def get_fitted_cell_height(self, datarn, datacn):
+        h = self.get_cell_dimensions(datarn, datacn)[1]
+        if h < self.min_row_height:
+            return int(self.min_row_height)
+        elif h > self.max_row_height:
+            return int(self.max_row_height)
+        return h
+
+    def get_fitted_cell_size(self, datarn, datacn):
+        # (fitted column width or None, cell height) before an edit
+        return (
+            self.get_fitted_col_width(datacn),
+            self.get_fitted_cell_height(datarn, datacn),
+        )
+
+    def refit_cell_size(self, r, c, datarn, datacn, fitted, redraw=True):
+        # auto resize after an edit, a column that fitted its cells and a row
+        # that fitted the edited cell shrink to fit again, otherwise the
+        # cell's row and column only grow
+        width, height = fitted
+        shrunk = False
+        if (
+            width is not None
+            and width == self.col_positions[c + 1] - self.col_positions[c]
+        ):
+            new_width = self.get_fitted_col_width(datacn)
+            if new_width is not None and new_width < width:
+                self.CH.set_col_width_run_binding(
+                    c, width=new_width, only_set_if_too_small=False
+                )
+                shrunk = True
+        if (
+            height == self.row_positions[r + 1] - self.row_positions[r]
+            and self.get_fitted_cell_height(datarn, datacn) < height
+        ):
+            self.RI.set_row_height_run_binding(r, only_set_if_too_small=False)
+            shrunk = True
+        # returns None if the cell did not have to grow
+        if (
+            self.set_cell_size_to_text(
+                r, c, only_set_if_too_small=True, redraw=redraw, run_binding=True
+            )
+            is None
+            and shrunk
+            and redraw
+        ):
+            self.refresh()
+
     def set_all_cell_sizes_to_text(self, include_index=False):
+        for _ in self.yield_all_cell_sizes_to_text(include_index=include_index):
+            pass
+        return self.row_positions, self.col_positions
+
+    def get_cached_col_text_width(self, datacn):
+        # widest cell text in datacn from its TopSizes, measuring only the
+        # changed cells, None if the whole column has to be measured
+        if not self.all_rows_displayed:
+            return None
+        sizes = self.col_text_widths.get(datacn)
+        if sizes is None:
+            return None
+        if sizes.dirty:
+            pos = self.row_offsets.pos
+            total = len(self.data)
+            for key in sizes.dirty:
+                datarn = pos(key)
+                sizes.set(
+                    key,
+                    self.get_col_text_width(datacn, (datarn,)) if datarn < total else 0,
+                )
+            sizes.dirty = set()
+        width = sizes.largest()
+        if width is None:
+            del self.col_text_widths[datacn]
+        return width
+
+    def get_col_text_width(self, datacn, datarns, top=None):
+        # widest cell text in datacn of the rows datarns, 0 if they are empty
+        # top is a heap kept to the largest (width, row key) for TopSizes
+        key = self.row_offsets.key
+        push = TopSizes.push
+        qconf = self.txt_measure_canvas.itemconfig
+        qbbox = self.txt_measure_canvas.bbox
+        qtxtm = self.txt_measure_canvas_text
+        qfont = self.table_font
+        w = 0
+        for datarn in datarns:
+            txt = self.get_valid_cell_data_as_str(datarn, datacn, get_displayed=True)
+            if txt:
+                qconf(qtxtm, text=txt, font=qfont)
+                b = qbbox(qtxtm)
+                if self.get_cell_kwargs(
+                    datarn, datacn, key="dropdown"
+                ) or self.get_cell_kwargs(datarn, datacn, key="checkbox"):
+                    tw = b[2] - b[0] + self.txt_h + 7
+                else:
+                    tw = b[2] - b[0] + 7
+                if tw > w:
+                    w = tw
+                if top is not None:
+                    push(top, tw, key(datarn))
+        return w
+
+    def refine_col_widths(self, cols):
+        # cols are (datacn, measured rows, width, top) of sampled columns, the
+        # rest of their rows are measured when the table is idle
+        self.col_width_queue.extend(cols)
+        task = self.tasks.get("refine_col_widths")
+        if task is None:
+            task = self.run_task("refine_col_widths", self.yield_refine_col_widths())
+        return task
+
+    def yield_refine_col_widths(self, chunk=1000):
+        # widens a column if a wider cell is found, yields (rows done, total
+        # rows) of the column being measured
+        queue = self.col_width_queue
+        try:
+            while queue:
+                datacn, measured, width, top = queue.popleft()
+                if self.all_rows_displayed:
+                    datarns = range(len(self.data))
+                else:
+                    datarns = self.displayed_rows
+                    top = None
+                rest = [datarn for datarn in datarns if datarn not in measured]
+                for i in range(0, len(rest), chunk):
+                    w = self.get_col_text_width(datacn, rest[i : i + chunk], top)
+                    if w > width:
+                        width = w
+                        self.widen_data_col(datacn, width)
+                    yield min(i + chunk, len(rest)), len(rest)
+                if self.all_rows_displayed:
+                    self.store_col_text_widths(datacn, top)
+        finally:
+            queue.clear()
+
+    def widen_data_col(self, datacn, width):
+        if self.all_columns_displayed:
+            c = datacn
+        else:
+            try:
+                c = self.displayed_columns.index(datacn)
+            except ValueError:
+                return
+        if c < len(self.col_positions) - 1:
+            self.CH.set_col_width(c, width=width, only_set_if_too_small=True)
+
+    def yield_all_cell_sizes_to_text(self, include_index=False, visible_first=False):
+        # yields (columns done, total columns) after each column and every
+        # yield_rows rows within a column, if visible_first the columns in
+        # view are measured first and their widths are shown straight away
+        yield_rows = 100
         min_column_width = int(self.min_column_width)
         min_rh = int(self.min_row_height)
         w = min_column_width
         h = min_rh
         rhs = defaultdict(lambda: int(min_rh))
-        cws = []
-        x = self.txt_measure_canvas.create_text(0, 0, text="", font=self.table_font)
-        x2 = self.txt_measure_canvas.create_text(0, 0, text="", font=self.header_font)
-        itmcon = self.txt_measure_canvas.itemconfig
-        itmbbx = self.txt_measure_canvas.bbox
+        cws = {}
         if self.all_columns_displayed:
             itercols = range(self.total_data_cols())
         else:
@@ -4202,125 +4488,115 @@ class MainTable(tk.Canvas):
             iterrows = range(self.total_data_rows())
         else:
             iterrows = self.displayed_rows
-        if is_iterable(self._row_index):
-            for datarn in iterrows:
-                w_, h = self.RI.get_cell_dimensions(datarn)
-                if h < min_rh:
-                    h = int(min_rh)
-                elif h > self.max_row_height:
-                    h = int(self.max_row_height)
-                if h > rhs[datarn]:
-                    rhs[datarn] = h
-        for datacn in itercols:
-            w, h_ = self.CH.get_cell_dimensions(datacn)
-            if self.all_rows_displayed:
-                # refresh range generator if needed
-                iterrows = range(self.total_data_rows())
-            for datarn in iterrows:
-                txt = self.get_valid_cell_data_as_str(
-                    datarn, datacn, get_displayed=True
-                )
-                if txt:
-                    itmcon(x, text=txt)
-                    b = itmbbx(x)
-                    tw = b[2] - b[0] + 7
-                    h = b[3] - b[1] + 5
-                else:
-                    tw = min_column_width
-                    h = min_rh
-                if self.get_cell_kwargs(
-                    datarn, datacn, key="dropdown"
-                ) or self.get_cell_kwargs(datarn, datacn, key="checkbox"):
-                    tw += self.txt_h
-                if tw > w:
-                    w = tw
-                if h < min_rh:
-                    h = int(min_rh)
-                elif h > self.max_row_height:
-                    h = int(self.max_row_height)
-                if h > rhs[datarn]:
-                    rhs[datarn] = h
-            if w < min_column_width:
-                w = int(min_column_width)
-            elif w > self.max_column_width:
-                w = int(self.max_column_width)
-            cws.append(w)
-        self.txt_measure_canvas.delete(x)
-        self.txt_measure_canvas.delete(x2)
-        self.row_positions = list(
-            accumulate(chain([0], (height for height in rhs.values())))
-        )
-        self.col_positions = list(accumulate(chain([0], (width for width in cws))))
-        self.recreate_all_selection_boxes()
-        return self.row_positions, self.col_positions
-
-    def reset_col_positions(self, ncols=None):
-        colpos = int(self.default_column_width)
-        if self.all_columns_displayed:
-            self.col_positions = list(
-                accumulate(
-                    chain(
-                        [0],
-                        (
-                            colpos
-                            for c in range(
-                                ncols if ncols is not None else self.total_data_cols()
-                            )
-                        ),
-                    )
-                )
-            )
-        else:
-            self.col_positions = list(
-                accumulate(
-                    chain(
-                        [0],
-                        (
-                            colpos
-                            for c in range(
-                                ncols
-                                if ncols is not None
-                                else len(self.displayed_columns)
-                            )
-                        ),
-                    )
-                )
+        total = len(itercols)
+        order = range(total)
+        visible = range(0)
+        if visible_first and len(self.col_positions) - 1 == total:
+            start_col, end_col = self.get_visible_columns(
+                self.canvasx(0), self.canvasx(self.winfo_width())
+            )
+            visible = range(max(0, start_col - 1), min(total, end_col - 1))
+            order = chain(
+                visible,
+                (i for i in range(total) if i < visible.start or i >= visible.stop),
             )
-
-    def reset_row_positions(self, nrows=None):
-        rowpos = self.default_row_height[1]
-        if self.all_rows_displayed:
-            self.row_positions = list(
-                accumulate(
-                    chain(
-                        [0],
-                        (
-                            rowpos
-                            for r in range(
-                                nrows if nrows is not None else self.total_data_rows()
-                            )
-                        ),
+        x = self.txt_measure_canvas.create_text(0, 0, text="", font=self.table_font)
+        x2 = self.txt_measure_canvas.create_text(0, 0, text="", font=self.header_font)
+        itmcon = self.txt_measure_canvas.itemconfig
+        itmbbx = self.txt_measure_canvas.bbox
+        key = self.row_offsets.key
+        push = TopSizes.push
+        try:
+            if is_iterable(self._row_index):
+                for n, datarn in enumerate(iterrows, 1):
+                    w_, h = self.RI.get_cell_dimensions(datarn)
+                    if h < min_rh:
+                        h = int(min_rh)
+                    elif h > self.max_row_height:
+                        h = int(self.max_row_height)
+                    if h > rhs[datarn]:
+                        rhs[datarn] = h
+                    if not n % yield_rows:
+                        yield 0, total
+            for done, i in enumerate(order, 1):
+                datacn = itercols[i]
+                w, h_ = self.CH.get_cell_dimensions(datacn)
+                if self.all_rows_displayed:
+                    # refresh range generator if needed
+                    iterrows = range(self.total_data_rows())
+                    top = []
+                else:
+                    top = None
+                for n, datarn in enumerate(iterrows, 1):
+                    txt = self.get_valid_cell_data_as_str(
+                        datarn, datacn, get_displayed=True
                     )
-                )
-            )
-        else:
-            self.row_positions = list(
-                accumulate(
-                    chain(
-                        [0],
-                        (
-                            rowpos
-                            for r in range(
-                                nrows if nrows is not None else len(self.displayed_rows)
+                    if txt:
+                        itmcon(x, text=txt)
+                        b = itmbbx(x)
+                        tw = b[2] - b[0] + 7
+                        h = b[3] - b[1] + 5
+                    else:
+                        tw = min_column_width
+                        h = min_rh
+                    if self.get_cell_kwargs(
+                        datarn, datacn, key="dropdown"
+                    ) or self.get_cell_kwargs(datarn, datacn, key="checkbox"):
+                        tw += self.txt_h
+                    if tw > w:
+                        w = tw
+                    if txt and top is not None:
+                        push(top, tw, key(datarn))
+                    if h < min_rh:
+                        h = int(min_rh)
+                    elif h > self.max_row_height:
+                        h = int(self.max_row_height)
+                    if h > rhs[datarn]:
+                        rhs[datarn] = h
+                    if not n % yield_rows:
+                        yield done - 1, total
+                if w < min_column_width:
+                    w = int(min_column_width)
+                elif w > self.max_column_width:
+                    w = int(self.max_column_width)
+                cws[i] = w
+                self.store_col_text_widths(datacn, top)
+                if done == len(visible) and done < total:
+                    positions = self.col_positions
+                    self.col_positions = list(
+                        accumulate(
+                            chain(
+                                [0],
+                                (
+                                    cws[c]
+                                    if c in cws
+                                    else positions[c + 1] - positions[c]
+                                    for c in range(total)
+                                ),
                             )
-                        ),
+                        )
                     )
-                )
-            )
+                    self.recreate_all_selection_boxes()
+                yield done, total
+        finally:
+            self.txt_measure_canvas.delete(x)
+            self.txt_measure_canvas.delete(x2)
+        self.row_positions = list(
+            accumulate(chain([0], (height for height in rhs.values())))
+        )
+        self.col_positions = list(
+            accumulate(chain([0], (cws[i] for i in range(total))))
+        )
+        self.recreate_all_selection_boxes()
 
     def del_col_position(self, idx, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
+        sizes = self.batch_col_widths()
+        if sizes:
+            del sizes[-1 if idx == "end" or len(sizes) <= idx else idx]
+            return
         if idx == "end" or len(self.col_positions) <= idx + 1:
             del self.col_positions[-1]
         else:
@@ -4332,8 +4608,13 @@ class MainTable(tk.Canvas):
             ]
 
     def del_row_position(self, idx, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
+        sizes = self.batch_row_heights()
+        if sizes:
+            del sizes[-1 if idx == "end" or len(sizes) <= idx else idx]
+            return
         if idx == "end" or len(self.row_positions) <= idx + 1:
             del self.row_positions[-1]
         else:
@@ -4347,6 +4628,13 @@ class MainTable(tk.Canvas):
     def del_col_positions(self, idx, num=1, deselect_all=False):
         if deselect_all:
             self.deselect("all", redraw=False)
+        sizes = self.batch_col_widths()
+        if sizes:
+            if idx == "end" or len(sizes) <= idx:
+                del sizes[-1]
+            else:
+                del sizes[idx : idx + num]
+            return
         if idx == "end" or len(self.col_positions) <= idx + 1:
             del self.col_positions[-1]
         else:
@@ -4363,6 +4651,13 @@ class MainTable(tk.Canvas):
     def del_row_positions(self, idx, numrows=1, deselect_all=False):
         if deselect_all:
             self.deselect("all", redraw=False)
+        sizes = self.batch_row_heights()
+        if sizes:
+            if idx == "end" or len(sizes) <= idx:
+                del sizes[-1]
+            else:
+                del sizes[idx : idx + numrows]
+            return
         if idx == "end" or len(self.row_positions) <= idx + 1:
             del self.row_positions[-1]
         else:
@@ -4378,13 +4673,73 @@ class MainTable(tk.Canvas):
                 accumulate(chain([0], (height for height in rhs)))
             )
 
+    def delete_cols_displayed(self, cols, datacns, selection_boxes=None):
+        # cols are displayed columns, datacns the set of their data columns
+        # returns the delete_cols undo storage, options are stored only
+        # for the deleted columns
+        undo_storage = {
+            "deleted_cols": {},
+            "colwidths": {
+                c: self.col_positions[c + 1] - self.col_positions[c]
+                for c in sorted(cols, reverse=True)
+            },
+            "deleted_header_values": {},
+            "selection_boxes": self.get_boxes()
+            if selection_boxes is None
+            else selection_boxes,
+            "displayed_columns": list(self.displayed_columns)
+            if not isinstance(self.displayed_columns, int)
+            else int(self.displayed_columns),
+        }
+        (
+            undo_storage["deleted_cols"],
+            undo_storage["deleted_header_values"],
+            deleted_options,
+        ) = self.delete_cols_data(datacns)
+        undo_storage.update(deleted_options)
+        return ("delete_cols", undo_storage)
+
+    def delete_rows_displayed(self, rows, datarns, selection_boxes=None):
+        # rows are displayed rows, datarns the set of their data rows
+        # returns the delete_rows undo storage, options are stored only
+        # for the deleted rows
+        undo_storage = {
+            "deleted_rows": [],
+            "rowheights": {
+                r: self.row_positions[r + 1] - self.row_positions[r]
+                for r in sorted(rows, reverse=True)
+            },
+            "deleted_index_values": [],
+            "selection_boxes": self.get_boxes()
+            if selection_boxes is None
+            else selection_boxes,
+            "displayed_rows": list(self.displayed_rows)
+            if not isinstance(self.displayed_rows, int)
+            else int(self.displayed_rows),
+        }
+        (
+            undo_storage["deleted_rows"],
+            undo_storage["deleted_index_values"],
+            deleted_options,
+        ) = self.delete_rows_data(datarns)
+        undo_storage.update(deleted_options)
+        return ("delete_rows", undo_storage)
+
     def insert_col_position(self, idx="end", width=None, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
         if width is None:
             w = self.default_column_width
         else:
             w = width
+        sizes = self.batch_col_widths()
+        if sizes is not None:
+            if idx == "end" or len(sizes) <= idx:
+                sizes.append(w)
+            else:
+                sizes.insert(idx, w)
+            return
         if idx == "end" or len(self.col_positions) == idx + 1:
             self.col_positions.append(self.col_positions[-1] + w)
         else:
@@ -4396,12 +4751,20 @@ class MainTable(tk.Canvas):
             ]
 
     def insert_row_position(self, idx, height=None, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
         if height is None:
             h = self.default_row_height[1]
         else:
             h = height
+        sizes = self.batch_row_heights()
+        if sizes is not None:
+            if idx == "end" or len(sizes) <= idx:
+                sizes.append(h)
+            else:
+                sizes.insert(idx, h)
+            return
         if idx == "end" or len(self.row_positions) == idx + 1:
             self.row_positions.append(self.row_positions[-1] + h)
         else:
@@ -4413,6 +4776,7 @@ class MainTable(tk.Canvas):
             ]
 
     def insert_col_positions(self, idx="end", widths=None, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
         if widths is None:
@@ -4421,6 +4785,13 @@ class MainTable(tk.Canvas):
             w = list(repeat(self.default_column_width, widths))
         else:
             w = widths
+        sizes = self.batch_col_widths()
+        if sizes is not None:
+            if idx == "end" or len(sizes) <= idx:
+                sizes.extend(w)
+            else:
+                sizes[idx:idx] = w
+            return
         if idx == "end" or len(self.col_positions) == idx + 1:
             if len(w) > 1:
                 self.col_positions += list(
@@ -4455,6 +4826,7 @@ class MainTable(tk.Canvas):
                 ]
 
     def insert_row_positions(self, idx="end", heights=None, deselect_all=False):
+        self.finish_tasks()
         if deselect_all:
             self.deselect("all", redraw=False)
         if heights is None:
@@ -4463,6 +4835,13 @@ class MainTable(tk.Canvas):
             h = list(repeat(self.default_row_height[1], heights))
         else:
             h = heights
+        sizes = self.batch_row_heights()
+        if sizes is not None:
+            if idx == "end" or len(sizes) <= idx:
+                sizes.extend(h)
+            else:
+                sizes[idx:idx] = h
+            return
         if idx == "end" or len(self.row_positions) == idx + 1:
             if len(h) > 1:
                 self.row_positions += list(
@@ -4497,6 +4876,7 @@ class MainTable(tk.Canvas):
                 ]
 
     def insert_cols_rc(self, event=None):
+        self.finish_tasks()
         if self.anything_selected(exclude_rows=True, exclude_cells=True):
             selcols = self.get_selected_cols()
             numcols = len(selcols)
@@ -4562,18 +4942,7 @@ class MainTable(tk.Canvas):
         self.insert_col_positions(
             idx=displayed_ins_col, widths=numcols, deselect_all=True
         )
-        self.cell_options = {
-            (rn, cn if cn < data_ins_col else cn + numcols): t2
-            for (rn, cn), t2 in self.cell_options.items()
-        }
-        self.col_options = {
-            cn if cn < data_ins_col else cn + numcols: t
-            for cn, t in self.col_options.items()
-        }
-        self.CH.cell_options = {
-            cn if cn < data_ins_col else cn + numcols: t
-            for cn, t in self.CH.cell_options.items()
-        }
+        self.col_offsets.insert(data_ins_col, numcols)
         self.CH.fix_header()
         if self._headers and isinstance(self._headers, list):
             if data_ins_col >= len(self._headers):
@@ -4610,18 +4979,14 @@ class MainTable(tk.Canvas):
         self.set_currently_selected(0, displayed_ins_col, "column")
         if self.undo_enabled:
             self.undo_storage.append(
-                zlib.compress(
-                    pickle.dumps(
-                        (
-                            "insert_cols",
-                            {
-                                "data_col_num": data_ins_col,
-                                "displayed_columns": saved_displayed_columns,
-                                "sheet_col_num": displayed_ins_col,
-                                "numcols": numcols,
-                            },
-                        )
-                    )
+                (
+                    "insert_cols",
+                    {
+                        "data_col_num": data_ins_col,
+                        "displayed_columns": saved_displayed_columns,
+                        "sheet_col_num": displayed_ins_col,
+                        "numcols": numcols,
+                    },
                 )
             )
         self.refresh()
@@ -4631,20 +4996,18 @@ class MainTable(tk.Canvas):
                     "end_insert_columns", data_ins_col, displayed_ins_col, numcols
                 )
             )
-        added_cols = list(range(data_ins_col, data_ins_col + numcols))
-        modified_cols = list(range(data_ins_col, len(self.col_positions) - 1))
-        displacement = numcols
-        old_col_positions = list(range(data_ins_col, len(self.col_positions) - 1 - numcols))
-        moved_cols = [(cn, cn + displacement) for cn in old_col_positions]
         event_data = sheet_modified_event_data(
             action="insert_cols",
-            added_cols=added_cols,
-            modified_cols=modified_cols,
-            moved_cols=moved_cols,
+            added_cols=RangeSet([(data_ins_col, data_ins_col + numcols)]),
+            modified_cols=RangeSet([(data_ins_col, len(self.col_positions) - 1)]),
+            moved_cols=MovedRanges(
+                [(data_ins_col, len(self.col_positions) - 1 - numcols, numcols)]
+            ),
         )
         self.parentframe.emit_event("<<SheetModified>>", event_data)
 
     def insert_rows_rc(self, event=None):
+        self.finish_tasks()
         if self.anything_selected(exclude_columns=True, exclude_cells=True):
             selrows = self.get_selected_rows()
             numrows = len(selrows)
@@ -4708,18 +5071,8 @@ class MainTable(tk.Canvas):
         self.insert_row_positions(
             idx=displayed_ins_row, heights=numrows, deselect_all=True
         )
-        self.cell_options = {
-            (rn if rn < data_ins_row else rn + numrows, cn): t2
-            for (rn, cn), t2 in self.cell_options.items()
-        }
-        self.row_options = {
-            rn if rn < data_ins_row else rn + numrows: t
-            for rn, t in self.row_options.items()
-        }
-        self.RI.cell_options = {
-            rn if rn < data_ins_row else rn + numrows: t
-            for rn, t in self.RI.cell_options.items()
-        }
+        self.row_offsets.insert(data_ins_row, numrows)
+        self.mark_col_text_widths(range(data_ins_row, data_ins_row + numrows))
         self.RI.fix_index()
         if self._row_index and isinstance(self._row_index, list):
             if data_ins_row >= len(self._row_index):
@@ -4756,18 +5109,14 @@ class MainTable(tk.Canvas):
         self.set_currently_selected(displayed_ins_row, 0, "row")
         if self.undo_enabled:
             self.undo_storage.append(
-                zlib.compress(
-                    pickle.dumps(
-                        (
-                            "insert_rows",
-                            {
-                                "data_row_num": data_ins_row,
-                                "displayed_rows": saved_displayed_rows,
-                                "sheet_row_num": displayed_ins_row,
-                                "numrows": numrows,
-                            },
-                        )
-                    )
+                (
+                    "insert_rows",
+                    {
+                        "data_row_num": data_ins_row,
+                        "displayed_rows": saved_displayed_rows,
+                        "sheet_row_num": displayed_ins_row,
+                        "numrows": numrows,
+                    },
                 )
             )
         self.refresh()
@@ -4775,20 +5124,18 @@ class MainTable(tk.Canvas):
             self.extra_end_insert_rows_rc_func(
                 InsertEvent("end_insert_rows", data_ins_row, displayed_ins_row, numrows)
             )
-        add_rows = list(range(data_ins_row, data_ins_row + numrows))
-        modified_rows = list(range(data_ins_row, len(self.row_positions) - 1))
-        displacement = numrows
-        old_row_positions = list(range(data_ins_row, len(self.row_positions) - 1 - numrows))
-        moved_rows = [(start, start + displacement) for start in old_row_positions]
         event_data = sheet_modified_event_data(
             action="insert_rows",
-            modified_rows=modified_rows,
-            moved_rows=moved_rows,
-            added_rows=add_rows,
+            modified_rows=RangeSet([(data_ins_row, len(self.row_positions) - 1)]),
+            moved_rows=MovedRanges(
+                [(data_ins_row, len(self.row_positions) - 1 - numrows, numrows)]
+            ),
+            added_rows=RangeSet([(data_ins_row, data_ins_row + numrows)]),
         )
         self.parentframe.emit_event("<<SheetModified>>", event_data)
 
     def del_cols_rc(self, event=None):
+        self.finish_tasks()
         seld_cols = sorted(self.get_selected_cols())
         if not seld_cols:
             return
@@ -4804,98 +5151,28 @@ class MainTable(tk.Canvas):
             if self.all_columns_displayed
             else set(self.displayed_columns[c] for c in seld_cols)
         )
+        undo_storage = self.delete_cols_displayed(seld_cols, seldset)
         if self.undo_enabled:
-            undo_storage = {
-                "deleted_cols": {},
-                "colwidths": {},
-                "deleted_header_values": {},
-                "selection_boxes": self.get_boxes(),
-                "displayed_columns": list(self.displayed_columns)
-                if not isinstance(self.displayed_columns, int)
-                else int(self.displayed_columns),
-                "cell_options": {k: v.copy() for k, v in self.cell_options.items()},
-                "col_options": {k: v.copy() for k, v in self.col_options.items()},
-                "CH_cell_options": {
-                    k: v.copy() for k, v in self.CH.cell_options.items()
-                },
-            }
-            for c in reversed(seld_cols):
-                undo_storage["colwidths"][c] = (
-                    self.col_positions[c + 1] - self.col_positions[c]
-                )
-                datacn = c if self.all_columns_displayed else self.displayed_columns[c]
-                for rn in range(len(self.data)):
-                    if datacn not in undo_storage["deleted_cols"]:
-                        undo_storage["deleted_cols"][datacn] = {}
-                    try:
-                        undo_storage["deleted_cols"][datacn][rn] = self.data[rn].pop(
-                            datacn
-                        )
-                    except Exception:
-                        continue
-                try:
-                    undo_storage["deleted_header_values"][datacn] = self._headers.pop(
-                        datacn
-                    )
-                except Exception:
-                    continue
-        else:
-            for c in reversed(seld_cols):
-                datacn = c if self.all_columns_displayed else self.displayed_columns[c]
-                for rn in range(len(self.data)):
-                    del self.data[rn][datacn]
-                try:
-                    del self._headers[datacn]
-                except Exception:
-                    continue
-        if self.undo_enabled:
-            self.undo_storage.append(("delete_cols", undo_storage))
-        for c in reversed(seld_cols):
-            self.del_col_position(c, deselect_all=False)
-        numcols = len(seld_cols)
-        idx = seld_cols[-1]
-        self.cell_options = {
-            (rn, cn if cn < idx else cn - numcols): t2
-            for (rn, cn), t2 in self.cell_options.items()
-            if cn not in seldset
-        }
-        self.col_options = {
-            cn if cn < idx else cn - numcols: t
-            for cn, t in self.col_options.items()
-            if cn not in seldset
-        }
-        self.CH.cell_options = {
-            cn if cn < idx else cn - numcols: t
-            for cn, t in self.CH.cell_options.items()
-            if cn not in seldset
-        }
+            self.undo_storage.append(undo_storage)
         self.deselect("allcols", redraw=False)
         self.set_current_to_last()
-        if not self.all_columns_displayed:
-            self.displayed_columns = [
-                c for c in self.displayed_columns if c not in seldset
-            ]
-            for c in sorted(seldset):
-                self.displayed_columns = [
-                    dc if c > dc else dc - 1 for dc in self.displayed_columns
-                ]
         self.refresh()
         if self.extra_end_del_cols_rc_func is not None:
             self.extra_end_del_cols_rc_func(
                 DeleteRowColumnEvent("end_delete_columns", seld_cols)
             )
-        deleted_cols = seld_cols
-        modified_cols = list(range(min(seld_cols), len(self.col_positions) - 1))
-        moved_cols = [(end+len(seld_cols), end) for end in modified_cols]
+        num = len(seld_cols)
+        start, stop = min(seld_cols), len(self.col_positions) - 1
         event_data = sheet_modified_event_data(
             action="delete_cols",
-            modified_cols = modified_cols,
-            deleted_cols = deleted_cols,
-            moved_cols = moved_cols,
+            modified_cols=RangeSet([(start, stop)]),
+            deleted_cols=RangeSet.from_indexes(seld_cols),
+            moved_cols=MovedRanges([(start + num, stop + num, -num)]),
         )
         self.parentframe.emit_event("<<SheetModified>>", event_data)
 
     def del_rows_rc(self, event=None):
+        self.finish_tasks()
         seld_rows = sorted(self.get_selected_rows())
         if not seld_rows:
             return
@@ -4911,66 +5188,9 @@ class MainTable(tk.Canvas):
             if self.all_rows_displayed
             else set(self.displayed_rows[r] for r in seld_rows)
         )
+        undo_storage = self.delete_rows_displayed(seld_rows, seldset)
         if self.undo_enabled:
-            undo_storage = {
-                "deleted_rows": [],
-                "rowheights": {},
-                "deleted_index_values": [],
-                "selection_boxes": self.get_boxes(),
-                "displayed_rows": list(self.displayed_rows)
-                if not isinstance(self.displayed_rows, int)
-                else int(self.displayed_rows),
-                "cell_options": {k: v.copy() for k, v in self.cell_options.items()},
-                "row_options": {k: v.copy() for k, v in self.row_options.items()},
-                "RI_cell_options": {
-                    k: v.copy() for k, v in self.RI.cell_options.items()
-                },
-            }
-            for r in reversed(seld_rows):
-                undo_storage["rowheights"][r] = (
-                    self.row_positions[r + 1] - self.row_positions[r]
-                )
-                datarn = r if self.all_rows_displayed else self.displayed_rows[r]
-                undo_storage["deleted_rows"].append((datarn, self.data.pop(datarn)))
-                try:
-                    undo_storage["deleted_index_values"].append(
-                        (datarn, self._row_index.pop(datarn))
-                    )
-                except Exception:
-                    continue
-        else:
-            for r in reversed(seld_rows):
-                datarn = r if self.all_rows_displayed else self.displayed_rows[r]
-                del self.data[datarn]
-                try:
-                    del self._row_index[datarn]
-                except Exception:
-                    continue
-        if self.undo_enabled:
-            self.undo_storage.append(("delete_rows", undo_storage))
-        for r in reversed(seld_rows):
-            self.del_row_position(r, deselect_all=False)
-        numrows = len(seld_rows)
-        idx = (
-            seld_rows[-1]
-            if self.all_rows_displayed
-            else self.displayed_rows[seld_rows[-1]]
-        )
-        self.cell_options = {
-            (rn if rn < idx else rn - numrows, cn): t2
-            for (rn, cn), t2 in self.cell_options.items()
-            if rn not in seldset
-        }
-        self.row_options = {
-            rn if rn < idx else rn - numrows: t
-            for rn, t in self.row_options.items()
-            if rn not in seldset
-        }
-        self.RI.cell_options = {
-            rn if rn < idx else rn - numrows: t
-            for rn, t in self.RI.cell_options.items()
-            if rn not in seldset
-        }
+            self.undo_storage.append(undo_storage)
         self.deselect("allrows", redraw=False)
         self.set_current_to_last()
         self.refresh()
@@ -4978,47 +5198,16 @@ class MainTable(tk.Canvas):
             self.extra_end_del_rows_rc_func(
                 DeleteRowColumnEvent("end_delete_rows", seld_rows)
             )
-        deleted_rows = seld_rows
-        modified_rows = list(range(min(seld_rows), len(self.row_positions)-1))
-        moved_rows = [(end+len(seld_rows), end) for end in modified_rows]
+        num = len(seld_rows)
+        start, stop = min(seld_rows), len(self.row_positions) - 1
         event_data = sheet_modified_event_data(
             action="delete_rows",
-            modified_rows = modified_rows,
-            deleted_rows = deleted_rows,
-            moved_rows = moved_rows,
+            modified_rows=RangeSet([(start, stop)]),
+            deleted_rows=RangeSet.from_indexes(seld_rows),
+            moved_rows=MovedRanges([(start + num, stop + num, -num)]),
         )
         self.parentframe.emit_event("<<SheetModified>>", event_data)
 
-    def move_row_position(self, idx1, idx2):
-        if not len(self.row_positions) <= 2:
-            if idx1 < idx2:
-                height = self.row_positions[idx1 + 1] - self.row_positions[idx1]
-                self.row_positions.insert(idx2 + 1, self.row_positions.pop(idx1 + 1))
-                for i in range(idx1 + 1, idx2 + 1):
-                    self.row_positions[i] -= height
-                self.row_positions[idx2 + 1] = self.row_positions[idx2] + height
-            else:
-                height = self.row_positions[idx1 + 1] - self.row_positions[idx1]
-                self.row_positions.insert(idx2 + 1, self.row_positions.pop(idx1 + 1))
-                for i in range(idx2 + 2, idx1 + 2):
-                    self.row_positions[i] += height
-                self.row_positions[idx2 + 1] = self.row_positions[idx2] + height
-
-    def move_col_position(self, idx1, idx2):
-        if not len(self.col_positions) <= 2:
-            if idx1 < idx2:
-                width = self.col_positions[idx1 + 1] - self.col_positions[idx1]
-                self.col_positions.insert(idx2 + 1, self.col_positions.pop(idx1 + 1))
-                for i in range(idx1 + 1, idx2 + 1):
-                    self.col_positions[i] -= width
-                self.col_positions[idx2 + 1] = self.col_positions[idx2] + width
-            else:
-                width = self.col_positions[idx1 + 1] - self.col_positions[idx1]
-                self.col_positions.insert(idx2 + 1, self.col_positions.pop(idx1 + 1))
-                for i in range(idx2 + 2, idx1 + 2):
-                    self.col_positions[i] += width
-                self.col_positions[idx2 + 1] = self.col_positions[idx2] + width
-
     def display_rows(
         self,
         rows=None,
@@ -5032,11 +5221,12 @@ class MainTable(tk.Canvas):
                 if self.all_rows_displayed
                 else self.displayed_rows
             )
+        self.finish_tasks()
         total_data_rows = None
         if (rows is not None and rows != self.displayed_rows) or (
             all_rows_displayed and not self.all_rows_displayed
         ):
-            self.undo_storage = deque(maxlen=self.max_undos)
+            self.undo_storage.clear()
         if rows is not None and rows != self.displayed_rows:
             self.displayed_rows = sorted(rows)
         if all_rows_displayed:
@@ -5064,11 +5254,12 @@ class MainTable(tk.Canvas):
                 if self.all_columns_displayed
                 else self.displayed_columns
             )
+        self.finish_tasks()
         total_data_cols = None
         if (columns is not None and columns != self.displayed_columns) or (
             all_columns_displayed and not self.all_columns_displayed
         ):
-            self.undo_storage = deque(maxlen=self.max_undos)
+            self.undo_storage.clear()
         if columns is not None and columns != self.displayed_columns:
             self.displayed_columns = sorted(columns)
         if all_columns_displayed:
@@ -5207,52 +5398,6 @@ class MainTable(tk.Canvas):
             else:
                 return self._row_index
 
-    def total_data_cols(self, include_header=True):
-        h_total = 0
-        d_total = 0
-        if include_header:
-            if isinstance(self._headers, (list, tuple)):
-                h_total = len(self._headers)
-        try:
-            d_total = len(max(self.data, key=len))
-        except Exception:
-            pass
-        return h_total if h_total > d_total else d_total
-
-    def total_data_rows(self, include_index=True):
-        i_total = 0
-        d_total = 0
-        if include_index:
-            if isinstance(self._row_index, (list, tuple)):
-                i_total = len(self._row_index)
-        d_total = len(self.data)
-        return i_total if i_total > d_total else d_total
-
-    def data_dimensions(self, total_rows=None, total_columns=None):
-        if total_rows is None and total_columns is None:
-            return self.total_data_rows(), self.total_data_cols()
-        if total_rows is not None:
-            if len(self.data) < total_rows:
-                ncols = (
-                    self.total_data_cols() if total_columns is None else total_columns
-                )
-                self.data.extend(
-                    [
-                        self.get_empty_row_seq(r, ncols)
-                        for r in range(total_rows - len(self.data))
-                    ]
-                )
-            else:
-                self.data[total_rows:] = []
-        if total_columns is not None:
-            self.data[:] = [
-                r[:total_columns]
-                if len(r) > total_columns
-                else r
-                + self.get_empty_row_seq(rn, end=len(r) + total_columns, start=len(r))
-                for rn, r in enumerate(self.data)
-            ]
-
     def equalize_data_row_lengths(self, include_header=False, total_columns=None):
         total_columns = (
             self.total_data_cols() if total_columns is None else total_columns
@@ -5275,20 +5420,6 @@ class MainTable(tk.Canvas):
             self.canvasy(self.winfo_height()),
         )
 
-    def get_visible_rows(self, y1, y2):
-        start_row = bisect.bisect_left(self.row_positions, y1)
-        end_row = bisect.bisect_right(self.row_positions, y2)
-        if not y2 >= self.row_positions[-1]:
-            end_row += 1
-        return start_row, end_row
-
-    def get_visible_columns(self, x1, x2):
-        start_col = bisect.bisect_left(self.col_positions, x1)
-        end_col = bisect.bisect_right(self.col_positions, x2)
-        if not x2 >= self.col_positions[-1]:
-            end_col += 1
-        return start_col, end_col
-
     def redraw_highlight_get_text_fg(
         self,
         r,
@@ -5306,7 +5437,9 @@ class MainTable(tk.Canvas):
         can_width,
     ):
         redrawn = False
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="highlight")
+        kwargs = self.get_cell_highlight(datarn, datacn)
+        if not kwargs and self.highlight_rules:
+            kwargs = self.get_highlight_rule_kwargs(datarn, datacn)
         if kwargs:
             if kwargs[0] is not None:
                 c_1 = kwargs[0] if kwargs[0].startswith("#") else Color_Map_[kwargs[0]]
@@ -5569,6 +5702,9 @@ class MainTable(tk.Canvas):
     def main_table_redraw_grid_and_text(
         self, redraw_header=False, redraw_row_index=False, redraw_table=True
     ):
+        if self.batch_depth:
+            self.batch_redraw = True
+            return False
         last_col_line_pos = self.col_positions[-1] + 1
         last_row_line_pos = self.row_positions[-1] + 1
         try:
@@ -6457,7 +6593,37 @@ class MainTable(tk.Canvas):
             self.CH.tag_lower("cells")
         return r, b
 
+    def begin_batch(self):
+        if not self.batch_depth:
+            self.batch_events = []
+            self.batch_redraw = False
+            self.batch_boxes = False
+            self.undo_storage.begin_batch()
+        self.batch_depth += 1
+
+    def end_batch(self):
+        # returns the merged <<SheetModified>> event data of the batch
+        # or None if there were no changes
+        self.batch_depth -= 1
+        if self.batch_depth:
+            return None
+        self.undo_storage.end_batch()
+        if self.batch_boxes:
+            self.recreate_all_selection_boxes()
+        if self.batch_redraw:
+            self.main_table_redraw_grid_and_text(
+                redraw_header=True, redraw_row_index=True
+            )
+        events = self.batch_events
+        self.batch_events = []
+        if events:
+            return merge_sheet_modified_events(events)
+        return None
+
     def recreate_all_selection_boxes(self):
+        if self.batch_depth:
+            self.batch_boxes = True
+            return
         for item in chain(
             self.find_withtag("cells"),
             self.find_withtag("rows"),
@@ -7440,25 +7606,21 @@ class MainTable(tk.Canvas):
             datacn = c if self.all_columns_displayed else self.displayed_columns[c]
         if datarn is None:
             datarn = r if self.all_rows_displayed else self.displayed_rows[r]
+        if cell_resize and self.cell_auto_resize_enabled:
+            fitted = self.get_fitted_cell_size(datarn, datacn)
         if not check_input_valid or self.input_valid_for_cell(datarn, datacn, value):
             if self.undo_enabled and undo:
                 self.undo_storage.append(
-                    zlib.compress(
-                        pickle.dumps(
-                            (
-                                "edit_cells",
-                                {(datarn, datacn): self.get_cell_data(datarn, datacn)},
-                                self.get_boxes(include_current=False),
-                                self.currently_selected(),
-                            )
-                        )
+                    (
+                        "edit_cells",
+                        {(datarn, datacn): self.get_cell_data(datarn, datacn)},
+                        self.get_boxes(include_current=False),
+                        self.currently_selected(),
                     )
                 )
             self.set_cell_data(datarn, datacn, value)
         if cell_resize and self.cell_auto_resize_enabled:
-            self.set_cell_size_to_text(
-                r, c, only_set_if_too_small=True, redraw=redraw, run_binding=True
-            )
+            self.refit_cell_size(r, c, datarn, datacn, fitted, redraw=redraw)
         event_data = sheet_modified_event_data(
             action="edit_cells",
             modified_cells=[(datarn, datacn)],
@@ -7466,83 +7628,6 @@ class MainTable(tk.Canvas):
         self.parentframe.emit_event("<<SheetModified>>", event_data)
         return True
 
-    def set_cell_data(self, datarn, datacn, value, kwargs={}, expand_sheet=True):
-        if expand_sheet:
-            if datarn >= len(self.data):
-                self.fix_data_len(datarn, datacn)
-            elif datacn >= len(self.data[datarn]):
-                self.fix_row_len(datarn, datacn)
-        if expand_sheet or (
-            len(self.data) > datarn and len(self.data[datarn]) > datacn
-        ):
-            if (
-                datarn,
-                datacn,
-            ) in self.cell_options and "checkbox" in self.cell_options[
-                (datarn, datacn)
-            ]:
-                self.data[datarn][datacn] = try_to_bool(value)
-            else:
-                if not kwargs:
-                    kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
-                if kwargs:
-                    if kwargs["formatter"] is None:
-                        self.data[datarn][datacn] = format_data(value=value, **kwargs)
-                    else:
-                        self.data[datarn][datacn] = kwargs["formatter"](value, **kwargs)
-                else:
-                    self.data[datarn][datacn] = value
-
-    def get_value_for_empty_cell(self, datarn, datacn, r_ops=True, c_ops=True):
-        if self.get_cell_kwargs(
-            datarn,
-            datacn,
-            key="checkbox",
-            cell=r_ops and c_ops,
-            row=r_ops,
-            column=c_ops,
-        ):
-            return False
-        kwargs = self.get_cell_kwargs(
-            datarn,
-            datacn,
-            key="dropdown",
-            cell=r_ops and c_ops,
-            row=r_ops,
-            column=c_ops,
-        )
-        if kwargs and kwargs["validate_input"] and kwargs["values"]:
-            return kwargs["values"][0]
-        return ""
-
-    def get_empty_row_seq(self, datarn, end, start=0, r_ops=True, c_ops=True):
-        return [
-            self.get_value_for_empty_cell(datarn, datacn, r_ops=r_ops, c_ops=c_ops)
-            for datacn in range(start, end)
-        ]
-
-    def fix_row_len(self, datarn, datacn):
-        self.data[datarn].extend(
-            self.get_empty_row_seq(datarn, end=datacn + 1, start=len(self.data[datarn]))
-        )
-
-    def fix_row_values(self, datarn, start=None, end=None):
-        if datarn < len(self.data):
-            for datacn, v in enumerate(islice(self.data[datarn], start, end)):
-                if not self.input_valid_for_cell(datarn, datacn, v):
-                    self.data[datarn][datacn] = self.get_value_for_empty_cell(
-                        datarn, datacn
-                    )
-
-    def fix_data_len(self, datarn, datacn):
-        ncols = self.total_data_cols() if datacn is None else datacn + 1
-        self.data.extend(
-            [
-                self.get_empty_row_seq(rn, end=ncols, start=0)
-                for rn in range(len(self.data), datarn + 1)
-            ]
-        )
-
     # internal event use
     def click_checkbox(self, r, c, datarn=None, datacn=None, undo=True, redraw=True):
         if datarn is None:
@@ -7695,328 +7780,25 @@ class MainTable(tk.Canvas):
             for datacn in range(total_cols):
                 self.set_cell_data(datarn, datacn, value)
 
-    def format_cell(self, datarn, datacn, **kwargs):
-        if (datarn, datacn) in self.cell_options and "checkbox" in self.cell_options[
-            (datarn, datacn)
-        ]:
-            return
-        kwargs = self.format_fix_kwargs(kwargs)
-        if (datarn, datacn) not in self.cell_options:
-            self.cell_options[(datarn, datacn)] = {}
-        self.cell_options[(datarn, datacn)]["format"] = kwargs
-        self.set_cell_data(
-            datarn,
-            datacn,
-            value=kwargs["value"]
-            if "value" in kwargs
-            else self.get_cell_data(datarn, datacn),
-            kwargs=kwargs,
-        )
-
-    def format_row(self, datarn, **kwargs):
-        if datarn in self.row_options and "checkbox" in self.row_options[datarn]:
-            return
-        kwargs = self.format_fix_kwargs(kwargs)
-        if datarn not in self.row_options:
-            self.row_options[datarn] = {}
-        self.row_options[datarn]["format"] = kwargs
-        for datacn in range(self.total_data_cols()):
-            self.set_cell_data(
-                datarn,
-                datacn,
-                value=kwargs["value"]
-                if "value" in kwargs
-                else self.get_cell_data(datarn, datacn),
-                kwargs=kwargs,
-            )
-
-    def format_column(self, datacn, **kwargs):
-        if datacn in self.col_options and "checkbox" in self.col_options[datacn]:
-            return
-        kwargs = self.format_fix_kwargs(kwargs)
-        if datacn not in self.col_options:
-            self.col_options[datacn] = {}
-        self.col_options[datacn]["format"] = kwargs
-        for datarn in range(self.total_data_rows()):
-            self.set_cell_data(
-                datarn,
-                datacn,
-                value=kwargs["value"]
-                if "value" in kwargs
-                else self.get_cell_data(datarn, datacn),
-                kwargs=kwargs,
-            )
-
-    def format_sheet(self, **kwargs):
-        kwargs = self.format_fix_kwargs(kwargs)
-        self.options["format"] = kwargs
-        for datarn in range(self.total_data_rows()):
-            for datacn in range(self.total_data_cols()):
-                self.set_cell_data(
-                    datarn,
-                    datacn,
-                    value=kwargs["value"]
-                    if "value" in kwargs
-                    else self.get_cell_data(datarn, datacn),
-                    kwargs=kwargs,
-                )
-
-    def format_fix_kwargs(self, kwargs):
-        if kwargs["formatter"] is None:
-            if kwargs["nullable"]:
-                if isinstance(kwargs["datatypes"], (list, tuple)):
-                    kwargs["datatypes"] = tuple(kwargs["datatypes"]) + (type(None),)
-                else:
-                    kwargs["datatypes"] = (kwargs["datatypes"], type(None))
-            elif (
-                isinstance(kwargs["datatypes"], (list, tuple))
-                and type(None) in kwargs["datatypes"]
-            ) or kwargs["datatypes"] is type(None):
-                raise TypeError(
-                    "Non-nullable cells cannot have NoneType as a datatype."
-                )
-        if not isinstance(kwargs["invalid_value"], str):
-            kwargs["invalid_value"] = f"{kwargs['invalid_value']}"
-        return kwargs
-
-    def reapply_formatting(self):
-        if "format" in self.options:
-            for r in range(len(self.data)):
-                if r not in self.row_options:
-                    for c in range(len(self.data[r])):
-                        if not (
-                            (r, c) in self.cell_options
-                            and "format" in self.cell_options[(r, c)]
-                            or c in self.col_options
-                            and "format" in self.col_options[c]
-                        ):
-                            self.set_cell_data(r, c, value=self.data[r][c])
-        for c in self.yield_formatted_columns():
-            for r in range(len(self.data)):
-                if not (
-                    (r, c) in self.cell_options
-                    and "format" in self.cell_options[(r, c)]
-                    or r in self.row_options
-                    and "format" in self.row_options[r]
-                ):
-                    self.set_cell_data(r, c, value=self.data[r][c])
-        for r in self.yield_formatted_rows():
-            for c in range(len(self.data[r])):
-                if not (
-                    (r, c) in self.cell_options
-                    and "format" in self.cell_options[(r, c)]
-                ):
-                    self.set_cell_data(r, c, value=self.data[r][c])
-        for r, c in self.yield_formatted_cells():
-            if len(self.data) > r and len(self.data[r]) > c:
-                self.set_cell_data(r, c, value=self.data[r][c])
-
-    def delete_all_formatting(self, clear_values=False):
-        self.delete_cell_format("all", clear_values=clear_values)
-        self.delete_row_format("all", clear_values=clear_values)
-        self.delete_column_format("all", clear_values=clear_values)
-        self.delete_sheet_format(clear_values=clear_values)
-
-    def delete_cell_format(self, datarn="all", datacn=0, clear_values=False):
-        if isinstance(datarn, str) and datarn.lower() == "all":
-            for datarn, datacn in self.yield_formatted_cells():
-                del self.cell_options[(datarn, datacn)]["format"]
-                if clear_values:
-                    self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-        else:
-            if (datarn, datacn) in self.cell_options and "format" in self.cell_options[
-                (datarn, datacn)
-            ]:
-                del self.cell_options[(datarn, datacn)]["format"]
-                if clear_values:
-                    self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-
-    def delete_row_format(self, datarn="all", clear_values=False):
-        if isinstance(datarn, str) and datarn.lower() == "all":
-            for datarn in self.yield_formatted_rows():
-                del self.row_options[datarn]["format"]
-                if clear_values:
-                    for datacn in range(len(self.data[datarn])):
-                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-        else:
-            if datarn in self.row_options and "format" in self.row_options[datarn]:
-                del self.row_options[datarn]["format"]
-                if clear_values:
-                    for datacn in range(len(self.data[datarn])):
-                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-
-    def delete_column_format(self, datacn="all", clear_values=False):
-        if isinstance(datacn, str) and datacn.lower() == "all":
-            for datacn in self.yield_formatted_columns():
-                del self.col_options[datacn]["format"]
-                if clear_values:
-                    for datarn in range(len(self.data)):
-                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-        else:
-            if datacn in self.col_options and "format" in self.col_options[datacn]:
-                del self.col_options[datacn]["format"]
-                if clear_values:
-                    for datarn in range(len(self.data)):
-                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
-
-    def delete_sheet_format(self, clear_values=False):
-        if "format" in self.options:
-            del self.options["format"]
-            if clear_values:
-                total_cols = self.total_data_cols()
-                self.data = [
-                    [self.get_value_for_empty_cell(r, c) for c in range(total_cols)]
-                    for r in range(self.total_data_rows())
-                ]
-
-    # deals with possibility of formatter class being in self.data cell
-    # if cell is formatted - possibly returns invalid_value kwarg if cell value is not in datatypes kwarg
-    # if get displayed is true then Nones are replaced by ""
-    def get_valid_cell_data_as_str(
-        self, datarn, datacn, get_displayed=False, **kwargs
-    ) -> str:
-        if get_displayed:
-            kwargs = self.get_cell_kwargs(datarn, datacn, key="dropdown")
-            if kwargs and kwargs["text"] is not None:
-                return f"{kwargs['text']}"
-            kwargs = self.get_cell_kwargs(datarn, datacn, key="checkbox")
-            if kwargs:
-                return f"{kwargs['text']}"
-        value = (
-            self.data[datarn][datacn]
-            if len(self.data) > datarn and len(self.data[datarn]) > datacn
-            else ""
-        )
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
-        if kwargs:
-            if kwargs["formatter"] is None:
-                if get_displayed:
-                    return data_to_str(value, **kwargs)
-                else:
-                    return f"{get_data_with_valid_check(value, **kwargs)}"
-            else:
-                if get_displayed:
-                    return f"{value}"  # assumed given formatter class has __str__() function
-                else:
-                    return f"{value.get_data_with_valid_check()}"  # assumed given formatter class has get_data_with_valid_check() function
-        return "" if value is None else f"{value}"
-
-    def get_cell_data(
-        self, datarn, datacn, get_displayed=False, none_to_empty_str=False, **kwargs
-    ) -> Any:
-        if get_displayed:
-            return self.get_valid_cell_data_as_str(datarn, datacn, get_displayed=True)
-        value = (
-            self.data[datarn][datacn]
-            if len(self.data) > datarn and len(self.data[datarn]) > datacn
-            else ""
-        )
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
-        if kwargs and kwargs["formatter"] is not None:
-            value = value.value  # assumed given formatter class has value attribute
-        return "" if (value is None and none_to_empty_str) else value
-
-    def input_valid_for_cell(self, datarn, datacn, value):
-        if self.get_cell_kwargs(datarn, datacn, key="readonly"):
-            return False
-        if self.cell_equal_to(datarn, datacn, value):
-            return False
-        if self.get_cell_kwargs(datarn, datacn, key="format"):
-            return True
-        if self.get_cell_kwargs(datarn, datacn, key="checkbox"):
-            return is_bool_like(value)
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="dropdown")
-        if kwargs and kwargs["validate_input"] and value not in kwargs["values"]:
-            return False
-        return True
-
-    def cell_equal_to(self, datarn, datacn, value, **kwargs):
-        v = self.get_cell_data(datarn, datacn)
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
-        if kwargs and kwargs["formatter"] is None:
-            return v == format_data(value=value, **kwargs)
-        # assumed if there is a formatter class in cell then it has a __eq__() function anyway
-        # else if there is not a formatter class in cell and cell is not formatted
-        # then compare value as is
-        return v == value
-
-    def get_cell_clipboard(self, datarn, datacn) -> Union[str, int, float, bool]:
-        value = (
-            self.data[datarn][datacn]
-            if len(self.data) > datarn and len(self.data[datarn]) > datacn
-            else ""
+    def yield_dehighlight_all(self, chunk=10000):
+        # yields (options done, total options)
+        self.highlight_ranges.clear()
+        stores = (
+            self.cell_options,
+            self.row_options,
+            self.col_options,
+            self.RI.cell_options,
+            self.CH.cell_options,
         )
-        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
-        if kwargs:
-            if kwargs["formatter"] is None:
-                return get_clipboard_data(value, **kwargs)
-            else:
-                return (
-                    value.get_clipboard_data()
-                )  # assumed given formatter class has get_clipboard_data() function and it returns one of above type hints
-        return f"{value}"
-
-    def yield_formatted_cells(self, formatter=None):
-        if formatter is None:
-            yield from (
-                cell
-                for cell, options in self.cell_options.items()
-                if "format" in options and options["format"]["formatter"] == formatter
-            )
-        else:
-            yield from (
-                cell
-                for cell, options in self.cell_options.items()
-                if "format" in options
-            )
-
-    def yield_formatted_rows(self, formatter=None):
-        if formatter is None:
-            yield from (
-                r for r, options in self.row_options.items() if "format" in options
-            )
-        else:
-            yield from (
-                r
-                for r, options in self.row_options.items()
-                if "format" in options and options["format"]["formatter"] == formatter
-            )
-
-    def yield_formatted_columns(self, formatter=None):
-        if formatter is None:
-            yield from (
-                c for c, options in self.col_options.items() if "format" in options
-            )
-        else:
-            yield from (
-                c
-                for c, options in self.col_options.items()
-                if "format" in options and options["format"]["formatter"] == formatter
-            )
-
-    def get_cell_kwargs(
-        self,
-        datarn,
-        datacn,
-        key="format",
-        cell=True,
-        row=True,
-        column=True,
-        entire=True,
-    ):
-        if (
-            cell
-            and (datarn, datacn) in self.cell_options
-            and key in self.cell_options[(datarn, datacn)]
-        ):
-            return self.cell_options[(datarn, datacn)][key]
-        if row and datarn in self.row_options and key in self.row_options[datarn]:
-            return self.row_options[datarn][key]
-        if column and datacn in self.col_options and key in self.col_options[datacn]:
-            return self.col_options[datacn][key]
-        if entire and key in self.options:
-            return self.options[key]
-        return {}
+        total = sum(map(len, stores))
+        done = 0
+        for store in stores:
+            for options in store.values():
+                options.pop("highlight", None)
+                done += 1
+                if not done % chunk:
+                    yield done, total
+        yield done, total
 
     def get_space_bot(self, r, text_editor_h=None):
         if len(self.row_positions) <= 1:
@@ -8281,12 +8063,6 @@ class MainTable(tk.Canvas):
                 pass
         self.existing_dropdown_window = None
 
-    def get_displayed_col_from_datacn(self, datacn):
-        try:
-            return self.displayed_columns.index(datacn)
-        except Exception:
-            return None
-
     def delete_cell_options_dropdown(self, datarn, datacn):
         self.destroy_opened_dropdown_window()
         if (datarn, datacn) in self.cell_options and "dropdown" in self.cell_options[
@@ -8294,12 +8070,6 @@ class MainTable(tk.Canvas):
         ]:
             del self.cell_options[(datarn, datacn)]["dropdown"]
 
-    def delete_cell_options_checkbox(self, datarn, datacn):
-        if (datarn, datacn) in self.cell_options and "checkbox" in self.cell_options[
-            (datarn, datacn)
-        ]:
-            del self.cell_options[(datarn, datacn)]["checkbox"]
-
     def delete_cell_options_dropdown_and_checkbox(self, datarn, datacn):
         self.delete_cell_options_dropdown(datarn, datacn)
         self.delete_cell_options_checkbox(datarn, datacn)
@@ -8309,10 +8079,6 @@ class MainTable(tk.Canvas):
         if datarn in self.row_options and "dropdown" in self.row_options[datarn]:
             del self.row_options[datarn]["dropdown"]
 
-    def delete_row_options_checkbox(self, datarn):
-        if datarn in self.row_options and "checkbox" in self.row_options[datarn]:
-            del self.row_options[datarn]["checkbox"]
-
     def delete_row_options_dropdown_and_checkbox(self, datarn):
         self.delete_row_options_dropdown(datarn)
         self.delete_row_options_checkbox(datarn)
@@ -8322,10 +8088,6 @@ class MainTable(tk.Canvas):
         if datacn in self.col_options and "dropdown" in self.col_options[datacn]:
             del self.col_options[datacn]["dropdown"]
 
-    def delete_column_options_checkbox(self, datacn):
-        if datacn in self.col_options and "checkbox" in self.col_options[datacn]:
-            del self.col_options[datacn]["checkbox"]
-
     def delete_column_options_dropdown_and_checkbox(self, datacn):
         self.delete_column_options_dropdown(datacn)
         self.delete_column_options_checkbox(datacn)
@@ -8335,10 +8097,6 @@ class MainTable(tk.Canvas):
         if "dropdown" in self.options:
             del self.options["dropdown"]
 
-    def delete_options_checkbox(self):
-        if "checkbox" in self.options:
-            del self.options["checkbox"]
-
     def delete_options_dropdown_and_checkbox(self):
         self.delete_options_dropdown()
         self.delete_options_checkbox()
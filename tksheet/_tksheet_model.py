@@ -0,0 +1,1336 @@
+import bisect
+import heapq
+from itertools import accumulate, chain, count, islice
+from typing import Any, Union
+
+from ._tksheet_formatters import (
+    FormattedValue,
+    FormatterPipeline,
+    FormatterSpec,
+    get_clipboard_data,
+    get_data_with_valid_check,
+    is_bool_like,
+    try_to_bool,
+)
+from ._tksheet_options import (
+    CellOptionsStore,
+    CellRangeStore,
+    OffsetIndex,
+    OptionsStore,
+    SizeStore,
+    TopSizes,
+    remap_boxes,
+)
+from ._tksheet_other_classes import HighlightRule, UndoJournal
+
+__all__ = ["SheetModel"]
+
+
+class SheetModel:
+    # the data, options, formatting, undo storage and row/column positions
+    # of a sheet without any tkinter widgets, MainTable draws from its
+    # SheetModel and a SheetModel can be used on its own, e.g. to transform
+    # data in worker processes or in benchmarks without a display
+    def __init__(
+        self,
+        data=None,
+        headers=None,
+        row_index=None,
+        column_width=120,
+        row_height=22,
+        max_undos=30,
+        max_undo_bytes=None,
+        undo_compression_level=6,
+        auto_width_sample_rows=5000,
+        schedule=None,
+    ):
+        self.row_offsets = OffsetIndex()
+        self.col_offsets = OffsetIndex()
+        self.cell_options = CellOptionsStore(self.row_offsets, self.col_offsets)
+        self.highlight_ranges = CellRangeStore(self.row_offsets, self.col_offsets)
+        # widest cell text width of columns measured by auto sizing
+        self.col_text_widths = SizeStore(self.col_offsets, self.row_offsets)
+        self.col_options = OptionsStore(self.col_offsets)
+        self.row_options = OptionsStore(self.row_offsets)
+        self.index_options = OptionsStore(self.row_offsets)
+        self.header_options = OptionsStore(self.col_offsets)
+        self.options = {}
+        self.highlight_rules = []
+        self.highlight_rule_ids = count()
+        self.highlight_rule_columns = {}
+        self.highlight_rule_cache = {}
+        self.highlight_rule_cache_size = 100000
+        self.max_undos = max_undos
+        self.max_undo_bytes = max_undo_bytes
+        # schedule is used to measure and compress undo storage later, e.g.
+        # a widgets after_idle, without it entries are measured when stored
+        # and kept uncompressed
+        self.undo_storage = UndoJournal(
+            maxlen=max_undos,
+            max_bytes=max_undo_bytes,
+            compress_level=undo_compression_level,
+            schedule=schedule,
+        )
+        self.undo_enabled = False
+        self.auto_width_sample_rows = auto_width_sample_rows
+        self.data = [] if data is None else data
+        self._headers = [] if headers is None else headers
+        self._row_index = [] if row_index is None else row_index
+        self.default_column_width = column_width
+        self.default_row_height = ("pixels", row_height)
+        self.all_columns_displayed = True
+        self.all_rows_displayed = True
+        self.displayed_columns = []
+        self.displayed_rows = []
+        # inside a batch, inserting and deleting positions edits these lists
+        # of widths and heights instead, see row_positions
+        self.batch_depth = 0
+        self.pending_col_widths = None
+        self.pending_row_heights = None
+        self.reset_col_positions()
+        self.reset_row_positions()
+
+    def yield_copy_rows(self, boxes, maxrows=None, get_value=None):
+        # yields the rows of copied or cut boxes, maxrows is given for cell
+        # and column selections where the boxes are copied side by side
+        if get_value is None:
+            get_value = self.get_cell_clipboard
+        if maxrows is not None:
+            boxes = [box for box in boxes if box[2] - box[0] >= maxrows]
+            for rn in range(maxrows):
+                row = []
+                for r1, c1, r2, c2 in boxes:
+                    datarn = (
+                        (r1 + rn)
+                        if self.all_rows_displayed
+                        else self.displayed_rows[r1 + rn]
+                    )
+                    row.extend(
+                        get_value(
+                            datarn,
+                            c
+                            if self.all_columns_displayed
+                            else self.displayed_columns[c],
+                        )
+                        for c in range(c1, c2)
+                    )
+                yield row
+        else:
+            for r1, c1, r2, c2 in boxes:
+                for r in range(r1, r2):
+                    datarn = r if self.all_rows_displayed else self.displayed_rows[r]
+                    yield [
+                        get_value(
+                            datarn,
+                            c
+                            if self.all_columns_displayed
+                            else self.displayed_columns[c],
+                        )
+                        for c in range(c1, c2)
+                    ]
+
+    def align_rows(
+        self, rows=[], align="global", align_index=False
+    ):  # "center", "w", "e" or "global"
+        if isinstance(rows, str) and rows.lower() == "all" and align == "global":
+            for r in self.row_options:
+                if "align" in self.row_options[r]:
+                    del self.row_options[r]["align"]
+            if align_index:
+                for r in self.index_options:
+                    if r in self.index_options and "align" in self.index_options[r]:
+                        del self.index_options[r]["align"]
+            return
+        if isinstance(rows, int):
+            rows_ = [rows]
+        elif isinstance(rows, str) and rows.lower() == "all":
+            rows_ = (r for r in range(self.total_data_rows()))
+        else:
+            rows_ = rows
+        if align == "global":
+            for r in rows_:
+                if r in self.row_options and "align" in self.row_options[r]:
+                    del self.row_options[r]["align"]
+                if (
+                    align_index
+                    and r in self.index_options
+                    and "align" in self.index_options[r]
+                ):
+                    del self.index_options[r]["align"]
+        else:
+            for r in rows_:
+                if r not in self.row_options:
+                    self.row_options[r] = {}
+                self.row_options[r]["align"] = align
+                if align_index:
+                    if r not in self.index_options:
+                        self.index_options[r] = {}
+                    self.index_options[r]["align"] = align
+
+    def align_columns(
+        self, columns=[], align="global", align_header=False
+    ):  # "center", "w", "e" or "global"
+        if isinstance(columns, str) and columns.lower() == "all" and align == "global":
+            for c in self.col_options:
+                if "align" in self.col_options[c]:
+                    del self.col_options[c]["align"]
+            if align_header:
+                for c in self.header_options:
+                    if c in self.header_options and "align" in self.header_options[c]:
+                        del self.header_options[c]["align"]
+            return
+        if isinstance(columns, int):
+            cols_ = [columns]
+        elif isinstance(columns, str) and columns.lower() == "all":
+            cols_ = (c for c in range(self.total_data_cols()))
+        else:
+            cols_ = columns
+        if align == "global":
+            for c in cols_:
+                if c in self.col_options and "align" in self.col_options[c]:
+                    del self.col_options[c]["align"]
+                if (
+                    align_header
+                    and c in self.header_options
+                    and "align" in self.header_options[c]
+                ):
+                    del self.header_options[c]["align"]
+        else:
+            for c in cols_:
+                if c not in self.col_options:
+                    self.col_options[c] = {}
+                self.col_options[c]["align"] = align
+                if align_header:
+                    if c not in self.header_options:
+                        self.header_options[c] = {}
+                    self.header_options[c]["align"] = align
+
+    def align_cells(
+        self, row=0, column=0, cells=[], align="global"
+    ):  # "center", "w", "e" or "global"
+        if isinstance(row, str) and row.lower() == "all" and align == "global":
+            for r, c in self.cell_options:
+                if "align" in self.cell_options[(r, c)]:
+                    del self.cell_options[(r, c)]["align"]
+            return
+        if align == "global":
+            if cells:
+                for r, c in cells:
+                    if (r, c) in self.cell_options and "align" in self.cell_options[
+                        (r, c)
+                    ]:
+                        del self.cell_options[(r, c)]["align"]
+            else:
+                if (row, column) in self.cell_options and "align" in self.cell_options[
+                    (row, column)
+                ]:
+                    del self.cell_options[(row, column)]["align"]
+        else:
+            if cells:
+                for r, c in cells:
+                    if (r, c) not in self.cell_options:
+                        self.cell_options[(r, c)] = {}
+                    self.cell_options[(r, c)]["align"] = align
+            else:
+                if (row, column) not in self.cell_options:
+                    self.cell_options[(row, column)] = {}
+                self.cell_options[(row, column)]["align"] = align
+
+    def remap_row_positions(self, new_to_old, old_to_new, old_total, new_total):
+        heights = [
+            int(b - a)
+            for a, b in zip(self.row_positions, islice(self.row_positions, 1, None))
+        ]
+        default_height = self.default_row_height[1]
+        if self.all_rows_displayed:
+            heights = [
+                heights[rn] if rn is not None and rn < len(heights) else default_height
+                for rn in new_to_old
+            ] + heights[old_total:]
+        else:
+            shift = new_total - old_total
+            displayed = sorted(
+                chain(
+                    (
+                        (old_to_new[rn] if rn < old_total else rn + shift, h)
+                        for rn, h in zip(self.displayed_rows, heights)
+                        if rn >= old_total or rn in old_to_new
+                    ),
+                    (
+                        (i, default_height)
+                        for i, rn in enumerate(new_to_old)
+                        if rn is None
+                    ),
+                )
+            )
+            self.displayed_rows = [rn for rn, h in displayed]
+            heights = [h for rn, h in displayed]
+        self.row_positions = list(accumulate(chain([0], heights)))
+
+    def invalidate_col_text_widths(self, datacn=None):
+        # measured widths are dropped when cells in the column change
+        if self.col_text_widths:
+            if datacn is None:
+                self.col_text_widths.clear()
+            else:
+                self.col_text_widths.pop(datacn, None)
+
+    def mark_col_text_widths(self, datarns, datacn=None):
+        # the cells changed, they are measured again when the column width
+        # is next needed, a column with too many changed cells is dropped
+        if not self.col_text_widths:
+            return
+        if datacn is None:
+            cols = self.col_text_widths.items()
+        else:
+            sizes = self.col_text_widths.get(datacn)
+            if sizes is None:
+                return
+            cols = ((datacn, sizes),)
+        if len(datarns) > self.auto_width_sample_rows:
+            for datacn, sizes in list(cols):
+                del self.col_text_widths[datacn]
+            return
+        key = self.row_offsets.key
+        keys = [key(datarn) for datarn in datarns]
+        for datacn, sizes in cols:
+            sizes.dirty.update(keys)
+            if len(sizes.dirty) > self.auto_width_sample_rows:
+                del self.col_text_widths[datacn]
+
+    def store_col_text_widths(self, datacn, top):
+        # top is the heap from measuring every row of datacn, None if some
+        # rows were hidden
+        if top is not None:
+            self.col_text_widths[datacn] = TopSizes(top)
+
+    def get_col_width_sample(self, datacn, datarns, visible=()):
+        # the rows measured first when auto sizing a column with more than
+        # auto_width_sample_rows rows, the visible rows, rows spread evenly
+        # over the column and the rows with the longest values
+        num = self.auto_width_sample_rows
+        data = self.data
+        sample = set(visible)
+        sample.update(islice(datarns, 0, None, max(1, len(datarns) // num)))
+        sample.update(
+            heapq.nlargest(
+                max(1, num // 10),
+                datarns,
+                key=lambda datarn: len(str(data[datarn][datacn]))
+                if datarn < len(data) and datacn < len(data[datarn])
+                else 0,
+            )
+        )
+        return sample
+
+    def finish_tasks(self):
+        # structural edits complete the idle tasks of a MainTable first,
+        # a model on its own has none
+        pass
+
+    @property
+    def col_positions(self):
+        if self.pending_col_widths is not None:
+            self.col_position_list = list(
+                accumulate(chain([0], self.pending_col_widths))
+            )
+            self.pending_col_widths = None
+        return self.col_position_list
+
+    @col_positions.setter
+    def col_positions(self, positions):
+        self.pending_col_widths = None
+        self.col_position_list = positions
+
+    @property
+    def row_positions(self):
+        # during a batch, inserting and deleting rows only edits a list of
+        # row heights, the positions are worked out from it once they are
+        # read again so edits in a row do not each shift all later positions
+        if self.pending_row_heights is not None:
+            self.row_position_list = list(
+                accumulate(chain([0], self.pending_row_heights))
+            )
+            self.pending_row_heights = None
+        return self.row_position_list
+
+    @row_positions.setter
+    def row_positions(self, positions):
+        self.pending_row_heights = None
+        self.row_position_list = positions
+
+    def batch_col_widths(self):
+        # the column widths to edit during a batch, None outside of one
+        if not self.batch_depth:
+            return None
+        if self.pending_col_widths is None:
+            positions = self.col_position_list
+            self.pending_col_widths = [
+                int(b - a) for a, b in zip(positions, islice(positions, 1, None))
+            ]
+        return self.pending_col_widths
+
+    def batch_row_heights(self):
+        # the row heights to edit during a batch, None outside of one
+        if not self.batch_depth:
+            return None
+        if self.pending_row_heights is None:
+            positions = self.row_position_list
+            self.pending_row_heights = [
+                int(b - a) for a, b in zip(positions, islice(positions, 1, None))
+            ]
+        return self.pending_row_heights
+
+    def reset_col_positions(self, ncols=None):
+        colpos = int(self.default_column_width)
+        if self.all_columns_displayed:
+            self.col_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        (
+                            colpos
+                            for c in range(
+                                ncols if ncols is not None else self.total_data_cols()
+                            )
+                        ),
+                    )
+                )
+            )
+        else:
+            self.col_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        (
+                            colpos
+                            for c in range(
+                                ncols
+                                if ncols is not None
+                                else len(self.displayed_columns)
+                            )
+                        ),
+                    )
+                )
+            )
+
+    def reset_row_positions(self, nrows=None):
+        rowpos = self.default_row_height[1]
+        if self.all_rows_displayed:
+            self.row_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        (
+                            rowpos
+                            for r in range(
+                                nrows if nrows is not None else self.total_data_rows()
+                            )
+                        ),
+                    )
+                )
+            )
+        else:
+            self.row_positions = list(
+                accumulate(
+                    chain(
+                        [0],
+                        (
+                            rowpos
+                            for r in range(
+                                nrows if nrows is not None else len(self.displayed_rows)
+                            )
+                        ),
+                    )
+                )
+            )
+
+    def remap_row_options(self, new_rn):
+        # for arbitrary reorders, inserts/deletes/moves use self.row_offsets
+        cell_options = self.cell_options.items()
+        row_options = self.row_options.items()
+        index_options = self.index_options.items()
+        highlights = self.highlight_ranges.boxes()
+        rpos = self.row_offsets.pos
+        for sizes in self.col_text_widths.values():
+            sizes.remap(lambda key: new_rn(rpos(key)))
+        self.row_offsets.reset()
+        self.highlight_ranges.reset(remap_boxes(highlights, new_rn, rows=True))
+        self.cell_options.reset(
+            {
+                (nrn, cn): v
+                for nrn, cn, v in ((new_rn(rn), cn, v) for (rn, cn), v in cell_options)
+                if nrn is not None
+            }
+        )
+        self.row_options.reset(
+            {
+                nrn: v
+                for nrn, v in ((new_rn(rn), v) for rn, v in row_options)
+                if nrn is not None
+            }
+        )
+        self.index_options.reset(
+            {
+                nrn: v
+                for nrn, v in ((new_rn(rn), v) for rn, v in index_options)
+                if nrn is not None
+            }
+        )
+
+    def remap_col_options(self, new_cn):
+        # for arbitrary reorders, inserts/deletes/moves use self.col_offsets
+        cell_options = self.cell_options.items()
+        col_options = self.col_options.items()
+        header_options = self.header_options.items()
+        highlights = self.highlight_ranges.boxes()
+        col_text_widths = self.col_text_widths.items()
+        self.col_offsets.reset()
+        self.highlight_ranges.reset(remap_boxes(highlights, new_cn, rows=False))
+        self.col_text_widths.reset(
+            {
+                ncn: v
+                for ncn, v in ((new_cn(cn), v) for cn, v in col_text_widths)
+                if ncn is not None
+            }
+        )
+        self.cell_options.reset(
+            {
+                (rn, ncn): v
+                for rn, ncn, v in ((rn, new_cn(cn), v) for (rn, cn), v in cell_options)
+                if ncn is not None
+            }
+        )
+        self.col_options.reset(
+            {
+                ncn: v
+                for ncn, v in ((new_cn(cn), v) for cn, v in col_options)
+                if ncn is not None
+            }
+        )
+        self.header_options.reset(
+            {
+                ncn: v
+                for ncn, v in ((new_cn(cn), v) for cn, v in header_options)
+                if ncn is not None
+            }
+        )
+
+    def del_col_positions_from_set(self, idxs):
+        widths = self.batch_col_widths()
+        if widths:
+            widths[:] = [w for c, w in enumerate(widths) if c not in idxs]
+            return
+        self.col_positions = list(
+            accumulate(
+                chain(
+                    [0],
+                    (
+                        int(b - a)
+                        for c, (a, b) in enumerate(
+                            zip(self.col_positions, islice(self.col_positions, 1, None))
+                        )
+                        if c not in idxs
+                    ),
+                )
+            )
+        )
+
+    def del_row_positions_from_set(self, idxs):
+        heights = self.batch_row_heights()
+        if heights:
+            heights[:] = [h for r, h in enumerate(heights) if r not in idxs]
+            return
+        self.row_positions = list(
+            accumulate(
+                chain(
+                    [0],
+                    (
+                        int(b - a)
+                        for r, (a, b) in enumerate(
+                            zip(self.row_positions, islice(self.row_positions, 1, None))
+                        )
+                        if r not in idxs
+                    ),
+                )
+            )
+        )
+
+    def delete_cols_data(self, datacns, del_headers=True):
+        self.finish_tasks()
+        to_bis = sorted(datacns)
+        deleted_cols = {datacn: {} for datacn in reversed(to_bis)}
+        deleted_header_values = {}
+        for rn, row in enumerate(self.data):
+            if len(row) > to_bis[0]:
+                for datacn in islice(to_bis, 0, bisect.bisect_left(to_bis, len(row))):
+                    deleted_cols[datacn][rn] = row[datacn]
+                row[:] = [v for cn, v in enumerate(row) if cn not in datacns]
+        if del_headers and isinstance(self._headers, list):
+            for datacn in reversed(to_bis):
+                if datacn < len(self._headers):
+                    deleted_header_values[datacn] = self._headers[datacn]
+            self._headers[:] = [
+                v for cn, v in enumerate(self._headers) if cn not in datacns
+            ]
+        if self.all_columns_displayed:
+            self.del_col_positions_from_set(datacns)
+        else:
+            self.del_col_positions_from_set(
+                {
+                    c
+                    for c, datacn in enumerate(self.displayed_columns)
+                    if datacn in datacns
+                }
+            )
+            self.displayed_columns = [
+                datacn - bisect.bisect_left(to_bis, datacn)
+                for datacn in self.displayed_columns
+                if datacn not in datacns
+            ]
+        dropped = self.col_offsets.delete(datacns)
+        deleted_options = {
+            "cell_options": dict(dropped.get(id(self.cell_options), ())),
+            "col_options": dict(dropped.get(id(self.col_options), ())),
+            "CH_cell_options": dict(dropped.get(id(self.header_options), ())),
+            "highlights": dict(dropped.get(id(self.highlight_ranges), ())),
+        }
+        return deleted_cols, deleted_header_values, deleted_options
+
+    def delete_rows_data(self, datarns, del_index=True):
+        self.finish_tasks()
+        to_bis = sorted(datarns)
+        deleted_rows = [
+            (datarn, self.data[datarn])
+            for datarn in reversed(to_bis)
+            if datarn < len(self.data)
+        ]
+        deleted_index_values = []
+        self.data[:] = [row for rn, row in enumerate(self.data) if rn not in datarns]
+        if del_index and isinstance(self._row_index, list):
+            deleted_index_values = [
+                (datarn, self._row_index[datarn])
+                for datarn in reversed(to_bis)
+                if datarn < len(self._row_index)
+            ]
+            self._row_index[:] = [
+                v for rn, v in enumerate(self._row_index) if rn not in datarns
+            ]
+        if self.all_rows_displayed:
+            self.del_row_positions_from_set(datarns)
+        else:
+            self.del_row_positions_from_set(
+                {r for r, datarn in enumerate(self.displayed_rows) if datarn in datarns}
+            )
+            self.displayed_rows = [
+                datarn - bisect.bisect_left(to_bis, datarn)
+                for datarn in self.displayed_rows
+                if datarn not in datarns
+            ]
+        dropped = self.row_offsets.delete(datarns)
+        deleted_options = {
+            "cell_options": dict(dropped.get(id(self.cell_options), ())),
+            "row_options": dict(dropped.get(id(self.row_options), ())),
+            "RI_cell_options": dict(dropped.get(id(self.index_options), ())),
+            "highlights": dict(dropped.get(id(self.highlight_ranges), ())),
+        }
+        return deleted_rows, deleted_index_values, deleted_options
+
+    def move_row_position(self, idx1, idx2):
+        self.finish_tasks()
+        if not len(self.row_positions) <= 2:
+            if idx1 < idx2:
+                height = self.row_positions[idx1 + 1] - self.row_positions[idx1]
+                self.row_positions.insert(idx2 + 1, self.row_positions.pop(idx1 + 1))
+                for i in range(idx1 + 1, idx2 + 1):
+                    self.row_positions[i] -= height
+                self.row_positions[idx2 + 1] = self.row_positions[idx2] + height
+            else:
+                height = self.row_positions[idx1 + 1] - self.row_positions[idx1]
+                self.row_positions.insert(idx2 + 1, self.row_positions.pop(idx1 + 1))
+                for i in range(idx2 + 2, idx1 + 2):
+                    self.row_positions[i] += height
+                self.row_positions[idx2 + 1] = self.row_positions[idx2] + height
+
+    def move_col_position(self, idx1, idx2):
+        self.finish_tasks()
+        if not len(self.col_positions) <= 2:
+            if idx1 < idx2:
+                width = self.col_positions[idx1 + 1] - self.col_positions[idx1]
+                self.col_positions.insert(idx2 + 1, self.col_positions.pop(idx1 + 1))
+                for i in range(idx1 + 1, idx2 + 1):
+                    self.col_positions[i] -= width
+                self.col_positions[idx2 + 1] = self.col_positions[idx2] + width
+            else:
+                width = self.col_positions[idx1 + 1] - self.col_positions[idx1]
+                self.col_positions.insert(idx2 + 1, self.col_positions.pop(idx1 + 1))
+                for i in range(idx2 + 2, idx1 + 2):
+                    self.col_positions[i] += width
+                self.col_positions[idx2 + 1] = self.col_positions[idx2] + width
+
+    def total_data_cols(self, include_header=True):
+        h_total = 0
+        d_total = 0
+        if include_header:
+            if isinstance(self._headers, (list, tuple)):
+                h_total = len(self._headers)
+        try:
+            d_total = len(max(self.data, key=len))
+        except Exception:
+            pass
+        return h_total if h_total > d_total else d_total
+
+    def total_data_rows(self, include_index=True):
+        i_total = 0
+        d_total = 0
+        if include_index:
+            if isinstance(self._row_index, (list, tuple)):
+                i_total = len(self._row_index)
+        d_total = len(self.data)
+        return i_total if i_total > d_total else d_total
+
+    def data_dimensions(self, total_rows=None, total_columns=None):
+        if total_rows is None and total_columns is None:
+            return self.total_data_rows(), self.total_data_cols()
+        if total_rows is not None:
+            if len(self.data) < total_rows:
+                ncols = (
+                    self.total_data_cols() if total_columns is None else total_columns
+                )
+                self.data.extend(
+                    [
+                        self.get_empty_row_seq(r, ncols)
+                        for r in range(total_rows - len(self.data))
+                    ]
+                )
+            else:
+                self.data[total_rows:] = []
+        if total_columns is not None:
+            self.data[:] = [
+                r[:total_columns]
+                if len(r) > total_columns
+                else r
+                + self.get_empty_row_seq(rn, end=len(r) + total_columns, start=len(r))
+                for rn, r in enumerate(self.data)
+            ]
+
+    def get_visible_rows(self, y1, y2):
+        start_row = bisect.bisect_left(self.row_positions, y1)
+        end_row = bisect.bisect_right(self.row_positions, y2)
+        if not y2 >= self.row_positions[-1]:
+            end_row += 1
+        return start_row, end_row
+
+    def get_visible_columns(self, x1, x2):
+        start_col = bisect.bisect_left(self.col_positions, x1)
+        end_col = bisect.bisect_right(self.col_positions, x2)
+        if not x2 >= self.col_positions[-1]:
+            end_col += 1
+        return start_col, end_col
+
+    def get_cell_highlight(self, datarn, datacn):
+        # highlights set for ranges of cells come before any set in options
+        if self.highlight_ranges:
+            highlight = self.highlight_ranges.get(datarn, datacn)
+            if highlight is not None:
+                return highlight
+        return self.get_cell_kwargs(datarn, datacn, key="highlight")
+
+    def add_highlight_rule(
+        self, columns, predicate, bg=None, fg=None, priority=0, key_column=None
+    ):
+        if isinstance(columns, int):
+            columns = {columns}
+        elif columns is not None:
+            columns = set(columns)
+        rule = HighlightRule(
+            next(self.highlight_rule_ids),
+            columns,
+            predicate,
+            bg=bg,
+            fg=fg,
+            priority=priority,
+            key_column=key_column,
+        )
+        self.highlight_rules.append(rule)
+        # highest priority first, rules of equal priority in the order added
+        self.highlight_rules.sort(key=lambda rule: -rule.priority)
+        self.reset_highlight_rule_cache()
+        return rule.id
+
+    def delete_highlight_rule(self, rule_id=None):
+        if rule_id is None:
+            self.highlight_rules = []
+        else:
+            self.highlight_rules = [
+                rule for rule in self.highlight_rules if rule.id != rule_id
+            ]
+        self.reset_highlight_rule_cache()
+
+    def reset_highlight_rule_cache(self):
+        self.highlight_rule_columns = {}
+        self.highlight_rule_cache = {}
+
+    def get_highlight_rule_kwargs(self, datarn, datacn):
+        # results are kept per cell along with the values the rules were
+        # checked against, a cell is checked again if any of those values
+        # is no longer the same object, e.g. after it is written to
+        rules = self.highlight_rule_columns.get(datacn)
+        if rules is None:
+            rules = self.highlight_rule_columns[datacn] = [
+                rule for rule in self.highlight_rules if rule.applies_to(datacn)
+            ]
+        if not rules or datarn >= len(self.data):
+            return None
+        row = self.data[datarn]
+        cache = self.highlight_rule_cache
+        cached = cache.get((datarn, datacn))
+        if cached is not None:
+            values, kwargs = cached
+            for rule, value in zip(rules, values):
+                if rule.value(row, datacn) is not value:
+                    break
+            else:
+                return kwargs
+        values = []
+        kwargs = None
+        for rule in rules:
+            value = rule.value(row, datacn)
+            values.append(value)
+            if rule.predicate(value):
+                kwargs = rule.highlight
+                break
+        if len(cache) >= self.highlight_rule_cache_size:
+            cache.clear()
+        cache[(datarn, datacn)] = (values, kwargs)
+        return kwargs
+
+    def set_cell_data(self, datarn, datacn, value, kwargs={}, expand_sheet=True):
+        if self.col_text_widths:
+            self.mark_col_text_widths((datarn,), datacn)
+        if expand_sheet:
+            if datarn >= len(self.data):
+                self.fix_data_len(datarn, datacn)
+            elif datacn >= len(self.data[datarn]):
+                self.fix_row_len(datarn, datacn)
+        if expand_sheet or (
+            len(self.data) > datarn and len(self.data[datarn]) > datacn
+        ):
+            if (
+                datarn,
+                datacn,
+            ) in self.cell_options and "checkbox" in self.cell_options[
+                (datarn, datacn)
+            ]:
+                self.data[datarn][datacn] = try_to_bool(value)
+            else:
+                if not kwargs:
+                    kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
+                if kwargs:
+                    if kwargs["formatter"] is None:
+                        self.data[datarn][datacn] = kwargs.parse(value)
+                    else:
+                        self.data[datarn][datacn] = kwargs["formatter"](value, **kwargs)
+                else:
+                    self.data[datarn][datacn] = value
+
+    def get_value_for_empty_cell(self, datarn, datacn, r_ops=True, c_ops=True):
+        if self.get_cell_kwargs(
+            datarn,
+            datacn,
+            key="checkbox",
+            cell=r_ops and c_ops,
+            row=r_ops,
+            column=c_ops,
+        ):
+            return False
+        kwargs = self.get_cell_kwargs(
+            datarn,
+            datacn,
+            key="dropdown",
+            cell=r_ops and c_ops,
+            row=r_ops,
+            column=c_ops,
+        )
+        if kwargs and kwargs["validate_input"] and kwargs["values"]:
+            return kwargs["values"][0]
+        return ""
+
+    def get_empty_row_seq(self, datarn, end, start=0, r_ops=True, c_ops=True):
+        return [
+            self.get_value_for_empty_cell(datarn, datacn, r_ops=r_ops, c_ops=c_ops)
+            for datacn in range(start, end)
+        ]
+
+    def fix_row_len(self, datarn, datacn):
+        self.data[datarn].extend(
+            self.get_empty_row_seq(datarn, end=datacn + 1, start=len(self.data[datarn]))
+        )
+
+    def fix_row_values(self, datarn, start=None, end=None):
+        if datarn < len(self.data):
+            for datacn, v in enumerate(islice(self.data[datarn], start, end)):
+                if not self.input_valid_for_cell(datarn, datacn, v):
+                    self.data[datarn][datacn] = self.get_value_for_empty_cell(
+                        datarn, datacn
+                    )
+
+    def fix_data_len(self, datarn, datacn):
+        ncols = self.total_data_cols() if datacn is None else datacn + 1
+        self.data.extend(
+            [
+                self.get_empty_row_seq(rn, end=ncols, start=0)
+                for rn in range(len(self.data), datarn + 1)
+            ]
+        )
+
+    def format_cell(self, datarn, datacn, **kwargs):
+        if (datarn, datacn) in self.cell_options and "checkbox" in self.cell_options[
+            (datarn, datacn)
+        ]:
+            return
+        kwargs = self.format_fix_kwargs(kwargs)
+        if (datarn, datacn) not in self.cell_options:
+            self.cell_options[(datarn, datacn)] = {}
+        self.cell_options[(datarn, datacn)]["format"] = kwargs
+        self.set_cell_data(
+            datarn,
+            datacn,
+            value=kwargs["value"]
+            if "value" in kwargs
+            else self.get_cell_data(datarn, datacn),
+            kwargs=kwargs,
+        )
+
+    def format_row(self, datarn, **kwargs):
+        if datarn in self.row_options and "checkbox" in self.row_options[datarn]:
+            return
+        kwargs = self.format_fix_kwargs(kwargs)
+        if datarn not in self.row_options:
+            self.row_options[datarn] = {}
+        self.row_options[datarn]["format"] = kwargs
+        for datacn in range(self.total_data_cols()):
+            self.set_cell_data(
+                datarn,
+                datacn,
+                value=kwargs["value"]
+                if "value" in kwargs
+                else self.get_cell_data(datarn, datacn),
+                kwargs=kwargs,
+            )
+
+    def format_column(self, datacn, **kwargs):
+        if datacn in self.col_options and "checkbox" in self.col_options[datacn]:
+            return
+        kwargs = self.format_fix_kwargs(kwargs)
+        if datacn not in self.col_options:
+            self.col_options[datacn] = {}
+        self.col_options[datacn]["format"] = kwargs
+        datarns = range(self.total_data_rows())
+        self.set_column_data_many(
+            datacn,
+            datarns,
+            [kwargs["value"]] * len(datarns)
+            if "value" in kwargs
+            else self.get_column_data_many(datacn, datarns),
+            kwargs,
+        )
+
+    def format_sheet(self, **kwargs):
+        kwargs = self.format_fix_kwargs(kwargs)
+        self.options["format"] = kwargs
+        datarns = range(self.total_data_rows())
+        for datacn in range(self.total_data_cols()):
+            self.set_column_data_many(
+                datacn,
+                datarns,
+                [kwargs["value"]] * len(datarns)
+                if "value" in kwargs
+                else self.get_column_data_many(datacn, datarns),
+                kwargs,
+            )
+
+    def get_rows_with_format(self, datacn):
+        # data rows whose format in column datacn comes from cell or row options
+        rows = {
+            datarn
+            for datarn in self.cell_options.rows_in_col(datacn)
+            if "format" in self.cell_options[(datarn, datacn)]
+        }
+        rows.update(self.yield_formatted_rows())
+        return rows
+
+    def get_column_data_many(self, datacn, datarns):
+        # get_cell_data() for many rows of one column, format options
+        # are only looked up for rows which have their own
+        kwargs = self.get_cell_kwargs(None, datacn, key="format", cell=False, row=False)
+        if kwargs and kwargs["formatter"] is not None:
+            return [self.get_cell_data(datarn, datacn) for datarn in datarns]
+        own = self.get_rows_with_format(datacn)
+        data = self.data
+        return [
+            self.get_cell_data(datarn, datacn)
+            if datarn in own
+            else (
+                data[datarn][datacn]
+                if len(data) > datarn and len(data[datarn]) > datacn
+                else ""
+            )
+            for datarn in datarns
+        ]
+
+    def set_column_data_many(self, datacn, datarns, values, kwargs):
+        # set_cell_data() for many rows of one column using the same
+        # format kwargs, the values are formatted in one batch
+        self.mark_col_text_widths(datarns, datacn)
+        if kwargs["formatter"] is not None:
+            for datarn, value in zip(datarns, values):
+                self.set_cell_data(datarn, datacn, value, kwargs=kwargs)
+            return
+        checkboxes = {
+            datarn
+            for datarn in self.cell_options.rows_in_col(datacn)
+            if "checkbox" in self.cell_options[(datarn, datacn)]
+        }
+        formatted = iter(
+            kwargs.parse_many(
+                value
+                for datarn, value in zip(datarns, values)
+                if datarn not in checkboxes
+            )
+        )
+        data = self.data
+        for datarn, value in zip(datarns, values):
+            if datarn >= len(data):
+                self.fix_data_len(datarn, datacn)
+            elif datacn >= len(data[datarn]):
+                self.fix_row_len(datarn, datacn)
+            data[datarn][datacn] = (
+                try_to_bool(value) if datarn in checkboxes else next(formatted)
+            )
+
+    def format_fix_kwargs(self, kwargs):
+        if kwargs["formatter"] is None:
+            if kwargs["nullable"]:
+                if isinstance(kwargs["datatypes"], (list, tuple)):
+                    kwargs["datatypes"] = tuple(kwargs["datatypes"]) + (type(None),)
+                else:
+                    kwargs["datatypes"] = (kwargs["datatypes"], type(None))
+            elif (
+                isinstance(kwargs["datatypes"], (list, tuple))
+                and type(None) in kwargs["datatypes"]
+            ) or kwargs["datatypes"] is type(None):
+                raise TypeError(
+                    "Non-nullable cells cannot have NoneType as a datatype."
+                )
+        if not isinstance(kwargs["invalid_value"], str):
+            kwargs["invalid_value"] = f"{kwargs['invalid_value']}"
+        if kwargs["formatter"] is None:
+            return FormatterPipeline(kwargs)
+        if isinstance(kwargs["formatter"], type) and issubclass(
+            kwargs["formatter"], FormattedValue
+        ):
+            kwargs["spec"] = FormatterSpec(kwargs)
+        return kwargs
+
+    def reapply_formatting(self):
+        for _ in self.yield_reapply_formatting():
+            pass
+
+    def yield_reapply_formatting(self):
+        # yields (steps done, total steps), a step being a column or a cell
+        data = self.data
+        formatted_columns = list(self.yield_formatted_columns())
+        formatted_rows = list(self.yield_formatted_rows())
+        formatted_cells = list(self.yield_formatted_cells())
+        if "format" in self.options:
+            sheet_columns = range(max(map(len, data), default=0))
+        else:
+            sheet_columns = range(0)
+        total = (
+            len(sheet_columns)
+            + len(formatted_columns)
+            + len(formatted_rows)
+            + len(formatted_cells)
+        )
+        done = 0
+        if sheet_columns:
+            skip = set(formatted_columns)
+            for c in sheet_columns:
+                if c not in skip:
+                    own = {
+                        r
+                        for r in self.cell_options.rows_in_col(c)
+                        if "format" in self.cell_options[(r, c)]
+                    }
+                    rows = [
+                        r
+                        for r in range(len(data))
+                        if len(data[r]) > c
+                        and r not in self.row_options
+                        and r not in own
+                    ]
+                    self.set_column_data_many(
+                        c, rows, [data[r][c] for r in rows], self.options["format"]
+                    )
+                done += 1
+                yield done, total
+        for c in formatted_columns:
+            if c in self.col_options and "format" in self.col_options[c]:
+                own = self.get_rows_with_format(c)
+                rows = [
+                    r for r in range(len(data)) if len(data[r]) > c and r not in own
+                ]
+                self.set_column_data_many(
+                    c, rows, [data[r][c] for r in rows], self.col_options[c]["format"]
+                )
+            done += 1
+            yield done, total
+        for r in formatted_rows:
+            if r < len(self.data):
+                for c in range(len(self.data[r])):
+                    if not (
+                        (r, c) in self.cell_options
+                        and "format" in self.cell_options[(r, c)]
+                    ):
+                        self.set_cell_data(r, c, value=self.data[r][c])
+            done += 1
+            yield done, total
+        for r, c in formatted_cells:
+            if len(self.data) > r and len(self.data[r]) > c:
+                self.set_cell_data(r, c, value=self.data[r][c])
+            done += 1
+            yield done, total
+
+    def delete_all_formatting(self, clear_values=False):
+        self.delete_cell_format("all", clear_values=clear_values)
+        self.delete_row_format("all", clear_values=clear_values)
+        self.delete_column_format("all", clear_values=clear_values)
+        self.delete_sheet_format(clear_values=clear_values)
+
+    def delete_cell_format(self, datarn="all", datacn=0, clear_values=False):
+        if isinstance(datarn, str) and datarn.lower() == "all":
+            for datarn, datacn in self.yield_formatted_cells():
+                del self.cell_options[(datarn, datacn)]["format"]
+                if clear_values:
+                    self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+        else:
+            if (datarn, datacn) in self.cell_options and "format" in self.cell_options[
+                (datarn, datacn)
+            ]:
+                del self.cell_options[(datarn, datacn)]["format"]
+                if clear_values:
+                    self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+
+    def delete_row_format(self, datarn="all", clear_values=False):
+        if isinstance(datarn, str) and datarn.lower() == "all":
+            for datarn in self.yield_formatted_rows():
+                del self.row_options[datarn]["format"]
+                if clear_values:
+                    for datacn in range(len(self.data[datarn])):
+                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+        else:
+            if datarn in self.row_options and "format" in self.row_options[datarn]:
+                del self.row_options[datarn]["format"]
+                if clear_values:
+                    for datacn in range(len(self.data[datarn])):
+                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+
+    def delete_column_format(self, datacn="all", clear_values=False):
+        if isinstance(datacn, str) and datacn.lower() == "all":
+            for datacn in self.yield_formatted_columns():
+                del self.col_options[datacn]["format"]
+                if clear_values:
+                    for datarn in range(len(self.data)):
+                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+        else:
+            if datacn in self.col_options and "format" in self.col_options[datacn]:
+                del self.col_options[datacn]["format"]
+                if clear_values:
+                    for datarn in range(len(self.data)):
+                        self.set_cell_data(datarn, datacn, "", expand_sheet=False)
+
+    def delete_sheet_format(self, clear_values=False):
+        if "format" in self.options:
+            del self.options["format"]
+            if clear_values:
+                total_cols = self.total_data_cols()
+                self.data = [
+                    [self.get_value_for_empty_cell(r, c) for c in range(total_cols)]
+                    for r in range(self.total_data_rows())
+                ]
+
+    # deals with possibility of formatter class being in self.data cell
+    # if cell is formatted - possibly returns invalid_value kwarg if cell value is not in datatypes kwarg
+    # if get displayed is true then Nones are replaced by ""
+    def get_valid_cell_data_as_str(
+        self, datarn, datacn, get_displayed=False, **kwargs
+    ) -> str:
+        if get_displayed:
+            kwargs = self.get_cell_kwargs(datarn, datacn, key="dropdown")
+            if kwargs and kwargs["text"] is not None:
+                return f"{kwargs['text']}"
+            kwargs = self.get_cell_kwargs(datarn, datacn, key="checkbox")
+            if kwargs:
+                return f"{kwargs['text']}"
+        value = (
+            self.data[datarn][datacn]
+            if len(self.data) > datarn and len(self.data[datarn]) > datacn
+            else ""
+        )
+        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
+        if kwargs:
+            if kwargs["formatter"] is None:
+                if get_displayed:
+                    return kwargs.to_str(value)
+                else:
+                    return f"{get_data_with_valid_check(value, **kwargs)}"
+            else:
+                if get_displayed:
+                    return f"{value}"  # assumed given formatter class has __str__() function
+                else:
+                    return f"{value.get_data_with_valid_check()}"  # assumed given formatter class has get_data_with_valid_check() function
+        return "" if value is None else f"{value}"
+
+    def get_cell_data(
+        self, datarn, datacn, get_displayed=False, none_to_empty_str=False, **kwargs
+    ) -> Any:
+        if get_displayed:
+            return self.get_valid_cell_data_as_str(datarn, datacn, get_displayed=True)
+        value = (
+            self.data[datarn][datacn]
+            if len(self.data) > datarn and len(self.data[datarn]) > datacn
+            else ""
+        )
+        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
+        if kwargs and kwargs["formatter"] is not None:
+            value = value.value  # assumed given formatter class has value attribute
+        return "" if (value is None and none_to_empty_str) else value
+
+    def input_valid_for_cell(self, datarn, datacn, value):
+        if self.get_cell_kwargs(datarn, datacn, key="readonly"):
+            return False
+        if self.cell_equal_to(datarn, datacn, value):
+            return False
+        if self.get_cell_kwargs(datarn, datacn, key="format"):
+            return True
+        if self.get_cell_kwargs(datarn, datacn, key="checkbox"):
+            return is_bool_like(value)
+        kwargs = self.get_cell_kwargs(datarn, datacn, key="dropdown")
+        if kwargs and kwargs["validate_input"] and value not in kwargs["values"]:
+            return False
+        return True
+
+    def cell_equal_to(self, datarn, datacn, value, **kwargs):
+        v = self.get_cell_data(datarn, datacn)
+        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
+        if kwargs and kwargs["formatter"] is None:
+            return v == kwargs.parse(value)
+        # assumed if there is a formatter class in cell then it has a __eq__() function anyway
+        # else if there is not a formatter class in cell and cell is not formatted
+        # then compare value as is
+        return v == value
+
+    def get_cell_clipboard(self, datarn, datacn) -> Union[str, int, float, bool]:
+        value = (
+            self.data[datarn][datacn]
+            if len(self.data) > datarn and len(self.data[datarn]) > datacn
+            else ""
+        )
+        kwargs = self.get_cell_kwargs(datarn, datacn, key="format")
+        if kwargs:
+            if kwargs["formatter"] is None:
+                return get_clipboard_data(value, **kwargs)
+            else:
+                return (
+                    value.get_clipboard_data()
+                )  # assumed given formatter class has get_clipboard_data() function and it returns one of above type hints
+        return f"{value}"
+
+    def yield_formatted_cells(self, formatter=None):
+        if formatter is None:
+            yield from (
+                cell
+                for cell, options in self.cell_options.items()
+                if "format" in options and options["format"]["formatter"] == formatter
+            )
+        else:
+            yield from (
+                cell
+                for cell, options in self.cell_options.items()
+                if "format" in options
+            )
+
+    def yield_formatted_rows(self, formatter=None):
+        if formatter is None:
+            yield from (
+                r for r, options in self.row_options.items() if "format" in options
+            )
+        else:
+            yield from (
+                r
+                for r, options in self.row_options.items()
+                if "format" in options and options["format"]["formatter"] == formatter
+            )
+
+    def yield_formatted_columns(self, formatter=None):
+        if formatter is None:
+            yield from (
+                c for c, options in self.col_options.items() if "format" in options
+            )
+        else:
+            yield from (
+                c
+                for c, options in self.col_options.items()
+                if "format" in options and options["format"]["formatter"] == formatter
+            )
+
+    def get_cell_kwargs(
+        self,
+        datarn,
+        datacn,
+        key="format",
+        cell=True,
+        row=True,
+        column=True,
+        entire=True,
+    ):
+        if cell:
+            options = self.cell_options.get((datarn, datacn))
+            if options and key in options:
+                return options[key]
+        if row:
+            options = self.row_options.get(datarn)
+            if options and key in options:
+                return options[key]
+        if column:
+            options = self.col_options.get(datacn)
+            if options and key in options:
+                return options[key]
+        if entire and key in self.options:
+            return self.options[key]
+        return {}
+
+    def get_displayed_col_from_datacn(self, datacn):
+        try:
+            return self.displayed_columns.index(datacn)
+        except Exception:
+            return None
+
+    def delete_cell_options_checkbox(self, datarn, datacn):
+        if (datarn, datacn) in self.cell_options and "checkbox" in self.cell_options[
+            (datarn, datacn)
+        ]:
+            del self.cell_options[(datarn, datacn)]["checkbox"]
+
+    def delete_row_options_checkbox(self, datarn):
+        if datarn in self.row_options and "checkbox" in self.row_options[datarn]:
+            del self.row_options[datarn]["checkbox"]
+
+    def delete_column_options_checkbox(self, datacn):
+        if datacn in self.col_options and "checkbox" in self.col_options[datacn]:
+            del self.col_options[datacn]["checkbox"]
+
+    def delete_options_checkbox(self):
+        if "checkbox" in self.options:
+            del self.options["checkbox"]
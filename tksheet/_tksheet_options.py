@@ -0,0 +1,970 @@
+import bisect
+import heapq
+import operator
+from collections.abc import MutableMapping
+from itertools import islice
+from random import random
+
+__all__ = [
+    "OffsetIndex",
+    "IntervalMap",
+    "CellRangeStore",
+    "cells_to_boxes",
+    "merge_runs",
+    "remap_boxes",
+    "drop_interval",
+    "keys_in_runs",
+    "OptionsStore",
+    "TopSizes",
+    "SizeStore",
+    "CellOptionsStore",
+]
+
+
+class OffsetRun:
+    # a run of n consecutive keys starting at key, a node of the treap
+    # of an OffsetIndex, size is the number of positions in its subtree
+    __slots__ = ("key", "n", "size", "prio", "left", "right")
+
+    def __init__(self, key, n):
+        self.key = key
+        self.n = n
+        self.size = n
+        self.prio = random()
+        self.left = None
+        self.right = None
+
+    def update(self):
+        self.size = self.n
+        if self.left is not None:
+            self.size += self.left.size
+        if self.right is not None:
+            self.size += self.right.size
+
+
+def split_tree(root, pos):
+    # splits a treap into the runs before position pos and the rest, if
+    # pos is inside a run the run is shortened and its end merged into
+    # the rest as a new run, keeping both treaps heap ordered
+    node = root
+    path = []
+    p = pos
+    while node is not None:
+        ls = 0 if node.left is None else node.left.size
+        if p < ls:
+            path.append(node)
+            node = node.left
+        elif p >= ls + node.n:
+            path.append(node)
+            p -= ls + node.n
+            node = node.right
+        else:
+            if p > ls:
+                rest = OffsetRun(node.key + p - ls, node.n - p + ls)
+                for parent in path:
+                    parent.size -= rest.n
+                node.n = p - ls
+                node.update()
+                left, right = split_at_run(root, pos)
+                return left, merge_trees(rest, right)
+            break
+    return split_at_run(root, pos)
+
+
+def split_at_run(node, pos):
+    # pos is the first position of a run or the end of the treap
+    if node is None:
+        return None, None
+    ls = 0 if node.left is None else node.left.size
+    if pos <= ls:
+        a, b = split_at_run(node.left, pos)
+        node.left = b
+        node.update()
+        return a, node
+    a, b = split_at_run(node.right, pos - ls - node.n)
+    node.right = a
+    node.update()
+    return node, b
+
+
+def merge_trees(a, b):
+    # all runs of a come before those of b
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = merge_trees(a.right, b)
+        a.update()
+        return a
+    b.left = merge_trees(a, b.left)
+    b.update()
+    return b
+
+
+def join_trees(a, b):
+    # merges two treaps, joining the last run of a and the first run of b
+    # if their keys are consecutive
+    if a is None or b is None:
+        return a if b is None else b
+    last = a
+    while last.right is not None:
+        last = last.right
+    first = b
+    while first.left is not None:
+        first = first.left
+    if last.key + last.n == first.key:
+        b = drop_first_run(b)
+        node = a
+        while node is not None:
+            node.size += first.n
+            node = node.right
+        last.n += first.n
+    return merge_trees(a, b)
+
+
+def drop_first_run(node):
+    if node.left is None:
+        return node.right
+    node.left = drop_first_run(node.left)
+    node.update()
+    return node
+
+
+def drop_last_run(node):
+    if node.right is None:
+        return node.left
+    node.right = drop_last_run(node.right)
+    node.update()
+    return node
+
+
+def iter_runs(node, start=0, stop=None):
+    # yields (position, key, n) of the runs of a treap which overlap
+    # positions start up to stop, in position order
+    stack = []
+    offset = 0
+    while stack or node is not None:
+        while node is not None:
+            stack.append((node, offset))
+            if node.left is not None and start < offset + node.left.size:
+                node = node.left
+            else:
+                node = None
+        node, offset = stack.pop()
+        s = offset if node.left is None else offset + node.left.size
+        if stop is not None and s >= stop:
+            return
+        if s + node.n > start:
+            yield s, node.key, node.n
+        offset = s + node.n
+        node = node.right
+
+
+class OffsetIndex:
+    # maps row or column positions to stable keys, positions are stored
+    # as runs of consecutive keys in a treap ordered by position, each
+    # node keeping the number of positions under it, positions past the
+    # treap are one unbounded run of keys starting at tail
+    # inserting, deleting or moving positions only splits and joins runs
+    # so options stores using the keys never have to be rebuilt
+    # a lookup or an edit of one block of positions takes O(log runs),
+    # deleting k scattered positions O(k log runs)
+    def __init__(self):
+        self.root = None
+        self.tail = 0
+        self.next_key = -1
+        self.stores = []
+        self.by_key = None
+
+    def __len__(self):
+        # number of runs, including the unbounded one
+        return 1 + sum(1 for run in iter_runs(self.root))
+
+    def reset(self):
+        self.root = None
+        self.tail = 0
+        self.by_key = None
+
+    def key(self, pos):
+        if pos < 0:
+            return None
+        node = self.root
+        if node is None or pos >= node.size:
+            return self.tail + pos - (0 if node is None else node.size)
+        while True:
+            ls = 0 if node.left is None else node.left.size
+            if pos < ls:
+                node = node.left
+            elif pos < ls + node.n:
+                return node.key + pos - ls
+            else:
+                pos -= ls + node.n
+                node = node.right
+
+    def pos(self, key):
+        size = 0 if self.root is None else self.root.size
+        if key >= self.tail:
+            return size + key - self.tail
+        if self.by_key is None:
+            runs = sorted((k, s) for s, k, n in iter_runs(self.root))
+            self.by_key = ([k for k, s in runs], [s for k, s in runs])
+        keys, starts = self.by_key
+        i = bisect.bisect_right(keys, key) - 1
+        return starts[i] + key - keys[i]
+
+    def extend(self, stop):
+        # makes the treap hold positions up to stop
+        size = 0 if self.root is None else self.root.size
+        if stop > size:
+            self.root = join_trees(self.root, OffsetRun(self.tail, stop - size))
+            self.tail += stop - size
+
+    def normalize(self):
+        # gives the end of the treap back to the unbounded run
+        while self.root is not None:
+            last = self.root
+            while last.right is not None:
+                last = last.right
+            if last.key + last.n != self.tail:
+                break
+            self.root = drop_last_run(self.root)
+            self.tail = last.key
+        self.by_key = None
+
+    def new_keys(self, num):
+        self.next_key -= num
+        return [(self.next_key + 1, num)]
+
+    def cut(self, positions):
+        # removes positions, returns the removed keys as runs of
+        # (first key, number of keys) in position order
+        ranges = []
+        for p in sorted(set(positions)):
+            if ranges and ranges[-1][1] == p:
+                ranges[-1][1] = p + 1
+            else:
+                ranges.append([p, p + 1])
+        removed_keys = []
+        if not ranges:
+            return removed_keys
+        self.extend(ranges[-1][1])
+        for a, b in reversed(ranges):
+            left, rest = split_tree(self.root, a)
+            mid, right = split_tree(rest, b - a)
+            removed_keys.extend((k, n) for s, k, n in reversed(list(iter_runs(mid))))
+            self.root = join_trees(left, right)
+        removed_keys.reverse()
+        self.normalize()
+        return removed_keys
+
+    def put(self, pos, key_runs):
+        self.extend(pos)
+        mid = None
+        for k, n in key_runs:
+            mid = join_trees(mid, OffsetRun(k, n))
+        left, right = split_tree(self.root, pos)
+        self.root = join_trees(join_trees(left, mid), right)
+        self.normalize()
+
+    def insert(self, pos, num):
+        if num > 0:
+            self.put(pos, self.new_keys(num))
+
+    def insert_many(self, positions):
+        # positions are where the inserted items will be after the insert
+        runs = []
+        for p in sorted(positions):
+            if runs and runs[-1][0] + runs[-1][1] == p:
+                runs[-1][1] += 1
+            else:
+                runs.append([p, 1])
+        for p, num in runs:
+            self.insert(p, num)
+
+    def delete(self, positions):
+        # returns {id(store): [(position, options), ...]} of the options
+        # that were dropped, positions being from before the delete
+        positions = sorted(set(positions))
+        removed_keys = self.cut(positions)
+        dropped = {}
+        if removed_keys:
+            old_pos = dict(
+                zip(
+                    (
+                        key
+                        for first, num in removed_keys
+                        for key in range(first, first + num)
+                    ),
+                    positions,
+                )
+            )
+            for store in self.stores:
+                dropped[id(store)] = store.drop_keys(self, removed_keys, old_pos)
+        return dropped
+
+    def move(self, start, num, moveto):
+        # moveto is the position of the first moved item after the move
+        if num > 0 and start != moveto:
+            self.put(moveto, self.cut(range(start, start + num)))
+
+    def key_runs(self, start, stop):
+        # keys of positions start up to stop as [(first key, last key + 1), ...]
+        if start >= stop:
+            return []
+        size = 0 if self.root is None else self.root.size
+        runs = []
+        if start < size:
+            for s, k, n in iter_runs(self.root, start, stop):
+                a = start if start > s else s
+                b = stop if stop < s + n else s + n
+                runs.append((k + a - s, k + b - s))
+        if stop > size:
+            a = start if start > size else size
+            runs.append((self.tail + a - size, self.tail + stop - size))
+        return runs
+
+    def position_runs(self, first, stop):
+        # positions of keys first up to stop as [(first position, last + 1), ...]
+        runs = []
+        size = 0
+        for s, k, n in iter_runs(self.root):
+            a = first if first > k else k
+            b = stop if stop < k + n else k + n
+            if a < b:
+                runs.append((s + a - k, s + b - k))
+            size = s + n
+        a = first if first > self.tail else self.tail
+        if a < stop:
+            runs.append((size + a - self.tail, size + stop - self.tail))
+        return sorted(runs)
+
+
+class IntervalMap:
+    # {key: value} stored as sorted runs, values[i] is the value of keys
+    # starts[i] up to starts[i + 1], None meaning no value
+    # the last run is unbounded and always None
+    __slots__ = ("starts", "values")
+
+    def __init__(self):
+        self.starts = []
+        self.values = []
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, IntervalMap)
+            and self.starts == other.starts
+            and self.values == other.values
+        )
+
+    def copy(self):
+        new = IntervalMap()
+        new.starts = self.starts[:]
+        new.values = self.values[:]
+        return new
+
+    def get(self, key):
+        i = bisect.bisect_right(self.starts, key) - 1
+        return None if i < 0 else self.values[i]
+
+    def split(self, key):
+        i = bisect.bisect_left(self.starts, key)
+        if i == len(self.starts) or self.starts[i] != key:
+            self.starts.insert(i, key)
+            self.values.insert(i, self.values[i - 1] if i else None)
+        return i
+
+    def update(self, first, stop, func):
+        # the values of keys first up to stop become func(value)
+        if first >= stop:
+            return
+        i = self.split(first)
+        j = self.split(stop)
+        self.values[i:j] = [func(v) for v in islice(self.values, i, j)]
+        self.merge(i - 1 if i else 0, j + 1)
+
+    def update_runs(self, runs, func):
+        # update() for many sorted, non overlapping (first, stop) runs in
+        # one pass over the runs and the existing starts
+        if not runs:
+            return
+        if len(runs) == 1:
+            self.update(*runs[0], func)
+            return
+        if not self.starts:
+            v = func(None)
+            if v is not None:
+                self.starts = [k for run in runs for k in run]
+                self.values = [v, None] * len(runs)
+            return
+        old_starts = self.starts
+        old_values = self.values
+        starts = []
+        values = []
+        prev = None
+        cur = None
+        i = 0
+        j = 0
+        for b in sorted(set(old_starts).union(k for run in runs for k in run)):
+            while i < len(old_starts) and old_starts[i] <= b:
+                cur = old_values[i]
+                i += 1
+            while j < len(runs) and runs[j][1] <= b:
+                j += 1
+            v = func(cur) if j < len(runs) and runs[j][0] <= b else cur
+            if v != prev:
+                starts.append(b)
+                values.append(v)
+                prev = v
+        self.starts = starts
+        self.values = values
+
+    def map(self, func):
+        # func(value) for every run with a value
+        self.values = [None if v is None else func(v) for v in self.values]
+        self.merge(0, len(self.starts))
+
+    def merge(self, lo, hi):
+        # joins runs lo up to hi which have the same value as the run before
+        starts = []
+        values = []
+        prev = self.values[lo - 1] if lo else None
+        for s, v in zip(islice(self.starts, lo, hi), islice(self.values, lo, hi)):
+            if v != prev:
+                starts.append(s)
+                values.append(v)
+                prev = v
+        self.starts[lo:hi] = starts
+        self.values[lo:hi] = values
+
+    def items(self, first=None, stop=None):
+        # (first key, last key + 1, value) for runs with a value, cut to
+        # keys first up to stop
+        for i, v in enumerate(self.values):
+            if v is None:
+                continue
+            a = self.starts[i]
+            b = self.starts[i + 1]
+            if first is not None:
+                if b <= first:
+                    continue
+                if a < first:
+                    a = first
+            if stop is not None:
+                if a >= stop:
+                    break
+                if b > stop:
+                    b = stop
+            yield a, b, v
+
+
+class CellRangeStore:
+    # {(row position, column position): value} held as rectangles of cells
+    # by row and column keys, so getting a value, setting or removing a
+    # rectangle are bisects and follow inserted, deleted and moved
+    # rows/columns like the options stores
+    def __init__(self, row_index, col_index):
+        self.row_index = row_index
+        self.col_index = col_index
+        self.row_index.stores.append(self)
+        self.col_index.stores.append(self)
+        self.rows = IntervalMap()
+
+    def __bool__(self):
+        return bool(self.rows)
+
+    def get(self, r, c, default=None):
+        if not self.rows:
+            return default
+        cols = self.rows.get(self.row_index.key(r))
+        if cols is None:
+            return default
+        value = cols.get(self.col_index.key(c))
+        return default if value is None else value
+
+    def update_box(self, r1, c1, r2, c2, func):
+        # cells from (r1, c1) up to (r2, c2) get the value func(value),
+        # value being None for cells without a value
+        self.update_boxes(((r1, c1, r2, c2),), func)
+
+    def update_boxes(self, boxes, func):
+        # update_box() for many boxes in one sweep over the row keys, cells
+        # in more than one box get func(value) once
+        by_rows = {}
+        col_runs = {}
+        for r1, c1, r2, c2 in boxes:
+            if (c1, c2) not in col_runs:
+                col_runs[(c1, c2)] = self.col_index.key_runs(c1, c2)
+            if (r1, r2) in by_rows:
+                by_rows[(r1, r2)].extend(col_runs[(c1, c2)])
+            else:
+                by_rows[(r1, r2)] = col_runs[(c1, c2)][:]
+        spans = []
+        for (r1, r2), cruns in by_rows.items():
+            if cruns:
+                cruns = merge_runs(cruns) if len(cruns) > 1 else cruns
+                spans.extend((a, b, cruns) for a, b in self.row_index.key_runs(r1, r2))
+        if not spans:
+            return
+        spans.sort(key=operator.itemgetter(0))
+        rows = self.rows
+        bounds = set(rows.starts)
+        for a, b, cruns in spans:
+            bounds.add(a)
+            bounds.add(b)
+        starts = []
+        values = []
+        prev = None
+        cur = None
+        active = []
+        union = None
+        i = 0
+        j = 0
+        for b in sorted(bounds):
+            while i < len(rows.starts) and rows.starts[i] <= b:
+                cur = rows.values[i]
+                i += 1
+            if active and active[0][0] <= b:
+                while active and active[0][0] <= b:
+                    heapq.heappop(active)
+                union = None
+            if j < len(spans) and spans[j][0] <= b:
+                while j < len(spans) and spans[j][0] <= b:
+                    heapq.heappush(active, (spans[j][1], j, spans[j][2]))
+                    j += 1
+                union = None
+            if active:
+                if union is None:
+                    union = (
+                        active[0][2]
+                        if len(active) == 1
+                        else merge_runs(run for span in active for run in span[2])
+                    )
+                cols = IntervalMap() if cur is None else cur.copy()
+                cols.update_runs(union, func)
+                v = cols if cols else None
+            else:
+                v = cur
+            if v != prev:
+                starts.append(b)
+                values.append(v)
+                prev = v
+        rows.starts = starts
+        rows.values = values
+
+    def set_box(self, r1, c1, r2, c2, value):
+        self.update_box(r1, c1, r2, c2, lambda v: value)
+
+    def delete_box(self, r1, c1, r2, c2):
+        self.update_box(r1, c1, r2, c2, lambda v: None)
+
+    def delete_boxes(self, boxes):
+        self.update_boxes(boxes, lambda v: None)
+
+    def update(self, boxes):
+        # {(r1, c1, r2, c2): value}, boxes with the same value are set together
+        by_value = {}
+        for box, value in boxes.items():
+            by_value.setdefault(value, []).append(box)
+        for value, value_boxes in by_value.items():
+            self.update_boxes(value_boxes, lambda v, value=value: value)
+
+    def clear(self):
+        self.rows = IntervalMap()
+
+    def boxes(self):
+        # {(from row, from column, up to row, up to column): value}
+        boxes = {}
+        row_runs = self.row_index.position_runs
+        col_runs = self.col_index.position_runs
+        for ra, rb, cols in self.rows.items():
+            rruns = row_runs(ra, rb)
+            for ca, cb, value in cols.items():
+                for c1, c2 in col_runs(ca, cb):
+                    for r1, r2 in rruns:
+                        boxes[(r1, c1, r2, c2)] = value
+        return boxes
+
+    def reset(self, boxes=None):
+        self.clear()
+        if boxes:
+            self.update(boxes)
+
+    def drop_keys(self, index, key_runs, old_pos):
+        # returns the boxes of the removed rows/columns by their old positions
+        dropped = []
+        for first, num in key_runs:
+            stop = first + num
+            p = old_pos[first] - first
+            if index is self.row_index:
+                for ra, rb, cols in self.rows.items(first, stop):
+                    for ca, cb, value in cols.items():
+                        for c1, c2 in self.col_index.position_runs(ca, cb):
+                            dropped.append(((ra + p, c1, rb + p, c2), value))
+                self.rows.update(first, stop, lambda cols: None)
+            else:
+                for ra, rb, cols in self.rows.items():
+                    for ca, cb, value in cols.items(first, stop):
+                        for r1, r2 in self.row_index.position_runs(ra, rb):
+                            dropped.append(((r1, ca + p, r2, cb + p), value))
+                self.rows.map(lambda cols: drop_interval(cols, first, stop))
+        return dropped
+
+
+def cells_to_boxes(cells):
+    # (row, column) cells as boxes of consecutive columns in each row,
+    # consecutive rows with the same columns share their boxes
+    rows = {}
+    for r, c in cells:
+        if r in rows:
+            rows[r].append(c)
+        else:
+            rows[r] = [c]
+    boxes = []
+    prev_r = None
+    prev_runs = None
+    prev_boxes = []
+    for r in sorted(rows):
+        runs = merge_runs((c, c + 1) for c in rows[r])
+        if prev_r == r - 1 and runs == prev_runs:
+            for box in prev_boxes:
+                box[2] = r + 1
+        else:
+            prev_boxes = [[r, c1, r + 1, c2] for c1, c2 in runs]
+            boxes.extend(prev_boxes)
+            prev_runs = runs
+        prev_r = r
+    return boxes
+
+
+def merge_runs(runs):
+    # (first, stop) runs as sorted runs with overlapping and adjacent runs joined
+    merged = []
+    for a, b in sorted(runs):
+        if merged and a <= merged[-1][1]:
+            if b > merged[-1][1]:
+                merged[-1] = (merged[-1][0], b)
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def remap_boxes(boxes, new_pos, rows=True):
+    # for arbitrary reorders of rows (or columns), new_pos returns the new
+    # position of a row or None if it was removed
+    remapped = {}
+    for (r1, c1, r2, c2), value in boxes.items():
+        runs = []
+        for n in sorted(
+            n
+            for n in map(new_pos, range(r1, r2) if rows else range(c1, c2))
+            if n is not None
+        ):
+            if runs and runs[-1][1] == n:
+                runs[-1][1] = n + 1
+            else:
+                runs.append([n, n + 1])
+        for a, b in runs:
+            remapped[(a, c1, b, c2) if rows else (r1, a, r2, b)] = value
+    return remapped
+
+
+def drop_interval(intervals, first, stop):
+    intervals = intervals.copy()
+    intervals.update(first, stop, lambda v: None)
+    return intervals if intervals else None
+
+
+def keys_in_runs(dct, key_runs):
+    if sum(n for k, n in key_runs) <= len(dct):
+        return [
+            key
+            for first, num in key_runs
+            for key in range(first, first + num)
+            if key in dct
+        ]
+    runs = sorted(key_runs)
+    firsts = [k for k, n in runs]
+    found = []
+    for key in dct:
+        i = bisect.bisect_right(firsts, key) - 1
+        if i >= 0 and key < runs[i][0] + runs[i][1]:
+            found.append(key)
+    return found
+
+
+class OptionsStore(MutableMapping):
+    # dict-like {position: options}, for row or column options
+    def __init__(self, index, options=None):
+        self.index = index
+        self.index.stores.append(self)
+        self.options = {}
+        if options:
+            self.update(options)
+
+    def __getitem__(self, pos):
+        return self.options[self.index.key(pos)]
+
+    def __setitem__(self, pos, value):
+        key = self.index.key(pos)
+        if key is None:
+            raise KeyError(pos)
+        self.options[key] = value
+
+    def __delitem__(self, pos):
+        del self.options[self.index.key(pos)]
+
+    def __contains__(self, pos):
+        if not self.options:
+            return False
+        try:
+            return self.index.key(pos) in self.options
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        pos = self.index.pos
+        return (pos(key) for key in self.options)
+
+    def __len__(self):
+        return len(self.options)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, pos, default=None):
+        # no key lookup for the many stores which are usually empty
+        if not self.options:
+            return default
+        try:
+            return self.options.get(self.index.key(pos), default)
+        except TypeError:
+            return default
+
+    def items(self):
+        pos = self.index.pos
+        return [(pos(key), v) for key, v in self.options.items()]
+
+    def values(self):
+        return list(self.options.values())
+
+    def clear(self):
+        self.options.clear()
+
+    def reset(self, options=None):
+        self.options.clear()
+        if options:
+            self.update(options)
+
+    def drop_keys(self, index, key_runs, old_pos):
+        return [
+            (old_pos[key], self.options.pop(key))
+            for key in keys_in_runs(self.options, key_runs)
+        ]
+
+
+class TopSizes:
+    # the k largest measured sizes of the cells of a row or column by the
+    # keys of the other axis, every other cell is at most floor
+    # dirty keys are cells that changed and are measured again when the
+    # largest size is next needed
+    __slots__ = ("k", "sizes", "floor", "dirty")
+
+    def __init__(self, sizes=(), k=32):
+        # sizes is an iterable of (size, key) of every non empty cell
+        top = heapq.nlargest(k + 1, sizes)
+        self.k = k
+        self.sizes = {key: size for size, key in top[:k]}
+        self.floor = top[k][0] if len(top) > k else 0
+        self.dirty = set()
+
+    @staticmethod
+    def push(top, size, key, k=32):
+        # keeps the heap top to the k + 1 largest (size, key) for __init__
+        if len(top) <= k:
+            heapq.heappush(top, (size, key))
+        elif size > top[0][0]:
+            heapq.heapreplace(top, (size, key))
+
+    def set(self, key, size):
+        sizes = self.sizes
+        if key in sizes or size > self.floor:
+            sizes[key] = size
+            if len(sizes) > self.k:
+                smallest = min(sizes, key=sizes.__getitem__)
+                size = sizes.pop(smallest)
+                if size > self.floor:
+                    self.floor = size
+
+    def discard_runs(self, key_runs):
+        for key in keys_in_runs(self.sizes, key_runs):
+            del self.sizes[key]
+        if self.dirty:
+            self.dirty.difference_update(keys_in_runs(self.dirty, key_runs))
+
+    def remap(self, new_key):
+        # new_key returns the new key of a key or None if its cell is gone
+        self.sizes = {
+            nkey: size
+            for nkey, size in ((new_key(key), size) for key, size in self.sizes.items())
+            if nkey is not None
+        }
+        if self.dirty:
+            self.dirty = {nkey for nkey in map(new_key, self.dirty) if nkey is not None}
+
+    def largest(self):
+        # None if only measuring every cell again would tell
+        largest = max(self.sizes.values()) if self.sizes else 0
+        if largest >= self.floor:
+            return largest
+
+
+class SizeStore(OptionsStore):
+    # {position: TopSizes} for rows or columns, the sizes of cells in
+    # deleted positions of the other axis are discarded
+    def __init__(self, index, other_index):
+        super().__init__(index)
+        self.other_index = other_index
+        other_index.stores.append(self)
+
+    def drop_keys(self, index, key_runs, old_pos):
+        if index is self.index:
+            return super().drop_keys(index, key_runs, old_pos)
+        for sizes in self.options.values():
+            sizes.discard_runs(key_runs)
+        return []
+
+
+class CellOptionsStore(MutableMapping):
+    # dict-like {(row position, column position): options}
+    def __init__(self, row_index, col_index, options=None):
+        self.row_index = row_index
+        self.col_index = col_index
+        self.row_index.stores.append(self)
+        self.col_index.stores.append(self)
+        self.rows = {}
+        self.cols = {}
+        self.total = 0
+        if options:
+            self.update(options)
+
+    def __getitem__(self, cell):
+        return self.rows[self.row_index.key(cell[0])][self.col_index.key(cell[1])]
+
+    def __setitem__(self, cell, value):
+        rkey = self.row_index.key(cell[0])
+        ckey = self.col_index.key(cell[1])
+        if rkey is None or ckey is None:
+            raise KeyError(cell)
+        if rkey not in self.rows:
+            self.rows[rkey] = {}
+        row = self.rows[rkey]
+        if ckey not in row:
+            self.total += 1
+            if ckey not in self.cols:
+                self.cols[ckey] = set()
+            self.cols[ckey].add(rkey)
+        row[ckey] = value
+
+    def __delitem__(self, cell):
+        rkey = self.row_index.key(cell[0])
+        ckey = self.col_index.key(cell[1])
+        row = self.rows[rkey]
+        del row[ckey]
+        if not row:
+            del self.rows[rkey]
+        self.cols[ckey].discard(rkey)
+        if not self.cols[ckey]:
+            del self.cols[ckey]
+        self.total -= 1
+
+    def __contains__(self, cell):
+        if not self.rows:
+            return False
+        try:
+            row = self.rows.get(self.row_index.key(cell[0]))
+            return row is not None and self.col_index.key(cell[1]) in row
+        except (TypeError, IndexError):
+            return False
+
+    def __iter__(self):
+        rpos = self.row_index.pos
+        cpos = self.col_index.pos
+        for rkey, row in self.rows.items():
+            r = rpos(rkey)
+            for ckey in row:
+                yield (r, cpos(ckey))
+
+    def __len__(self):
+        return self.total
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, cell, default=None):
+        if not self.rows:
+            return default
+        try:
+            row = self.rows.get(self.row_index.key(cell[0]))
+            if row is None:
+                return default
+            return row.get(self.col_index.key(cell[1]), default)
+        except (TypeError, IndexError):
+            return default
+
+    def items(self):
+        rpos = self.row_index.pos
+        cpos = self.col_index.pos
+        return [
+            ((r, cpos(ckey)), v)
+            for r, row in ((rpos(rkey), row) for rkey, row in self.rows.items())
+            for ckey, v in row.items()
+        ]
+
+    def values(self):
+        return [v for row in self.rows.values() for v in row.values()]
+
+    def clear(self):
+        self.rows.clear()
+        self.cols.clear()
+        self.total = 0
+
+    def reset(self, options=None):
+        self.clear()
+        if options:
+            self.update(options)
+
+    def rows_in_col(self, c):
+        # row positions which have options in column position c
+        rkeys = self.cols.get(self.col_index.key(c))
+        if not rkeys:
+            return []
+        rpos = self.row_index.pos
+        return [rpos(rkey) for rkey in rkeys]
+
+    def drop_keys(self, index, key_runs, old_pos):
+        dropped = []
+        if index is self.row_index:
+            cpos = self.col_index.pos
+            for rkey in keys_in_runs(self.rows, key_runs):
+                row = self.rows.pop(rkey)
+                r = old_pos[rkey]
+                for ckey, v in row.items():
+                    self.cols[ckey].discard(rkey)
+                    if not self.cols[ckey]:
+                        del self.cols[ckey]
+                    dropped.append(((r, cpos(ckey)), v))
+        else:
+            rpos = self.row_index.pos
+            for ckey in keys_in_runs(self.cols, key_runs):
+                c = old_pos[ckey]
+                for rkey in self.cols.pop(ckey):
+                    row = self.rows[rkey]
+                    dropped.append(((rpos(rkey), c), row.pop(ckey)))
+                    if not row:
+                        del self.rows[rkey]
+        self.total -= len(dropped)
+        return dropped
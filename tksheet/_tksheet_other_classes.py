@@ -1,9 +1,49 @@
 import bisect
+import csv
+import operator
+import pickle
+import sys
 import tkinter as tk
-from collections import namedtuple
+import zlib
+from collections import defaultdict, deque, namedtuple
 from itertools import islice
+from threading import Lock, get_ident
+from time import perf_counter
 
-from ._tksheet_vars import *
+from ._tksheet_vars import ctrl_key, get_font, rc_binding
+
+__all__ = [
+    "CurrentlySelectedClass",
+    "CtrlKeyEvent",
+    "PasteEvent",
+    "UndoEvent",
+    "SheetEvent",
+    "SelectCellEvent",
+    "SelectColumnEvent",
+    "SelectRowEvent",
+    "DeselectionEvent",
+    "SelectionBoxEvent",
+    "InsertEvent",
+    "DeleteRowColumnEvent",
+    "EditCellEvent",
+    "EditHeaderEvent",
+    "EditIndexEvent",
+    "BeginDragDropEvent",
+    "EndDragDropEvent",
+    "ResizeEvent",
+    "DropDownModifiedEvent",
+    "RangeSet",
+    "BoxSet",
+    "MovedRanges",
+    "TextEditor_",
+    "TextEditor",
+    "dropdown_search_function",
+    "get_dropdown_kwargs",
+    "get_dropdown_dict",
+    "get_checkbox_kwargs",
+    "get_checkbox_dict",
+    "num2alpha",
+]
 
 CurrentlySelectedClass = namedtuple("CurrentlySelectedClass", "row column type_")
 CtrlKeyEvent = namedtuple(
@@ -11,6 +51,7 @@ CtrlKeyEvent = namedtuple(
 )
 PasteEvent = namedtuple("PasteEvent", "eventname currentlyselected rows")
 UndoEvent = namedtuple("UndoEvent", "eventname type storeddata")
+SheetEvent = namedtuple("SheetEvent", "data widget")
 SelectCellEvent = namedtuple("SelectCellEvent", "eventname row column")
 SelectColumnEvent = namedtuple("SelectColumnEvent", "eventname column")
 SelectRowEvent = namedtuple("SelectRowEvent", "eventname row")
@@ -81,82 +122,93 @@ class TextEditor_(tk.Text):
             self.insert(1.0, text)
             self.yview_moveto(1)
         self.tag_add("align", 1.0, "end")
+        self.popup_menu_font = popup_menu_font
+        self.popup_menu_bg = popup_menu_bg
+        self.popup_menu_fg = popup_menu_fg
+        self.popup_menu_highlight_bg = popup_menu_highlight_bg
+        self.popup_menu_highlight_fg = popup_menu_highlight_fg
+        # the menu is built on the first right click
+        self.rc_popup_menu = None
+        self.bind("<1>", lambda event: self.focus_set())
+        self.bind(rc_binding, self.rc)
+        self._orig = self._w + "_orig"
+        self.tk.call("rename", self._w, self._orig)
+        self.tk.createcommand(self._w, self._proxy)
+
+    def _proxy(self, command, *args):
+        cmd = (self._orig, command) + args
+        try:
+            result = self.tk.call(cmd)
+        except Exception:
+            return
+        if command in ("insert", "delete", "replace"):
+            self.tag_add("align", 1.0, "end")
+            self.event_generate("<<TextModified>>")
+            if args and len(args) > 1 and args[1] != "\n":
+                out_of_bounds = self.yview()
+                if out_of_bounds != (0.0, 1.0) and self.newline_bindng is not None:
+                    self.newline_bindng(
+                        r=self.parent.r, c=self.parent.c, check_lines=False
+                    )
+        return result
+
+    def create_rc_menu(self):
         self.rc_popup_menu = tk.Menu(self, tearoff=0)
         self.rc_popup_menu.add_command(
             label="Select all",
             accelerator="Ctrl+A",
-            font=popup_menu_font,
-            foreground=popup_menu_fg,
-            background=popup_menu_bg,
-            activebackground=popup_menu_highlight_bg,
-            activeforeground=popup_menu_highlight_fg,
+            font=self.popup_menu_font,
+            foreground=self.popup_menu_fg,
+            background=self.popup_menu_bg,
+            activebackground=self.popup_menu_highlight_bg,
+            activeforeground=self.popup_menu_highlight_fg,
             command=self.select_all,
         )
         self.rc_popup_menu.add_command(
             label="Cut",
             accelerator="Ctrl+X",
-            font=popup_menu_font,
-            foreground=popup_menu_fg,
-            background=popup_menu_bg,
-            activebackground=popup_menu_highlight_bg,
-            activeforeground=popup_menu_highlight_fg,
+            font=self.popup_menu_font,
+            foreground=self.popup_menu_fg,
+            background=self.popup_menu_bg,
+            activebackground=self.popup_menu_highlight_bg,
+            activeforeground=self.popup_menu_highlight_fg,
             command=self.cut,
         )
         self.rc_popup_menu.add_command(
             label="Copy",
             accelerator="Ctrl+C",
-            font=popup_menu_font,
-            foreground=popup_menu_fg,
-            background=popup_menu_bg,
-            activebackground=popup_menu_highlight_bg,
-            activeforeground=popup_menu_highlight_fg,
+            font=self.popup_menu_font,
+            foreground=self.popup_menu_fg,
+            background=self.popup_menu_bg,
+            activebackground=self.popup_menu_highlight_bg,
+            activeforeground=self.popup_menu_highlight_fg,
             command=self.copy,
         )
         self.rc_popup_menu.add_command(
             label="Paste",
             accelerator="Ctrl+V",
-            font=popup_menu_font,
-            foreground=popup_menu_fg,
-            background=popup_menu_bg,
-            activebackground=popup_menu_highlight_bg,
-            activeforeground=popup_menu_highlight_fg,
+            font=self.popup_menu_font,
+            foreground=self.popup_menu_fg,
+            background=self.popup_menu_bg,
+            activebackground=self.popup_menu_highlight_bg,
+            activeforeground=self.popup_menu_highlight_fg,
             command=self.paste,
         )
         self.rc_popup_menu.add_command(
             label="Undo",
             accelerator="Ctrl+Z",
-            font=popup_menu_font,
-            foreground=popup_menu_fg,
-            background=popup_menu_bg,
-            activebackground=popup_menu_highlight_bg,
-            activeforeground=popup_menu_highlight_fg,
+            font=self.popup_menu_font,
+            foreground=self.popup_menu_fg,
+            background=self.popup_menu_bg,
+            activebackground=self.popup_menu_highlight_bg,
+            activeforeground=self.popup_menu_highlight_fg,
             command=self.undo,
         )
-        self.bind("<1>", lambda event: self.focus_set())
-        self.bind(rc_binding, self.rc)
-        self._orig = self._w + "_orig"
-        self.tk.call("rename", self._w, self._orig)
-        self.tk.createcommand(self._w, self._proxy)
-
-    def _proxy(self, command, *args):
-        cmd = (self._orig, command) + args
-        try:
-            result = self.tk.call(cmd)
-        except Exception:
-            return
-        if command in ("insert", "delete", "replace"):
-            self.tag_add("align", 1.0, "end")
-            self.event_generate("<<TextModified>>")
-            if args and len(args) > 1 and args[1] != "\n":
-                out_of_bounds = self.yview()
-                if out_of_bounds != (0.0, 1.0) and self.newline_bindng is not None:
-                    self.newline_bindng(
-                        r=self.parent.r, c=self.parent.c, check_lines=False
-                    )
-        return result
 
     def rc(self, event):
         self.focus_set()
+        if self.rc_popup_menu is None:
+            self.create_rc_menu()
         self.rc_popup_menu.tk_popup(event.x_root, event.y_root)
 
     def select_all(self, event=None):
@@ -370,6 +422,78 @@ def get_n2a(n=0, _type="numbers"):
         return f"{num2alpha(n)} {n + 1}"
 
 
+class DefaultLabels:
+    # default index or header labels by row or column number, each label in
+    # view is only built once while scrolling
+    __slots__ = ("type", "labels", "max_labels")
+
+    def __init__(self, max_labels=10000):
+        self.type = None
+        self.labels = {}
+        self.max_labels = max_labels
+
+    def get(self, n, _type):
+        if _type != self.type:
+            self.type = _type
+            self.labels = {}
+        try:
+            return self.labels[n]
+        except KeyError:
+            if len(self.labels) >= self.max_labels:
+                self.labels = {}
+            label = self.labels[n] = get_n2a(n, _type)
+            return label
+
+
+class TextMeasure:
+    # one hidden canvas measures text for every sheet of a Tk root, sizes of
+    # the fixed strings used for font metrics are kept per font
+    def __init__(self, root):
+        self.root = root
+        self.txt_canvas = None
+        self.txt = None
+        self.font_sizes = {}
+
+    @classmethod
+    def get(cls, widget):
+        root = widget._root()
+        text_measure = getattr(root, "tksheet_text_measure", None)
+        if text_measure is None:
+            text_measure = root.tksheet_text_measure = cls(root)
+        return text_measure
+
+    def build(self):
+        # the canvas is built on first use and again if it has been destroyed
+        if (
+            self.txt_canvas is None
+            or self.root.children.get(self.txt_canvas._name) is not self.txt_canvas
+        ):
+            self.txt_canvas = tk.Canvas(self.root)
+            self.txt = self.txt_canvas.create_text(0, 0, text="")
+
+    @property
+    def canvas(self):
+        self.build()
+        return self.txt_canvas
+
+    @property
+    def text(self):
+        self.build()
+        return self.txt
+
+    def dimensions(self, txt, font):
+        self.build()
+        self.txt_canvas.itemconfig(self.txt, text=txt, font=font)
+        b = self.txt_canvas.bbox(self.txt)
+        return b[2] - b[0], b[3] - b[1]
+
+    def font_dimensions(self, txt, font):
+        key = (font, txt)
+        if key not in self.font_sizes:
+            self.font_sizes[key] = self.dimensions(txt, font)
+        return self.font_sizes[key]
+
+
 def get_index_of_gap_in_sorted_integer_seq_forward(seq, start=0):
     prevn = seq[start]
     for idx, n in enumerate(islice(seq, start + 1, None), start + 1):
@@ -398,6 +522,187 @@ def get_seq_without_gaps_at_index(seq, position):
         seq[:] = seq[reverse_gap:]
     return seq
 
+
+class RangeSet:
+    # row or column numbers stored as sorted, merged (start, stop) ranges
+    # iterating gives the numbers one at a time without building a list
+    __slots__ = ("ranges",)
+
+    def __init__(self, ranges=()):
+        merged = []
+        for start, stop in sorted(ranges):
+            if start >= stop:
+                continue
+            if merged and start <= merged[-1][1]:
+                if stop > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], stop)
+            else:
+                merged.append((start, stop))
+        self.ranges = merged
+
+    @classmethod
+    def from_indexes(cls, indexes):
+        ranges = []
+        for i in sorted(indexes):
+            if ranges and ranges[-1][1] == i:
+                ranges[-1][1] = i + 1
+            elif not ranges or ranges[-1][1] < i:
+                ranges.append([i, i + 1])
+        return cls(ranges)
+
+    def __iter__(self):
+        for start, stop in self.ranges:
+            yield from range(start, stop)
+
+    def __len__(self):
+        return sum(stop - start for start, stop in self.ranges)
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+    def __contains__(self, i):
+        idx = bisect.bisect_right(self.ranges, (i, float("inf"))) - 1
+        return idx >= 0 and i < self.ranges[idx][1]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.ranges})"
+
+
+class BoxSet:
+    # cells stored as (from row, from column, up to row, up to column) boxes
+    # iterating gives each (row, column) once without building a list
+    __slots__ = ("boxes",)
+
+    def __init__(self, boxes=()):
+        self.boxes = [
+            tuple(box) for box in boxes if box[0] < box[2] and box[1] < box[3]
+        ]
+
+    def __iter__(self):
+        for i, (r1, c1, r2, c2) in enumerate(self.boxes):
+            earlier = [
+                box
+                for box in islice(self.boxes, i)
+                if box[0] < r2 and r1 < box[2] and box[1] < c2 and c1 < box[3]
+            ]
+            for r in range(r1, r2):
+                for c in range(c1, c2):
+                    if not earlier or not any(
+                        b[0] <= r < b[2] and b[1] <= c < b[3] for b in earlier
+                    ):
+                        yield (r, c)
+
+    def __len__(self):
+        if len(self.boxes) == 1:
+            r1, c1, r2, c2 = self.boxes[0]
+            return (r2 - r1) * (c2 - c1)
+        return sum(1 for cell in self)
+
+    def __bool__(self):
+        return bool(self.boxes)
+
+    def __contains__(self, cell):
+        r, c = cell
+        return any(b[0] <= r < b[2] and b[1] <= c < b[3] for b in self.boxes)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.boxes})"
+
+
+class MovedRanges:
+    # (from, to) pairs stored as (start, stop, offset) ranges meaning every
+    # number n in range(start, stop) moved to n + offset
+    __slots__ = ("ranges",)
+
+    def __init__(self, ranges=()):
+        self.ranges = [tuple(r) for r in ranges if r[0] < r[1]]
+
+    def __iter__(self):
+        for start, stop, offset in self.ranges:
+            for n in range(start, stop):
+                yield (n, n + offset)
+
+    def __len__(self):
+        return sum(stop - start for start, stop, offset in self.ranges)
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.ranges})"
+
+
+def expand_event_ranges(data):
+    # replaces any RangeSet, BoxSet or MovedRanges in <<SheetModified>>
+    # event data with lists
+    for key in ("modified", "deleted", "added", "moved"):
+        if key in data:
+            data[key] = {
+                k: list(v) if isinstance(v, (RangeSet, BoxSet, MovedRanges)) else v
+                for k, v in data[key].items()
+            }
+    return data
+
+
+highlight_rule_comparisons = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, other: value in other,
+    "not in": lambda value, other: value not in other,
+    "contains": lambda value, other: other in value,
+}
+
+
+def comparison_predicate(comparison):
+    # e.g. (">", 100), values which cannot be compared do not match
+    op, other = comparison
+    func = highlight_rule_comparisons[op]
+
+    def predicate(value):
+        try:
+            return func(value, other)
+        except (TypeError, ValueError):
+            return False
+
+    return predicate
+
+
+class HighlightRule:
+    # highlights cells in columns (None for all columns) whose value, or
+    # the value in key_column of the same row, matches predicate
+    __slots__ = ("id", "columns", "predicate", "highlight", "priority", "key_column")
+
+    def __init__(
+        self, id, columns, predicate, bg=None, fg=None, priority=0, key_column=None
+    ):
+        self.id = id
+        self.columns = columns
+        self.predicate = (
+            predicate if callable(predicate) else comparison_predicate(predicate)
+        )
+        self.highlight = (bg, fg)
+        self.priority = priority
+        self.key_column = key_column
+
+    def __repr__(self):
+        return (
+            f"HighlightRule(id={self.id}, columns={self.columns}, "
+            f"highlight={self.highlight}, priority={self.priority}, "
+            f"key_column={self.key_column})"
+        )
+
+    def applies_to(self, datacn):
+        return self.columns is None or datacn in self.columns
+
+    def value(self, row, datacn):
+        c = datacn if self.key_column is None else self.key_column
+        return row[c] if c < len(row) else None
+
+
 def sheet_modified_event_data(
         name: str = None,
         action: str = None,
@@ -433,3 +738,555 @@ def sheet_modified_event_data(
         },
     }
 
+
+def merge_event_values(values):
+    # RangeSets, BoxSets or MovedRanges of the same type are merged without
+    # expanding them, a number in several RangeSets or a cell in several
+    # BoxSets is then given once, anything else is listed in order
+    values = [v for v in values if v]
+    kinds = {type(v) for v in values}
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        if kind is RangeSet:
+            return RangeSet([r for v in values for r in v.ranges])
+        if kind is BoxSet:
+            return BoxSet([box for v in values for box in v.boxes])
+        if kind is MovedRanges:
+            return MovedRanges([r for v in values for r in v.ranges])
+    return [x for v in values for x in v]
+
+
+def merge_sheet_modified_events(events, action="batch"):
+    # one event holding the changes of all the events in the order they
+    # happened, row and column numbers are as they were at each event
+    if len(events) == 1:
+        return {**events[0], "action": action}
+    return sheet_modified_event_data(
+        action=action,
+        modified_cells=merge_event_values([e["modified"]["cells"] for e in events]),
+        modified_rows=merge_event_values([e["modified"]["rows"] for e in events]),
+        modified_cols=merge_event_values([e["modified"]["cols"] for e in events]),
+        deleted_rows=merge_event_values([e["deleted"]["rows"] for e in events]),
+        deleted_cols=merge_event_values([e["deleted"]["cols"] for e in events]),
+        added_rows=merge_event_values([e["added"]["rows"] for e in events]),
+        added_cols=merge_event_values([e["added"]["cols"] for e in events]),
+        moved_rows=merge_event_values([e["moved"]["rows"] for e in events]),
+        moved_cols=merge_event_values([e["moved"]["cols"] for e in events]),
+    )
+
+
+def diff_sheet_rows(old, new, key=None):
+    if key is None:
+        shared = min(len(old), len(new))
+        return list(range(shared)) + [None] * (len(new) - shared)
+    old_rows = defaultdict(deque)
+    for rn, row in enumerate(old):
+        old_rows[key(row)].append(rn)
+    new_to_old = []
+    for row in new:
+        k = key(row)
+        if k in old_rows and old_rows[k]:
+            new_to_old.append(old_rows[k].popleft())
+        else:
+            new_to_old.append(None)
+    return new_to_old
+
+
+def insert_items(seq, to_insert):
+    # to_insert is an iterable of (index, item) sorted by index ascending,
+    # indexes being the positions of the items in the returned list
+    res = []
+    it = iter(seq)
+    for idx, item in to_insert:
+        if idx > len(res):
+            res.extend(islice(it, idx - len(res)))
+        res.append(item)
+    res.extend(it)
+    return res
+
+
+def sniff_clipboard_dialect(text, delimiters, sample_size=8192):
+    # only the start of text is sniffed, cut at its last complete line
+    sample = text[:sample_size]
+    if len(text) > sample_size and "\n" in sample:
+        sample = sample[: sample.rindex("\n")]
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=delimiters)
+    except Exception:
+        return csv.excel_tab
+
+
+def undo_storage_sizer(undo_storage, step=50000):
+    # approximate bytes used by an undo entry, shared objects counted once
+    # yields None after every step objects and the size last
+    seen = set()
+    stack = [undo_storage]
+    size = 0
+    n = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        n += 1
+        if not n % step:
+            yield None
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset, deque)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    yield size
+
+
+def undo_storage_size(undo_storage):
+    for size in undo_storage_sizer(undo_storage):
+        pass
+    return size
+
+
+class IdleTask:
+    # runs a generator for at most budget_ms at a time using schedule,
+    # e.g. a widgets after_idle, until it is exhausted
+    # the generator yields its progress as (done, total)
+    def __init__(
+        self,
+        name,
+        gen,
+        schedule,
+        unschedule,
+        budget_ms=20,
+        on_progress=None,
+        on_complete=None,
+    ):
+        self.name = name
+        self.gen = gen
+        self.schedule = schedule
+        self.unschedule = unschedule
+        self.budget_ms = budget_ms
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.progress = (0, 0)
+        self.after_id = None
+        self.done = False
+        self.cancelled = False
+        self.running = False
+
+    def start(self):
+        self.after_id = self.schedule(self.step)
+        return self
+
+    def step(self):
+        self.after_id = None
+        end = perf_counter() + self.budget_ms / 1000
+        self.running = True
+        try:
+            for progress in self.gen:
+                self.progress = progress
+                if perf_counter() >= end:
+                    if self.on_progress is not None:
+                        self.on_progress(self)
+                    if not self.done:
+                        self.after_id = self.schedule(self.step)
+                    return
+        finally:
+            self.running = False
+        self.complete(cancelled=False)
+
+    def finish(self):
+        # runs the rest of the task now, not if called from the task itself
+        if self.done or self.running:
+            return
+        if self.after_id is not None:
+            self.unschedule(self.after_id)
+            self.after_id = None
+        self.running = True
+        try:
+            for self.progress in self.gen:
+                pass
+        finally:
+            self.running = False
+        self.complete(cancelled=False)
+
+    def cancel(self):
+        if self.done:
+            return False
+        if self.after_id is not None:
+            self.unschedule(self.after_id)
+            self.after_id = None
+        self.gen.close()
+        self.complete(cancelled=True)
+        return True
+
+    def complete(self, cancelled):
+        self.done = True
+        self.cancelled = cancelled
+        if self.on_complete is not None:
+            self.on_complete(self)
+
+
+class SheetUpdater:
+    # updates can be posted from any thread, they are applied on the tk thread
+    # every interval_ms for at most budget_ms followed by one redraw
+    # writes to the same cell, row or column are coalesced, structural
+    # updates keep their place in between them
+    # other threads only add to the queue, they cannot wake the tk thread
+    # without calling tk, so once started an empty queue is checked every
+    # idle_interval_ms instead
+    # created on the tk thread, start() and stop() are tk thread only
+    structural = ("insert_rows", "insert_columns", "delete_rows", "delete_columns")
+
+    def __init__(self, sheet, interval_ms=15, budget_ms=10, idle_interval_ms=100):
+        self.sheet = sheet
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.lock = Lock()
+        self.segments = []
+        self.thread_id = get_ident()
+        self.running = False
+        self.after_id = None
+        self.after_interval_ms = None
+
+    def __len__(self):
+        with self.lock:
+            return sum(
+                len(segment) if isinstance(segment, (dict, deque)) else 1
+                for segment in self.segments
+            )
+
+    def post(self, updates):
+        self.add(updates)
+        if self.running and get_ident() == self.thread_id:
+            self.schedule(self.interval_ms)
+
+    def add(self, updates):
+        with self.lock:
+            segments = self.segments
+            for update in updates:
+                kind = update[0]
+                if kind == "cell":
+                    key = ("cell", update[1], update[2])
+                    value = update[3]
+                elif kind == "row" or kind == "column":
+                    key = (kind, update[1])
+                    value = update[2]
+                elif kind in self.structural:
+                    segments.append(update)
+                    continue
+                else:
+                    raise ValueError(f"Unknown update type {kind!r}")
+                if not segments or not isinstance(segments[-1], dict):
+                    segments.append({})
+                cells = segments[-1]
+                if key in cells:
+                    # moved to the end so it is applied after anything written
+                    # since the last write
+                    del cells[key]
+                cells[key] = value
+
+    def set_cell(self, r, c, value):
+        self.post((("cell", r, c, value),))
+
+    def set_row(self, r, values):
+        self.post((("row", r, values),))
+
+    def set_column(self, c, values):
+        self.post((("column", c, values),))
+
+    def insert_rows(self, rows, idx="end"):
+        self.post((("insert_rows", rows, idx),))
+
+    def insert_columns(self, columns, idx="end"):
+        self.post((("insert_columns", columns, idx),))
+
+    def delete_rows(self, rows):
+        self.post((("delete_rows", rows),))
+
+    def delete_columns(self, columns):
+        self.post((("delete_columns", columns),))
+
+    def start(self):
+        self.running = True
+        self.schedule(self.interval_ms if self.segments else self.idle_interval_ms)
+
+    def schedule(self, interval_ms):
+        # polls after interval_ms, sooner if a poll is already due sooner
+        if self.after_id is not None:
+            if interval_ms >= self.after_interval_ms:
+                return
+            self.sheet.after_cancel(self.after_id)
+        self.after_id = self.sheet.after(interval_ms, self.poll)
+        self.after_interval_ms = interval_ms
+
+    def poll(self):
+        self.after_id = None
+        try:
+            self.drain(self.budget_ms)
+        finally:
+            if self.running:
+                if self.segments:
+                    self.schedule(self.interval_ms)
+                elif self.idle_interval_ms is not None:
+                    self.schedule(self.idle_interval_ms)
+
+    def flush(self):
+        # applies all posted updates now, tk thread only
+        self.drain()
+
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            self.sheet.after_cancel(self.after_id)
+            self.after_id = None
+
+    def drain(self, budget_ms=None):
+        if not self.segments:
+            return
+        with self.lock:
+            segments = deque(self.segments)
+            self.segments = []
+        end = None if budget_ms is None else perf_counter() + budget_ms / 1000
+        sheet = self.sheet
+        with sheet.batch():
+            try:
+                while segments:
+                    segment = segments[0]
+                    if isinstance(segment, dict):
+                        segment = segments[0] = deque(segment.items())
+                    if isinstance(segment, deque):
+                        while segment:
+                            if end is not None and perf_counter() >= end:
+                                return
+                            key, value = segment.popleft()
+                            if key[0] == "cell":
+                                sheet.set_cell_data(key[1], key[2], value)
+                            elif key[0] == "row":
+                                sheet.set_row_data(key[1], values=value)
+                            else:
+                                sheet.set_column_data(key[1], values=value)
+                        segments.popleft()
+                    else:
+                        if end is not None and perf_counter() >= end:
+                            return
+                        segments.popleft()
+                        self.apply_structural(segment)
+            finally:
+                if segments:
+                    # not applied within the budget, kept in front of
+                    # anything posted since
+                    with self.lock:
+                        self.segments[:0] = segments
+                sheet.set_refresh_timer()
+
+    def apply_structural(self, update):
+        sheet = self.sheet
+        sheet.finish_tasks()
+        kind = update[0]
+        if kind == "insert_rows":
+            sheet.insert_rows(
+                update[1], idx=update[2] if len(update) > 2 else "end", redraw=False
+            )
+        elif kind == "insert_columns":
+            sheet.insert_columns(
+                update[1], idx=update[2] if len(update) > 2 else "end", redraw=False
+            )
+        elif kind == "delete_rows":
+            sheet.delete_rows(update[1], redraw=False)
+        else:
+            sheet.delete_columns(update[1], redraw=False)
+
+
+class UndoJournal:
+    # undo and redo stacks, each entry is stored as [entry, size, state]
+    # the oldest entries are dropped when there are more than maxlen
+    # undos or the entries total more than max_bytes, the newest entry
+    # is kept even if it is over max_bytes by itself
+    # with schedule, e.g. a widgets after_idle, entries are stored as they
+    # are with an estimated size and are measured or compressed later a
+    # chunk at a time, state is "new" until then, "sized" once measured
+    # and "final" once compressed or if they cannot be pickled
+    def __init__(self, maxlen=30, max_bytes=None, compress_level=6, schedule=None):
+        self.maxlen = maxlen
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.schedule = schedule
+        self.undos = deque()
+        self.redos = deque()
+        self.nbytes = 0
+        self.compressing = None
+        self.sizing = None
+        self.compress_scheduled = False
+        self.batch = None
+
+    def __len__(self):
+        return len(self.undos)
+
+    def __bool__(self):
+        return bool(self.undos)
+
+    def __getitem__(self, idx):
+        return self.undos[idx][0]
+
+    def __iter__(self):
+        return (item[0] for item in self.undos)
+
+    def append(self, entry):
+        # a new change, anything that could be redone is discarded
+        if self.batch is not None:
+            self.batch.append(entry)
+            return
+        self.nbytes -= sum(item[1] for item in self.redos)
+        self.redos.clear()
+        self.push(entry)
+
+    def push(self, entry, redo=False):
+        if not isinstance(entry, (tuple, dict)):
+            item = [entry, sys.getsizeof(entry), "final"]
+        elif self.schedule is None:
+            item = [entry, undo_storage_size(entry), "sized"]
+        else:
+            # the size of the outer containers until it is measured
+            parts = entry.values() if isinstance(entry, dict) else entry
+            item = [
+                entry,
+                sys.getsizeof(entry) + sum(map(sys.getsizeof, parts)),
+                "new",
+            ]
+        (self.redos if redo else self.undos).append(item)
+        self.nbytes += item[1]
+        self.trim(redo=redo)
+        self.schedule_compress()
+
+    def pop(self):
+        entry, size, state = self.undos.pop()
+        self.nbytes -= size
+        return entry
+
+    def pop_redo(self):
+        entry, size, state = self.redos.pop()
+        self.nbytes -= size
+        return entry
+
+    def begin_batch(self):
+        # changes appended until end_batch() are stored as one entry
+        self.batch = []
+
+    def end_batch(self):
+        entries = self.batch
+        self.batch = None
+        if len(entries) == 1:
+            self.append(entries[0])
+        elif entries:
+            self.append(("batch", entries))
+
+    def clear(self):
+        self.undos.clear()
+        self.redos.clear()
+        self.nbytes = 0
+        self.compressing = None
+        self.sizing = None
+
+    def set_limits(self, maxlen=None, max_bytes=None):
+        self.maxlen = maxlen
+        self.max_bytes = max_bytes
+        self.trim()
+
+    def trim(self, redo=False):
+        if self.maxlen is not None:
+            while len(self.undos) > self.maxlen:
+                self.nbytes -= self.undos.popleft()[1]
+        if self.max_bytes is not None:
+            while (
+                self.nbytes > self.max_bytes and len(self.undos) + len(self.redos) > 1
+            ):
+                if len(self.undos) > (0 if redo else 1):
+                    self.nbytes -= self.undos.popleft()[1]
+                else:
+                    self.nbytes -= self.redos.popleft()[1]
+
+    def next_item(self):
+        # the oldest entry which is still to be measured or compressed
+        states = ("new",) if self.compress_level is None else ("new", "sized")
+        return next(
+            (
+                item
+                for stack in (self.undos, self.redos)
+                for item in stack
+                if item[2] in states
+            ),
+            None,
+        )
+
+    def schedule_compress(self):
+        if (
+            self.schedule is not None
+            and not self.compress_scheduled
+            and (self.compressing or self.sizing or self.next_item() is not None)
+        ):
+            self.compress_scheduled = True
+            self.schedule(self.compress_step)
+
+    def compress_step(self, chunk_size=1048576):
+        # compresses the next chunk of the oldest uncompressed entry, or
+        # measures it if it is not to be compressed or cannot be pickled
+        self.compress_scheduled = False
+        if self.compress_level is None:
+            self.compressing = None
+        if self.compressing is None and self.sizing is None:
+            item = self.next_item()
+            if item is None:
+                return
+            if self.compress_level is not None:
+                try:
+                    raw = memoryview(pickle.dumps(item[0]))
+                except Exception:
+                    # e.g. dropdown options holding a lambda
+                    raw = None
+                if raw is None:
+                    self.sizing = (item, undo_storage_sizer(item[0]))
+                else:
+                    self.resize(item, len(raw))
+                    self.compressing = (
+                        item,
+                        raw,
+                        zlib.compressobj(self.compress_level),
+                        [],
+                        0,
+                    )
+            else:
+                self.sizing = (item, undo_storage_sizer(item[0]))
+        if self.sizing is not None:
+            item, sizer = self.sizing
+            size = next(sizer)
+            if size is not None:
+                item[2] = "final" if self.compress_level is not None else "sized"
+                self.resize(item, size)
+                self.sizing = None
+        elif self.compressing is not None:
+            item, raw, compressor, parts, offset = self.compressing
+            parts.append(compressor.compress(raw[offset : offset + chunk_size]))
+            offset += chunk_size
+            if offset < len(raw):
+                self.compressing = (item, raw, compressor, parts, offset)
+            else:
+                parts.append(compressor.flush())
+                item[0] = b"".join(parts)
+                item[2] = "final"
+                self.resize(item, sys.getsizeof(item[0]))
+                self.compressing = None
+        self.schedule_compress()
+
+    def resize(self, item, size):
+        # entries which have been undone, redone or dropped are not counted
+        if any(item_ is item for stack in (self.undos, self.redos) for item_ in stack):
+            self.nbytes += size - item[1]
+            item[1] = size
+            self.trim()
+        else:
+            item[1] = size
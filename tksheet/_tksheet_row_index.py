@@ -1,13 +1,32 @@
-import pickle
 import tkinter as tk
-import zlib
 from collections import defaultdict
 from itertools import accumulate, chain, cycle, islice
 from math import ceil, floor
 
-from ._tksheet_formatters import *
-from ._tksheet_other_classes import *
-from ._tksheet_vars import *
+from ._tksheet_formatters import is_bool_like, try_to_bool
+from ._tksheet_other_classes import (
+    BeginDragDropEvent,
+    DefaultLabels,
+    DraggedRowColumn,
+    DrawnItem,
+    DropDownModifiedEvent,
+    EditHeaderEvent,
+    EditIndexEvent,
+    EndDragDropEvent,
+    ResizeEvent,
+    SelectRowEvent,
+    SelectionBoxEvent,
+    TextCfg,
+    TextEditor,
+    get_checkbox_dict,
+    get_dropdown_dict,
+    get_seq_without_gaps_at_index,
+    num2alpha,
+    sheet_modified_event_data,
+)
+from ._tksheet_vars import USER_OS, Color_Map_, rc_binding, symbols_set
+
+__all__ = ["RowIndex"]
 
 
 class RowIndex(tk.Canvas):
@@ -102,6 +121,9 @@ class RowIndex(tk.Canvas):
         self.show_default_index_for_empty = kwargs["show_default_index_for_empty"]
         self.auto_resize_width = kwargs["auto_resize_width"]
         self.default_index = kwargs["default_row_index"].lower()
+        self.default_labels = DefaultLabels()
+        # measured default index widths by (font, default_index, label length)
+        self.default_index_widths = {}
         self.basic_bindings()
 
     def basic_bindings(self, enable=True):
@@ -161,6 +183,7 @@ class RowIndex(tk.Canvas):
     def rc(self, event):
         self.mouseclick_outside_editor_or_dropdown_all_canvases()
         self.focus_set()
+        self.MT.build_rc_menus()
         popup_menu = None
         if self.MT.identify_row(y=event.y, allow_end=False) is None:
             self.MT.deselect("all")
@@ -913,9 +936,7 @@ class RowIndex(tk.Canvas):
                     )
                     if self.MT.undo_enabled:
                         self.MT.undo_storage.append(
-                            zlib.compress(
-                                pickle.dumps(("move_rows", orig_selected, new_selected))
-                            )
+                            ("move_rows", orig_selected, new_selected)
                         )
                     self.MT.main_table_redraw_grid_and_text(
                         redraw_header=True, redraw_row_index=True
@@ -1251,20 +1272,22 @@ class RowIndex(tk.Canvas):
             and self.auto_resize_width
         ):
             if self.default_index == "letters":
-                new_w = self.MT.get_txt_w(f"{num2alpha(end_row)}") + 20
-                if self.current_width - new_w > 15 or new_w - self.current_width > 5:
-                    self.set_width(new_w, set_TL=True)
-                    return True
+                txt = num2alpha(end_row)
             elif self.default_index == "numbers":
-                new_w = self.MT.get_txt_w(f"{end_row}") + 20
-                if self.current_width - new_w > 15 or new_w - self.current_width > 5:
-                    self.set_width(new_w, set_TL=True)
-                    return True
+                txt = f"{end_row}"
             elif self.default_index == "both":
-                new_w = self.MT.get_txt_w(f"{end_row + 1} {num2alpha(end_row)}") + 20
-                if self.current_width - new_w > 15 or new_w - self.current_width > 5:
-                    self.set_width(new_w, set_TL=True)
-                    return True
+                txt = f"{end_row + 1} {num2alpha(end_row)}"
+            else:
+                return False
+            # labels of the same length are measured once, the width only
+            # changes when scrolling into longer or shorter labels
+            key = (self.MT.table_font, self.default_index, len(txt))
+            new_w = self.default_index_widths.get(key)
+            if new_w is None:
+                new_w = self.default_index_widths[key] = self.MT.get_txt_w(txt) + 20
+            if self.current_width - new_w > 15 or new_w - self.current_width > 5:
+                self.set_width(new_w, set_TL=True)
+                return True
         return False
 
     def redraw_highlight_get_text_fg(self, fr, sr, r, c_2, c_3, selections, datarn):
@@ -1695,7 +1718,7 @@ class RowIndex(tk.Canvas):
             lns = self.get_valid_cell_data_as_str(datarn, fix=False).split("\n")
             if lns == [""]:
                 if self.show_default_index_for_empty:
-                    lns = (get_n2a(r, self.default_index),)
+                    lns = (self.default_labels.get(r, self.default_index),)
                 else:
                     continue
             draw_y = rtopgridln + self.MT.fl_ins
@@ -2221,15 +2244,11 @@ class RowIndex(tk.Canvas):
             if not check_input_valid or self.input_valid_for_cell(datarn, value):
                 if self.MT.undo_enabled and undo:
                     self.MT.undo_storage.append(
-                        zlib.compress(
-                            pickle.dumps(
-                                (
-                                    "edit_index",
-                                    {datarn: self.MT._row_index[datarn]},
-                                    self.MT.get_boxes(include_current=False),
-                                    self.MT.currently_selected(),
-                                )
-                            )
+                        (
+                            "edit_index",
+                            {datarn: self.MT._row_index[datarn]},
+                            self.MT.get_boxes(include_current=False),
+                            self.MT.currently_selected(),
                         )
                     )
                 self.set_cell_data(datarn=datarn, value=value)
@@ -2671,8 +2690,10 @@ class RowIndex(tk.Canvas):
         self.existing_dropdown_window = None
 
     def get_cell_kwargs(self, datarn, key="dropdown", cell=True, entire=True):
-        if cell and datarn in self.cell_options and key in self.cell_options[datarn]:
-            return self.cell_options[datarn][key]
+        if cell:
+            options = self.cell_options.get(datarn)
+            if options and key in options:
+                return options[key]
         if entire and key in self.options:
             return self.options[key]
         return {}
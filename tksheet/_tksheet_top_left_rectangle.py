@@ -1,7 +1,8 @@
 import tkinter as tk
 
-from ._tksheet_other_classes import *
-from ._tksheet_vars import *
+from ._tksheet_vars import rc_binding
+
+__all__ = ["TopLeftRectangle"]
 
 
 class TopLeftRectangle(tk.Canvas):